@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+# ==================================================
+# DEMAND TIERS
+# ==================================================
+# Right-closed bins: (-inf, 60], (60, 120], (120, 200], (200, inf)
+TIER_BINS = [-np.inf, 60, 120, 200, np.inf]
+TIER_CONFIDENCE = np.array(["Low", "Medium", "Medium", "High"], dtype=object)
+TIER_ACTIONS = np.array([
+    "Limited stock",
+    "Targeted supply",
+    "Ensure availability",
+    "Stock aggressively",
+], dtype=object)
+
+DISPLAY_COLUMNS = {
+    "rank": "Rank",
+    "product": "Product",
+    "region": "City / Region",
+    "demand": "Est. Demand (units)",
+    "confidence": "Confidence",
+    "action": "Recommended Action",
+}
+
+
+# ==================================================
+# ACTION PLAN ENGINE
+# ==================================================
+def pair_demand(df: pd.DataFrame, product_col: str, region_col: str, target_col: str):
+    """
+    Total demand per product × region pair, from one groupby.
+    """
+    return (
+        df.groupby([product_col, region_col], observed=True)[target_col]
+        .sum()
+        .reset_index()
+    )
+
+
+def build_action_plan(pairs: pd.DataFrame, product_col: str, region_col: str,
+                      target_col: str):
+    """
+    Rank products by total demand and tier every product × region pair.
+
+    pairs holds one row per product × region with its total demand
+    (see pair_demand). Products are ranked by their summed demand;
+    within a product, regions are listed by demand. Pairs whose
+    demand truncates to zero or below are dropped, but still count
+    towards their product's rank.
+    """
+    totals = pairs.groupby(product_col, observed=True)[target_col].sum()
+    ranked = totals.sort_values(ascending=False, kind="stable")
+    ranks = pd.Series(np.arange(1, len(ranked) + 1), index=ranked.index)
+
+    plan = pd.DataFrame({
+        "rank": ranks.reindex(pairs[product_col]).to_numpy(),
+        "product": pairs[product_col].to_numpy(),
+        "region": pairs[region_col].to_numpy(),
+        "total": pairs[target_col].to_numpy(dtype="float64"),
+    })
+    plan["demand"] = np.trunc(plan["total"]).astype("int64")
+
+    plan = (
+        plan[plan["demand"] > 0]
+        .sort_values(["rank", "total"], ascending=[True, False], kind="stable")
+        .drop(columns="total")
+        .reset_index(drop=True)
+    )
+
+    tier = pd.cut(plan["demand"], TIER_BINS, labels=False).to_numpy(dtype="int64")
+    plan["confidence"] = TIER_CONFIDENCE[tier]
+    plan["action"] = TIER_ACTIONS[tier]
+    return plan
+
+
+def display_action_plan(plan: pd.DataFrame):
+    """
+    Table form of the plan: rank and product are shown only on each
+    product's first row.
+    """
+    first = ~plan["rank"].duplicated()
+    table = plan.assign(
+        rank=plan["rank"].astype(object).where(first, ""),
+        product=plan["product"].astype(object).where(first, ""),
+    )
+    return table[list(DISPLAY_COLUMNS)].rename(columns=DISPLAY_COLUMNS)
+
+
+def action_plan(df: pd.DataFrame, product_col: str, region_col: str, target_col: str):
+    """
+    Display-ready action plan straight from the sales frame.
+    """
+    pairs = pair_demand(df, product_col, region_col, target_col)
+    return display_action_plan(
+        build_action_plan(pairs, product_col, region_col, target_col)
+    )
@@ -0,0 +1,221 @@
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from agents.forecasting_agent import (
+    ENGINES,
+    FREQUENCIES,
+    MIN_SERIES_LENGTH,
+    ForecastingAgent,
+)
+from agents.parallel import process_map
+from agents.schema_agent import SchemaIntelligenceAgent
+
+LEVELS = FREQUENCIES + ["naive"]
+
+
+# ==================================================
+# METRICS
+# ==================================================
+def mape(actual, predicted):
+    actual, predicted = np.asarray(actual), np.asarray(predicted)
+    nonzero = actual != 0
+    if not nonzero.any():
+        return np.nan
+    return float(np.mean(
+        np.abs(actual[nonzero] - predicted[nonzero]) / np.abs(actual[nonzero])
+    ) * 100)
+
+
+def smape(actual, predicted):
+    actual, predicted = np.asarray(actual), np.asarray(predicted)
+    scale = np.abs(actual) + np.abs(predicted)
+    valid = scale != 0
+    if not valid.any():
+        return np.nan
+    return float(np.mean(
+        2 * np.abs(actual[valid] - predicted[valid]) / scale[valid]
+    ) * 100)
+
+
+def mase(actual, predicted, train):
+    scale = np.mean(np.abs(np.diff(np.asarray(train)))) if len(train) > 1 else 0
+    if scale == 0:
+        return np.nan
+    return float(np.mean(np.abs(np.asarray(actual) - np.asarray(predicted))) / scale)
+
+
+# ==================================================
+# PROCESS POOL WORKER
+# ==================================================
+def _backtest_series(task):
+    key, daily, horizon, origins, engine, min_points = task
+    product, region = key
+    records = []
+
+    for level in LEVELS:
+        if level == "naive":
+            ts, needed = daily, 1
+        else:
+            ts = daily if level == "D" else daily.resample(level).sum()
+            needed = min_points
+
+        for origin in _origins(len(ts), horizon, origins, needed):
+            train, test = ts.iloc[:origin], ts.iloc[origin:origin + horizon]
+
+            start = time.perf_counter()
+            if level == "naive":
+                forecast = ForecastingAgent._naive_forecast(train, len(test))
+            else:
+                fitted = ForecastingAgent._fit_model(train, level, engine)
+                forecast = fitted.forecast(len(test))
+            fit_seconds = time.perf_counter() - start
+
+            predicted = np.asarray(forecast, dtype="float64")
+            records.append({
+                "product": product,
+                "region": region,
+                "level": level,
+                "origin": str(ts.index[origin].date()),
+                "train_points": origin,
+                "test_points": len(test),
+                "mape": mape(test.values, predicted),
+                "smape": smape(test.values, predicted),
+                "mase": mase(test.values, predicted, train.values),
+                "fit_seconds": fit_seconds,
+            })
+
+    return records
+
+
+def _origins(n_points, horizon, origins, needed):
+    # Rolling origins step back one horizon at a time from the end
+    candidates = [n_points - horizon * (k + 1) for k in range(origins)]
+    return sorted(o for o in candidates if o >= needed)
+
+
+# ==================================================
+# BACKTEST RUNNER
+# ==================================================
+def backtest(
+    agent: ForecastingAgent,
+    horizon: int = 7,
+    origins: int = 3,
+    engine: str = "statsmodels",
+    max_workers: int = None,
+    min_points: int = MIN_SERIES_LENGTH
+):
+    """
+    Rolling-origin evaluation of every cascade level on every series.
+
+    Each product × region series is evaluated at the D, W and ME levels
+    and with the naive fallback, independently of which level the
+    cascade would pick, so thresholds and engines can be compared.
+    horizon is counted in periods of each level. Returns one row per
+    series, level and origin.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown forecasting engine: {engine}")
+
+    tasks = [
+        (key, daily, horizon, origins, engine, min_points)
+        for key, daily in agent._daily_partitions()
+    ]
+    batches = process_map(_backtest_series, tasks, max_workers)
+
+    return pd.DataFrame(
+        [record for batch in batches for record in batch],
+        columns=["product", "region", "level", "origin", "train_points",
+                 "test_points", "mape", "smape", "mase", "fit_seconds"]
+    )
+
+
+def summarize(results: pd.DataFrame):
+    """
+    Per-level accuracy and fit time across all series and origins.
+    """
+    grouped = results.groupby("level", sort=False)
+    summary = grouped.agg(
+        evaluations=("mape", "size"),
+        mape=("mape", "mean"),
+        smape=("smape", "mean"),
+        mase=("mase", "mean"),
+        fit_seconds_mean=("fit_seconds", "mean"),
+        fit_seconds_p95=("fit_seconds", lambda s: s.quantile(0.95)),
+    )
+    summary.insert(0, "series", (
+        results
+        .drop_duplicates(["level", "product", "region"])
+        .groupby("level", sort=False)
+        .size()
+    ))
+
+    levels = [level for level in LEVELS if level in summary.index]
+    return summary.loc[levels].reset_index()
+
+
+def write_report(results: pd.DataFrame, path: str, config: dict = None):
+    """
+    Write the summary and per-series results as JSON.
+    """
+    report = {
+        "config": config or {},
+        "summary": _records(summarize(results)),
+        "series": _records(results),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def _records(df):
+    return json.loads(df.to_json(orient="records"))
+
+
+# ==================================================
+# COMMAND LINE
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rolling-origin backtest of the forecasting cascade."
+    )
+    parser.add_argument("csv", help="Sales CSV to evaluate")
+    parser.add_argument("--horizon", type=int, default=7)
+    parser.add_argument("--origins", type=int, default=3)
+    parser.add_argument("--engine", choices=ENGINES, default="statsmodels")
+    parser.add_argument("--min-points", type=int, default=MIN_SERIES_LENGTH)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="backtest_report.json")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.csv)
+    schema = SchemaIntelligenceAgent(df, datetime_mode="sampled").analyze()
+    date_col = schema["date_columns"][0]
+    agent = ForecastingAgent(
+        df,
+        date_col,
+        schema["demand_target"],
+        (schema["product_columns"] or [None])[0],
+        (schema["region_columns"] or [None])[0],
+        date_format=schema["date_formats"][date_col]
+    )
+
+    results = backtest(
+        agent,
+        horizon=args.horizon,
+        origins=args.origins,
+        engine=args.engine,
+        max_workers=args.workers,
+        min_points=args.min_points
+    )
+    config = {k: v for k, v in vars(args).items() if k != "output"}
+    write_report(results, args.output, config)
+
+    print(summarize(results).to_string(index=False))
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from agents.decision_agent import DecisionAgent
+from agents.forecast_store import ForecastStore
+from agents.forecasting_agent import ENGINES, ForecastingAgent
+from agents.geo_navigation_agent import shared_agent
+from agents.schema_agent import SchemaIntelligenceAgent
+from persistence import ConnectionPool
+
+FORMATS = ["jsonl", "parquet"]
+# Forecast date frequency per cascade level (naive forecasts are daily)
+LEVEL_FREQ = {"D": "D", "W": "W", "ME": "ME", "naive": "D"}
+RECORD_COLUMNS = [
+    "file", "product", "region", "frequency", "decision",
+    "avg_demand", "peak_demand", "confidence", "forecast_start", "forecast",
+]
+
+
+# ==================================================
+# PER-FILE PIPELINE (PROCESS POOL WORKER)
+# ==================================================
+def run_file(path: str, horizon: int = 30, engine: str = "numpy",
+             warehouse: str = None, fuel_price: float = 100,
+             max_workers: int = 1):
+    """
+    Schema → forecast → decision (→ route) for one sales CSV.
+
+    Returns one record per product × region series and a file summary.
+    With a warehouse, the summary includes an optimized route from it
+    through every routable region that has a mission. max_workers
+    spreads the file's statsmodels fits over a process pool.
+    """
+    start = time.perf_counter()
+    df = pd.read_csv(path)
+    schema = SchemaIntelligenceAgent(df, datetime_mode="sampled").analyze()
+
+    if not schema["date_columns"] or not schema["demand_target"]:
+        raise ValueError("Could not detect a date column and a demand target")
+
+    date_col = schema["date_columns"][0]
+    agent = ForecastingAgent(
+        df,
+        date_col,
+        schema["demand_target"],
+        (schema["product_columns"] or [None])[0],
+        (schema["region_columns"] or [None])[0],
+        date_format=schema["date_formats"][date_col]
+    )
+
+    forecasts = agent.forecast_all(horizon, max_workers=max_workers, engine=engine)
+    decisions = DecisionAgent.decide_all(forecasts)
+
+    values = forecasts.groupby(
+        ["product", "region"], sort=False, dropna=False, observed=True
+    ).agg(forecast_start=("date", "min"), forecast=("forecast", list))
+
+    records = decisions.join(values, on=["product", "region"])
+    records.insert(0, "file", os.path.basename(path))
+    records = records.astype({
+        "product": str, "region": str, "frequency": str,
+        "decision": str, "confidence": str,
+        "avg_demand": "float64", "peak_demand": "float64",
+    })
+    records["forecast_start"] = records["forecast_start"].dt.strftime("%Y-%m-%d")
+    records = records[RECORD_COLUMNS]
+
+    summary = {
+        "file": os.path.basename(path),
+        "rows": len(df),
+        "series": len(records),
+        "decisions": records["decision"].value_counts().to_dict(),
+    }
+    if warehouse:
+        summary["route"] = _mission_route(records, warehouse, fuel_price)
+
+    summary["seconds"] = time.perf_counter() - start
+    return records, summary
+
+
+def _mission_route(records, warehouse, fuel_price):
+    agent = shared_agent()
+    missions = records.loc[records["decision"] != "NO_MISSION", "region"]
+    stops = [r for r in dict.fromkeys(missions) if r in agent.index and r != warehouse]
+    if not stops:
+        return None
+
+    route = agent.plan_route([warehouse] + stops, fuel_price, optimize=True)
+    return {k: route[k] for k in ("path", "distance_km", "eta_hours", "fuel_cost")}
+
+
+def _store_records(store, records):
+    """
+    Save one file's decisions and forecasts, keyed by the file name.
+    """
+    source = records["file"].iloc[0]
+    store.save_decisions(records, source=source)
+    store.save_forecasts(_long_forecasts(records), source=source)
+
+
+def _long_forecasts(records):
+    # Rebuild forecast_all's long format from the per-series lists;
+    # series that end together share one date index
+    dated = records[records["forecast_start"].notna()]
+    lengths = dated["forecast"].str.len().to_numpy()
+
+    indexes = {}
+    dates = []
+    for start, level, n in zip(dated["forecast_start"], dated["frequency"], lengths):
+        key = (start, level, n)
+        if key not in indexes:
+            indexes[key] = pd.date_range(start, periods=n, freq=LEVEL_FREQ[level])
+        dates.append(indexes[key])
+
+    def repeat(column):
+        return np.repeat(dated[column].to_numpy(), lengths)
+
+    return pd.DataFrame({
+        "product": repeat("product"),
+        "region": repeat("region"),
+        "date": np.concatenate(dates) if dates else [],
+        "forecast": np.concatenate(dated["forecast"].to_numpy()) if dates else [],
+        "frequency": repeat("frequency"),
+        "confidence": repeat("confidence"),
+    })
+
+
+def _run_task(task):
+    path, options = task
+    try:
+        return run_file(path, **options)
+    except Exception as exc:
+        return None, {"file": os.path.basename(path), "error": f"{type(exc).__name__}: {exc}"}
+
+
+# ==================================================
+# STREAMING WRITERS
+# ==================================================
+class JsonLinesWriter:
+    def __init__(self, path):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, records: pd.DataFrame):
+        if len(records):
+            lines = records.to_json(orient="records", lines=True)
+            self._file.write(lines if lines.endswith("\n") else lines + "\n")
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """
+    Appends one row group per file, so nothing is held until the end.
+    Every row group uses the fixed record schema, whatever the first
+    file happened to contain.
+    """
+
+    def __init__(self, path):
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self.schema = record_schema()
+        self._writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, records: pd.DataFrame):
+        import pyarrow as pa
+
+        if not len(records):
+            return
+        self._writer.write_table(pa.Table.from_pandas(
+            records[RECORD_COLUMNS], schema=self.schema, preserve_index=False
+        ))
+
+    def close(self):
+        self._writer.close()
+
+
+def record_schema():
+    import pyarrow as pa
+
+    text = ["file", "product", "region", "frequency", "decision",
+            "confidence", "forecast_start"]
+    types = {name: pa.string() for name in text}
+    types.update(
+        avg_demand=pa.float64(),
+        peak_demand=pa.float64(),
+        forecast=pa.list_(pa.float64()),
+    )
+    return pa.schema([(name, types[name]) for name in RECORD_COLUMNS])
+
+
+def open_writer(path: str, fmt: str = None):
+    fmt = fmt or ("parquet" if path.endswith((".parquet", ".pq")) else "jsonl")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format: {fmt}")
+    return ParquetWriter(path) if fmt == "parquet" else JsonLinesWriter(path)
+
+
+# ==================================================
+# BATCH RUNNER
+# ==================================================
+def run_batch(
+    paths,
+    writer,
+    horizon: int = 30,
+    engine: str = "numpy",
+    warehouse: str = None,
+    fuel_price: float = 100,
+    max_workers: int = None,
+    progress=None,
+    store: ForecastStore = None
+):
+    """
+    Run the pipeline over many CSVs, writing records as each file
+    finishes. With a store, each file's decisions and forecasts are
+    also saved to it under the file name. progress(done, total, summary)
+    is called after every file. Returns per-file summaries and run totals.
+
+    The numpy engine fits a file's series as one vectorized batch, so
+    files are spread over the process pool. statsmodels fits series
+    one at a time, so files run in turn and each file's series are
+    spread over the pool instead; one large file is not serialised.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown forecasting engine: {engine}")
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    per_file = engine == "numpy"
+    options = {
+        "horizon": horizon, "engine": engine,
+        "warehouse": warehouse, "fuel_price": fuel_price,
+        "max_workers": 1 if per_file else max_workers,
+    }
+    tasks = [(path, options) for path in paths]
+
+    start = time.perf_counter()
+    summaries = []
+
+    def collect(records, summary):
+        if records is not None:
+            writer.write(records)
+            if store is not None and len(records):
+                _store_records(store, records)
+        summaries.append(summary)
+        if progress:
+            progress(len(summaries), len(tasks), summary)
+
+    if not per_file or max_workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            collect(*_run_task(task))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_run_task, task) for task in tasks]
+            for future in as_completed(futures):
+                collect(*future.result())
+
+    seconds = time.perf_counter() - start
+    rows = sum(s.get("rows", 0) for s in summaries)
+    series = sum(s.get("series", 0) for s in summaries)
+    return {
+        "files": summaries,
+        "totals": {
+            "files": len(summaries),
+            "failed": sum("error" in s for s in summaries),
+            "rows": rows,
+            "series": series,
+            "seconds": seconds,
+            "rows_per_second": rows / seconds if seconds else 0.0,
+            "series_per_second": series / seconds if seconds else 0.0,
+        },
+    }
+
+
+def _print_progress(done, total, summary):
+    if "error" in summary:
+        line = f"FAILED {summary['error']}"
+    else:
+        rate = summary["rows"] / summary["seconds"] if summary["seconds"] else 0
+        line = (
+            f"{summary['rows']:,} rows, {summary['series']} series "
+            f"in {summary['seconds']:.2f}s ({rate:,.0f} rows/s)"
+        )
+    print(f"[{done}/{total}] {summary['file']}: {line}", file=sys.stderr, flush=True)
+
+
+# ==================================================
+# COMMAND LINE
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the demand pipeline over a directory of sales CSVs."
+    )
+    parser.add_argument("directory", help="Directory containing sales CSVs")
+    parser.add_argument("--output", default="batch_results.jsonl")
+    parser.add_argument("--format", choices=FORMATS, default=None)
+    parser.add_argument("--summary", default=None,
+                        help="Optional JSON file for per-file summaries")
+    parser.add_argument("--horizon", type=int, default=30)
+    parser.add_argument("--engine", choices=ENGINES, default="numpy")
+    parser.add_argument("--warehouse", default=None,
+                        help="Plan a mission route from this hub for every file")
+    parser.add_argument("--fuel-price", type=float, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--database", default=None,
+                        help="Also save forecasts and decisions to this SQLite file")
+    args = parser.parse_args(argv)
+
+    paths = sorted(
+        os.path.join(args.directory, name)
+        for name in os.listdir(args.directory)
+        if name.lower().endswith(".csv")
+    )
+    if not paths:
+        parser.error(f"No CSV files in {args.directory}")
+
+    writer = open_writer(args.output, args.format)
+    store = ForecastStore(ConnectionPool(args.database)) if args.database else None
+    try:
+        report = run_batch(
+            paths,
+            writer,
+            horizon=args.horizon,
+            engine=args.engine,
+            warehouse=args.warehouse,
+            fuel_price=args.fuel_price,
+            max_workers=args.workers,
+            progress=_print_progress,
+            store=store
+        )
+    finally:
+        writer.close()
+        if store is not None:
+            store.close()
+
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+
+    totals = report["totals"]
+    print(
+        f"{totals['files']} files ({totals['failed']} failed), "
+        f"{totals['rows']:,} rows, {totals['series']:,} series in "
+        f"{totals['seconds']:.1f}s — {totals['rows_per_second']:,.0f} rows/s, "
+        f"{totals['series_per_second']:,.1f} series/s"
+    )
+    print(f"Results written to {args.output}")
+    return 1 if totals["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,9 @@
 import numpy as np
+import pandas as pd
+
+DECISIONS = ["NO_MISSION", "WAIT", "LIMITED_MISSION", "FULL_MISSION"]
+LIMITED_DEMAND_THRESHOLD = 20
+
 
 class DecisionAgent:
     """
@@ -30,36 +35,135 @@ class DecisionAgent:
         if self.confidence == "Low":
             return self._wait_decision(avg_demand)
 
-        if avg_demand < 20:
+        if avg_demand < LIMITED_DEMAND_THRESHOLD:
             return self._limited_mission(avg_demand)
 
         return self._full_mission(avg_demand, max_demand)
 
+    # -----------------------------
+    # Batch decisions
+    # -----------------------------
+    @classmethod
+    def decide_many(cls, forecasts, confidences):
+        """
+        Decide for many series at once.
+
+        forecasts is a (series × horizon) array and confidences a
+        label per series (or one label for all). The same rules as
+        decide() are applied with vectorized NumPy; returns a DataFrame
+        with decision, avg_demand, peak_demand and confidence (no rows
+        for an empty array). Use explain() to render the text for the
+        rows actually shown.
+        """
+        values = np.atleast_2d(np.asarray(forecasts, dtype="float64"))
+        if not values.size:
+            return cls._decide_stats(np.empty(0), np.empty(0), confidences)
+
+        return cls._decide_stats(values.mean(axis=1), values.max(axis=1), confidences)
+
+    @classmethod
+    def decide_all(cls, forecasts: pd.DataFrame):
+        """
+        Batch decisions for the long-format output of
+        ForecastingAgent.forecast_all (one row per series).
+
+        Rows are put in series order once and each series' mean and peak
+        are read with reduceat over its row range, so series may differ
+        in length and no per-group arrays are built.
+        """
+        keys = ["product", "region"]
+        codes = forecasts.groupby(
+            keys, sort=False, dropna=False, observed=True
+        ).ngroup().to_numpy()
+
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        values = forecasts["forecast"].to_numpy(dtype="float64")[order]
+
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+        if len(starts):
+            counts = np.diff(starts, append=len(codes))
+            avg_demand = np.add.reduceat(values, starts) / counts
+            peak_demand = np.maximum.reduceat(values, starts)
+        else:
+            avg_demand = peak_demand = np.empty(0)
+
+        labels = forecasts[keys + ["frequency", "confidence"]].iloc[order[starts]]
+        labels = labels.reset_index(drop=True)
+
+        decisions = cls._decide_stats(
+            avg_demand, peak_demand, labels["confidence"].to_numpy()
+        )
+        return pd.concat([labels[keys + ["frequency"]], decisions], axis=1)
+
+    @staticmethod
+    def _decide_stats(avg_demand, peak_demand, confidences):
+        confidence = np.broadcast_to(
+            np.asarray(confidences, dtype=object), (len(avg_demand),)
+        )
+
+        codes = np.select(
+            [
+                avg_demand <= 0,
+                confidence == "Low",
+                avg_demand < LIMITED_DEMAND_THRESHOLD,
+            ],
+            [0, 1, 2],
+            default=3
+        )
+
+        return pd.DataFrame({
+            "decision": pd.Categorical.from_codes(codes, DECISIONS),
+            "avg_demand": avg_demand,
+            "peak_demand": peak_demand,
+            "confidence": confidence,
+        })
+
+    @classmethod
+    def explain(cls, row):
+        """
+        Render the reason and recommended action for one decide_many row,
+        in the same form decide() returns.
+        """
+        decision, avg = row["decision"], row["avg_demand"]
+
+        if decision == "NO_MISSION":
+            return cls._no_mission(avg)
+        if decision == "WAIT":
+            return cls._wait_decision(avg)
+        if decision == "LIMITED_MISSION":
+            return cls._limited_mission(avg)
+        return cls._full_mission(avg, row["peak_demand"])
+
     # -----------------------------
     # Decision types
     # -----------------------------
-    def _no_mission(self, avg):
+    @staticmethod
+    def _no_mission(avg):
         return {
             "decision": "NO_MISSION",
             "reason": f"Average forecasted demand is {avg:.2f}, indicating no expected demand.",
             "recommended_action": "Do not launch mission. Monitor demand trends."
         }
 
-    def _wait_decision(self, avg):
+    @staticmethod
+    def _wait_decision(avg):
         return {
             "decision": "WAIT",
             "reason": f"Forecast confidence is low with average demand {avg:.2f}.",
             "recommended_action": "Wait for more data before committing resources."
         }
 
-    def _limited_mission(self, avg):
+    @staticmethod
+    def _limited_mission(avg):
         return {
             "decision": "LIMITED_MISSION",
             "reason": f"Moderate demand detected (avg {avg:.2f}).",
             "recommended_action": "Launch a limited-scale mission to test demand."
         }
 
-    def _full_mission(self, avg, peak):
+    @staticmethod
+    def _full_mission(avg, peak):
         return {
             "decision": "FULL_MISSION",
             "reason": (
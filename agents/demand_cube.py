@@ -0,0 +1,286 @@
+import numpy as np
+import pandas as pd
+
+from agents.action_plan import build_action_plan, display_action_plan
+
+# Dense cells (products × regions × days) allowed before falling back to
+# grouped aggregates: 25M cells is ~225 MB of values plus observed mask
+MAX_CELLS = 25_000_000
+
+
+class CubeTooLarge(ValueError):
+    pass
+
+
+# ==================================================
+# SHARED METRICS
+# ==================================================
+class DemandView:
+    """
+    Metrics common to every demand aggregate, built on pair_totals()
+    and active_days().
+    """
+
+    def action_plan(self):
+        """
+        Display-ready action plan (see agents.action_plan).
+        """
+        return display_action_plan(build_action_plan(
+            self.pair_totals(), self.product_col, self.region_col, self.target_col
+        ))
+
+    def growth(self, product, region):
+        """
+        Percent change of demand in the later half of the series'
+        active days over the earlier half, relative to its total.
+        """
+        demand = self.active_days(product, region).to_numpy(dtype="float64")
+        half = len(demand) // 2
+        return (demand[half:].sum() - demand[:half].sum()) / max(demand.sum(), 1) * 100
+
+    def risk(self, product, region):
+        """
+        "High" when daily demand varies more than its mean, else "Medium".
+        """
+        demand = self.active_days(product, region)
+        return "High" if demand.std() > demand.mean() else "Medium"
+
+
+def demand_view(df: pd.DataFrame, date_col: str, target_col: str,
+                product_col: str, region_col: str, max_cells: int = MAX_CELLS):
+    """
+    A DemandCube when the dense array stays within max_cells, otherwise
+    GroupedDemand, which answers the same queries from groupby results
+    whose size is bounded by the number of rows.
+    """
+    try:
+        return DemandCube.from_frame(
+            df, date_col, target_col, product_col, region_col, max_cells=max_cells
+        )
+    except CubeTooLarge:
+        return GroupedDemand.from_frame(df, date_col, target_col, product_col, region_col)
+
+
+# ==================================================
+# DEMAND CUBE
+# ==================================================
+class DemandCube(DemandView):
+    """
+    Demand pre-aggregated once into a dense product × region × day
+    array, with label indexes for each axis.
+
+    Totals, rankings, the heatmap, per-series metrics and the action
+    plan are slices or reductions of the cube, so their cost depends
+    on the number of products, regions and days, not on raw rows.
+    Rows without a parseable date still count towards totals but are
+    kept out of the daily axis; rows with no product or region are
+    dropped, as a groupby would.
+
+    The array is dense, so from_frame refuses shapes above max_cells
+    with CubeTooLarge; use demand_view() to fall back automatically.
+    """
+
+    def __init__(self, values, observed, undated, undated_rows, products,
+                 regions, days, names, integer=False):
+        self.values = values
+        self.observed = observed
+        self.undated = undated
+        self.undated_rows = undated_rows
+        self.products = products
+        self.regions = regions
+        self.days = days
+        self.product_col, self.region_col, self.target_col = names
+        self.integer = integer
+
+        self.totals = values.sum(axis=2) + undated
+        self.pair_observed = observed.any(axis=2) | undated_rows
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, date_col: str, target_col: str,
+                   product_col: str, region_col: str, max_cells: int = MAX_CELLS):
+        products, p = _codes(df[product_col])
+        regions, r = _codes(df[region_col])
+
+        dates = pd.to_datetime(df[date_col], errors="coerce").dt.normalize()
+        amounts = np.nan_to_num(df[target_col].to_numpy(dtype="float64"))
+
+        keyed = (p >= 0) & (r >= 0)
+        dated = keyed & dates.notna().to_numpy()
+
+        if dated.any():
+            start = dates[dated].min()
+            day = ((dates - start).dt.days.to_numpy(na_value=0)).astype("int64")
+            days = pd.date_range(start, periods=int(day[dated].max()) + 1, freq="D")
+        else:
+            day = np.zeros(len(df), dtype="int64")
+            days = pd.DatetimeIndex([])
+
+        shape = (len(products), len(regions), len(days))
+        cells = int(np.prod(shape, dtype="float64"))
+        if cells > max_cells:
+            raise CubeTooLarge(
+                f"Demand cube of {shape[0]} × {shape[1]} × {shape[2]} needs "
+                f"{cells:,} cells, above the limit of {max_cells:,}"
+            )
+
+        pair = p * len(regions) + r
+        cell = pair * len(days) + day
+
+        values = np.bincount(
+            cell[dated], weights=amounts[dated], minlength=cells
+        ).reshape(shape)
+        observed = np.zeros(shape, dtype=bool)
+        observed.flat[cell[dated]] = True
+
+        loose = keyed & ~dated
+        undated = np.bincount(
+            pair[loose], weights=amounts[loose], minlength=shape[0] * shape[1]
+        ).reshape(shape[:2])
+        undated_rows = np.zeros(shape[:2], dtype=bool)
+        undated_rows.flat[pair[loose]] = True
+
+        return cls(
+            values, observed, undated, undated_rows, products, regions, days,
+            (product_col, region_col, target_col),
+            integer=pd.api.types.is_integer_dtype(df[target_col])
+        )
+
+    # -----------------------------
+    # Totals and rankings
+    # -----------------------------
+    def product_totals(self):
+        """
+        Total demand per product, largest first.
+        """
+        present = self.pair_observed.any(axis=1)
+        totals = pd.Series(
+            self._target(self.totals.sum(axis=1)[present]),
+            index=self.products[present], name=self.target_col
+        )
+        return totals.sort_values(ascending=False, kind="stable")
+
+    def region_totals(self):
+        """
+        Total demand per region, largest first.
+        """
+        present = self.pair_observed.any(axis=0)
+        totals = pd.Series(
+            self._target(self.totals.sum(axis=0)[present]),
+            index=self.regions[present], name=self.target_col
+        )
+        return totals.sort_values(ascending=False, kind="stable")
+
+    def pair_totals(self):
+        """
+        One row per observed product × region pair with its total
+        demand, in label order (the shape of a groupby sum).
+        """
+        i, j = np.nonzero(self.pair_observed)
+        return pd.DataFrame({
+            self.product_col: self.products[i],
+            self.region_col: self.regions[j],
+            self.target_col: self._target(self.totals[i, j]),
+        })
+
+    # -----------------------------
+    # Per-series slices
+    # -----------------------------
+    def total(self, product, region):
+        i, j = self._position(product, region)
+        return self._target(self.totals[i, j])
+
+    def daily(self, product, region):
+        """
+        Daily demand for one series over the cube's full date range.
+        """
+        i, j = self._position(product, region)
+        return pd.Series(self.values[i, j], index=self.days, name=self.target_col)
+
+    def active_days(self, product, region):
+        """
+        Daily demand on the days the series has sales rows.
+        """
+        i, j = self._position(product, region)
+        mask = self.observed[i, j]
+        return pd.Series(
+            self.values[i, j][mask], index=self.days[mask], name=self.target_col
+        )
+
+    def _position(self, product, region):
+        return self.products.get_loc(product), self.regions.get_loc(region)
+
+    def _target(self, values):
+        # Integer targets keep integer totals, as a groupby sum would
+        if self.integer:
+            return np.rint(values).astype("int64")
+        return values
+
+
+# ==================================================
+# GROUPED FALLBACK
+# ==================================================
+class GroupedDemand(DemandView):
+    """
+    The DemandCube queries answered from one groupby to product ×
+    region × day totals, stored sparsely (only days with sales). Used
+    when the dense cube would be too large for memory.
+    """
+
+    def __init__(self, daily: pd.Series, names):
+        self.product_col, self.region_col, self.target_col = names
+        self.daily_totals = daily
+
+        self.pairs = daily.groupby(level=[0, 1], observed=True).sum()
+        dated = daily.index.get_level_values(2).dropna()
+        self.days = (
+            pd.date_range(dated.min(), dated.max(), freq="D")
+            if len(dated) else pd.DatetimeIndex([])
+        )
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, date_col: str, target_col: str,
+                   product_col: str, region_col: str):
+        keyed = df[product_col].notna() & df[region_col].notna()
+        frame = pd.DataFrame({
+            product_col: df[product_col][keyed],
+            region_col: df[region_col][keyed],
+            "day": pd.to_datetime(df[date_col][keyed], errors="coerce").dt.normalize(),
+            target_col: df[target_col][keyed],
+        })
+        # dropna=False keeps undated rows (NaT day) in the totals
+        daily = frame.groupby(
+            [product_col, region_col, "day"], observed=True, dropna=False
+        )[target_col].sum()
+        return cls(daily, (product_col, region_col, target_col))
+
+    def product_totals(self):
+        totals = self.pairs.groupby(level=0, observed=True).sum()
+        return totals.sort_values(ascending=False, kind="stable")
+
+    def region_totals(self):
+        totals = self.pairs.groupby(level=1, observed=True).sum()
+        return totals.sort_values(ascending=False, kind="stable")
+
+    def pair_totals(self):
+        return self.pairs.reset_index()
+
+    def total(self, product, region):
+        return self.pairs.get((product, region), 0)
+
+    def daily(self, product, region):
+        return self.active_days(product, region).reindex(self.days, fill_value=0)
+
+    def active_days(self, product, region):
+        try:
+            days = self.daily_totals.loc[(product, region)]
+        except KeyError:
+            return pd.Series([], index=pd.DatetimeIndex([]), name=self.target_col,
+                             dtype="float64")
+        return days[days.index.notna()].rename(self.target_col)
+
+
+def _codes(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories, series.cat.codes.to_numpy(dtype="int64")
+    codes, labels = pd.factorize(series, sort=True)
+    return labels, codes.astype("int64")
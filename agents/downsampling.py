@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+# ==================================================
+# CHART POINT BUDGETS
+# ==================================================
+LINE_POINTS = 500
+HEATMAP_ROWS = 20
+HEATMAP_COLUMNS = 25
+OTHER_LABEL = "Other"
+
+
+# ==================================================
+# TIME SERIES: LARGEST-TRIANGLE-THREE-BUCKETS
+# ==================================================
+def lttb_indices(x, y, threshold: int = LINE_POINTS):
+    """
+    Positions of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; the rest are split into
+    threshold - 2 buckets, and from each the point forming the largest
+    triangle with the previously kept point and the next bucket's mean
+    is chosen. Peaks and troughs survive, unlike plain decimation.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    n = len(x)
+
+    if threshold >= n or n <= 2:
+        return np.arange(n)
+    if threshold < 3:
+        raise ValueError("LTTB needs a threshold of at least 3 points")
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype("int64")
+    keep = np.empty(threshold, dtype="int64")
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i == threshold - 3:
+            next_x, next_y = x[-1], y[-1]
+        else:
+            following = slice(hi, edges[i + 2])
+            next_x, next_y = x[following].mean(), y[following].mean()
+
+        area = np.abs(
+            (x[a] - next_x) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (next_y - y[a])
+        )
+        # Gaps (NaN demand) never win a bucket unless it is all gaps
+        a = lo + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        keep[i + 1] = a
+
+    return keep
+
+
+def lttb(series: pd.Series, threshold: int = LINE_POINTS):
+    """
+    Downsample a series (numeric or datetime index) to at most
+    threshold points with LTTB.
+    """
+    index = series.index
+    if isinstance(index, pd.DatetimeIndex):
+        x = index.asi8
+    elif pd.api.types.is_numeric_dtype(index):
+        x = index.to_numpy()
+    else:
+        x = np.arange(len(series))
+
+    return series.iloc[lttb_indices(x, series.to_numpy(dtype="float64"), threshold)]
+
+
+def downsample_frame(df: pd.DataFrame, x: str, y: str,
+                     threshold: int = LINE_POINTS, by: str = None):
+    """
+    LTTB over the rows of a long-format chart frame, separately for each
+    group in by (e.g. one line per colour). Rows must be sorted by x.
+    """
+    if by is None:
+        positions = lttb_indices(_numeric(df[x]), df[y], threshold)
+        return df.iloc[positions]
+
+    parts = [
+        group.iloc[lttb_indices(_numeric(group[x]), group[y], threshold)]
+        for _, group in df.groupby(by, sort=False, observed=True)
+    ]
+    return pd.concat(parts) if parts else df
+
+
+def _numeric(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype="datetime64[ns]").astype("int64")
+    return values.to_numpy(dtype="float64")
+
+
+# ==================================================
+# CATEGORICAL AXES: TOP-K + "OTHER"
+# ==================================================
+def top_k(df: pd.DataFrame, column: str, value: str, k: int,
+          other: str = OTHER_LABEL):
+    """
+    Keep the k labels of column with the largest total value and fold
+    the rest into one "Other" label. Rows are relabelled, not summed.
+    """
+    if k < 1:
+        raise ValueError("top_k needs k of at least 1")
+
+    totals = df.groupby(column, observed=True)[value].sum()
+    if len(totals) <= k:
+        return df
+
+    # k - 1 real labels plus "Other" keeps the axis at k entries
+    kept = totals.nlargest(k - 1).index
+    labels = df[column].astype(object).where(df[column].isin(kept), other)
+    return df.assign(**{column: labels})
+
+
+def top_k_cells(df: pd.DataFrame, rows: str, columns: str, value: str,
+                max_rows: int = HEATMAP_ROWS, max_columns: int = HEATMAP_COLUMNS,
+                other: str = OTHER_LABEL):
+    """
+    Heatmap cells limited to max_rows × max_columns: the largest labels
+    on each axis, the remainder summed into "Other".
+    """
+    folded = top_k(top_k(df, rows, value, max_rows, other), columns, value,
+                   max_columns, other)
+    if folded is df:
+        return df
+
+    return (
+        folded.groupby([rows, columns], observed=True, sort=False)[value]
+        .sum()
+        .reset_index()
+    )
@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+
+from agents.geo_navigation_agent import fuel_cost
+from agents.parallel import process_map
+from agents.route_optimizer import TIME_BUDGET, optimize_stop_order
+
+
+# ==================================================
+# PROCESS POOL WORKER
+# ==================================================
+def _order_vehicle(task):
+    distances, return_to_depot, time_budget = task
+    return optimize_stop_order(distances, return_to_depot, time_budget)["order"]
+
+
+# ==================================================
+# MULTI-WAREHOUSE FLEET PLANNER
+# ==================================================
+def plan_fleet(
+    agent,
+    warehouses,
+    hub_demand,
+    vehicles,
+    capacity: float,
+    fuel_price: float,
+    return_to_depot: bool = True,
+    max_workers: int = None,
+    time_budget: float = TIME_BUDGET
+):
+    """
+    Assign demand hubs to a fleet spread over several warehouses and
+    plan every vehicle's route.
+
+    hub_demand maps hub -> demand (a dict or Series). vehicles is either
+    the total fleet size, split evenly across warehouses, or a dict of
+    warehouse -> vehicle count. Hubs are taken largest demand first and
+    given to the vehicle with room that reaches them most cheaply from
+    its depot or an already assigned stop, weighted by how full the
+    vehicle already is; a hub larger than any remaining room is split
+    across vehicles. Each vehicle's stop order is then optimized in a
+    worker process.
+
+    Returns per-vehicle routes, demand that did not fit or cannot be
+    routed, and fleet totals.
+    """
+    if capacity <= 0:
+        raise ValueError("Vehicle capacity must be positive")
+    if not warehouses:
+        raise ValueError("At least one warehouse is required")
+    for warehouse in warehouses:
+        if warehouse not in agent.index:
+            raise ValueError(f"Routing not supported for: {warehouse}")
+
+    fleet = _fleet(warehouses, vehicles)
+    demand = pd.Series(hub_demand, dtype="float64")
+    demand = demand[demand > 0]
+
+    unroutable = [hub for hub in demand.index if hub not in agent.index]
+    demand = demand.drop(unroutable).sort_values(ascending=False, kind="stable")
+
+    nodes = list(dict.fromkeys(list(warehouses) + list(demand.index)))
+    distances = agent.distance_matrix(nodes)
+    position = {node: i for i, node in enumerate(nodes)}
+
+    loads, stops, unassigned = _assign(
+        distances, position, fleet, demand, capacity
+    )
+
+    tasks = []
+    for (depot, _), hubs in zip(fleet, stops):
+        members = [position[depot]] + [position[hub] for hub, _ in hubs]
+        tasks.append((
+            distances[np.ix_(members, members)], return_to_depot, time_budget
+        ))
+
+    orders = _run(tasks, max_workers)
+
+    routes = []
+    for (depot, vehicle), hubs, load, order in zip(fleet, stops, loads, orders):
+        if not hubs:
+            continue
+
+        sequence = [depot] + [hub for hub, _ in hubs]
+        route = agent.plan_route(
+            [sequence[i] for i in order], fuel_price,
+            return_to_depot=return_to_depot
+        )
+        routes.append({
+            "vehicle": vehicle,
+            "warehouse": depot,
+            "deliveries": dict(hubs),
+            "load": float(load),
+            "utilization": float(load / capacity),
+            **route,
+        })
+
+    return {
+        "routes": routes,
+        "unassigned": {hub: float(units) for hub, units in unassigned.items()},
+        "unroutable": unroutable,
+        "vehicles_used": len(routes),
+        "total_distance_km": round(sum(r["distance_km"] for r in routes), 2),
+        "total_fuel_cost": round(sum(r["fuel_cost"] for r in routes), 2),
+    }
+
+
+def price_fleet(plan: dict, fuel_price: float):
+    """
+    The plan with every route's fuel cost, and the fleet total,
+    recomputed from its distance at fuel_price. Routes do not depend
+    on the price, so a cached plan can be repriced without replanning.
+    """
+    routes = [
+        {**route, "fuel_cost": fuel_cost(route["distance_km"], fuel_price)}
+        for route in plan["routes"]
+    ]
+    return {
+        **plan,
+        "routes": routes,
+        "total_fuel_cost": round(sum(r["fuel_cost"] for r in routes), 2),
+    }
+
+
+def fleet_table(plan: dict):
+    """
+    One row per dispatched vehicle, for display.
+    """
+    return pd.DataFrame([
+        {
+            "Vehicle": route["vehicle"],
+            "Warehouse": route["warehouse"],
+            "Route": " → ".join(route["path"]),
+            "Load": route["load"],
+            "Utilization": f"{route['utilization']:.0%}",
+            "Distance (km)": route["distance_km"],
+            "ETA (hours)": route["eta_hours"],
+            "Fuel Cost (₹)": route["fuel_cost"],
+        }
+        for route in plan["routes"]
+    ])
+
+
+# -----------------------------
+# Assignment
+# -----------------------------
+def _fleet(warehouses, vehicles):
+    if isinstance(vehicles, dict):
+        counts = [int(vehicles.get(w, 0)) for w in warehouses]
+    else:
+        base, extra = divmod(int(vehicles), len(warehouses))
+        counts = [base + (i < extra) for i in range(len(warehouses))]
+
+    return [
+        (warehouse, f"{warehouse}-{k + 1}")
+        for warehouse, count in zip(warehouses, counts)
+        for k in range(count)
+    ]
+
+
+def _assign(distances, position, fleet, demand, capacity):
+    n_vehicles = len(fleet)
+    loads = np.zeros(n_vehicles)
+    stops = [[] for _ in range(n_vehicles)]
+    unassigned = {}
+
+    # Cheapest way each vehicle can currently reach each node: from its
+    # depot or from any hub already on its route
+    reach = distances[[position[depot] for depot, _ in fleet]].copy()
+
+    for hub, units in demand.items():
+        h = position[hub]
+        remaining = units
+
+        while remaining > 0:
+            room = capacity - loads
+            fits = room >= remaining
+            candidates = fits if fits.any() else room > 0
+            if not candidates.any():
+                unassigned[hub] = remaining
+                break
+
+            score = np.where(candidates, reach[:, h] * (1 + loads / capacity), np.inf)
+            v = int(np.argmin(score))
+            take = min(remaining, room[v])
+
+            loads[v] += take
+            stops[v].append((hub, take))
+            reach[v] = np.minimum(reach[v], distances[h])
+            remaining -= take
+
+    return loads, stops, unassigned
+
+
+def _run(tasks, max_workers):
+    # Routes of one or two stops need no search; a pool only pays off
+    # when several vehicles have stops to order
+    busy = [task for task in tasks if len(task[0]) > 2]
+    if len(busy) <= 1:
+        max_workers = 1
+    return process_map(_order_vehicle, tasks, max_workers)
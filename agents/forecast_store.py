@@ -0,0 +1,346 @@
+import atexit
+import threading
+
+import pandas as pd
+
+from agents.forecasting_agent import ForecastCache
+from agents.holt_engine import HoltFit
+from persistence import WriteBehindQueue, get_pool
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS forecast_models (
+        fingerprint TEXT NOT NULL,
+        product TEXT NOT NULL,
+        region TEXT NOT NULL,
+        frequency TEXT NOT NULL,
+        engine TEXT NOT NULL,
+        alpha REAL,
+        beta REAL,
+        level REAL,
+        trend REAL,
+        level0 REAL,
+        trend0 REAL,
+        sse REAL,
+        nobs INTEGER,
+        last_index TEXT,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (fingerprint, product, region, frequency, engine)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_forecast_models_series ON forecast_models (product, region)",
+    """
+    CREATE TABLE IF NOT EXISTS forecasts (
+        source TEXT NOT NULL,
+        product TEXT NOT NULL,
+        region TEXT NOT NULL,
+        date TEXT NOT NULL,
+        forecast REAL,
+        frequency TEXT,
+        confidence TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (source, product, region, date)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS decisions (
+        source TEXT NOT NULL,
+        product TEXT NOT NULL,
+        region TEXT NOT NULL,
+        decision TEXT,
+        avg_demand REAL,
+        peak_demand REAL,
+        confidence TEXT,
+        frequency TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (source, product, region)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_decisions_decision ON decisions (decision)",
+]
+
+MODEL_COLUMNS = ("alpha", "beta", "level", "trend", "level0", "trend0",
+                 "sse", "nobs", "last_index")
+KEY_COLUMNS = ("fingerprint", "product", "region", "frequency", "engine")
+# Output tables keyed by source; earlier layouts are dropped and rebuilt
+OUTPUT_TABLES = ("forecasts", "decisions")
+# Keys per bulk SELECT, well under SQLite's bound-parameter limit
+LOAD_CHUNK = 150
+
+
+# ==================================================
+# FORECAST STORE
+# ==================================================
+class ForecastStore:
+    """
+    SQLite tables for fitted Holt models (keyed by series fingerprint),
+    forecasts and decisions, on the persistence connection pool.
+    Forecasts and decisions are keyed by source (e.g. the input file)
+    as well as product and region, so runs over different files with
+    the same series labels do not overwrite each other.
+
+    Writes go through a write-behind queue, so saving never blocks
+    the caller; call flush() before reading back in the same process.
+    Pending writes are also flushed when the process exits.
+    """
+
+    def __init__(self, pool=None, write_behind: bool = True):
+        self.pool = pool or get_pool()
+        with self.pool.transaction() as conn:
+            _drop_unsourced(conn)
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+        self._writer = None
+        if write_behind:
+            self._writer = WriteBehindQueue(self.pool)
+            atexit.register(self.close)
+
+    # -----------------------------
+    # Fitted models
+    # -----------------------------
+    def load_model(self, key):
+        fingerprint, product, region, freq, engine = key
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(MODEL_COLUMNS)} FROM forecast_models "
+                "WHERE fingerprint = ? AND product = ? AND region = ? "
+                "AND frequency = ? AND engine = ?",
+                (fingerprint, _label(product), _label(region), freq, engine)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        values = dict(zip(MODEL_COLUMNS, row))
+        return HoltFit(freq=freq, **values)
+
+    def load_models(self, keys):
+        """
+        Stored models for many keys with one SELECT per LOAD_CHUNK keys,
+        as {key: HoltFit} for the keys found.
+        """
+        wanted = {}
+        for key in keys:
+            fingerprint, product, region, freq, engine = key
+            wanted[(fingerprint, _label(product), _label(region), freq, engine)] = key
+
+        labels = list(wanted)
+        found = {}
+
+        with self.pool.connection() as conn:
+            for start in range(0, len(labels), LOAD_CHUNK):
+                chunk = labels[start:start + LOAD_CHUNK]
+                rows = conn.execute(
+                    f"SELECT {', '.join(KEY_COLUMNS + MODEL_COLUMNS)} "
+                    f"FROM forecast_models WHERE ({', '.join(KEY_COLUMNS)}) IN "
+                    f"(VALUES {', '.join(['(?, ?, ?, ?, ?)'] * len(chunk))})",
+                    [value for label in chunk for value in label]
+                ).fetchall()
+
+                for row in rows:
+                    label = row[:len(KEY_COLUMNS)]
+                    values = dict(zip(MODEL_COLUMNS, row[len(KEY_COLUMNS):]))
+                    found[wanted[label]] = HoltFit(freq=label[3], **values)
+
+        return found
+
+    def save_model(self, key, model):
+        fingerprint, product, region, freq, engine = key
+        if not isinstance(model, HoltFit):
+            model = HoltFit.from_statsmodels(model, model.fittedvalues)
+
+        self._write(
+            "INSERT OR REPLACE INTO forecast_models (fingerprint, product, region, "
+            f"frequency, engine, {', '.join(MODEL_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * (5 + len(MODEL_COLUMNS)))})",
+            [(
+                fingerprint, _label(product), _label(region), freq, engine,
+                model.alpha, model.beta, model.level, model.trend,
+                model.level0, model.trend0, model.sse, model.nobs,
+                model.last_index.isoformat()
+            )]
+        )
+
+    # -----------------------------
+    # Forecasts and decisions
+    # -----------------------------
+    def save_forecasts(self, forecasts: pd.DataFrame, source: str = ""):
+        """
+        Store the long-format output of ForecastingAgent.forecast_all
+        under source.
+        """
+        self._write(
+            "INSERT OR REPLACE INTO forecasts "
+            "(source, product, region, date, forecast, frequency, confidence) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            list(zip(
+                [source] * len(forecasts),
+                map(_label, forecasts["product"]),
+                map(_label, forecasts["region"]),
+                pd.to_datetime(forecasts["date"]).dt.strftime("%Y-%m-%d"),
+                forecasts["forecast"].astype("float64"),
+                forecasts["frequency"].astype(str),
+                forecasts["confidence"].astype(str),
+            ))
+        )
+
+    def load_forecasts(self, product=None, region=None, source=None):
+        query, params = _series_filter(
+            "SELECT source, product, region, date, forecast, frequency, confidence "
+            "FROM forecasts", product, region, source
+        )
+        with self.pool.connection() as conn:
+            df = pd.read_sql_query(
+                query + " ORDER BY source, product, region, date", conn, params=params
+            )
+        df["date"] = pd.to_datetime(df["date"])
+        return df
+
+    def save_decisions(self, decisions: pd.DataFrame, source: str = ""):
+        """
+        Store DecisionAgent.decide_all output (one row per series) under
+        source.
+        """
+        self._write(
+            "INSERT OR REPLACE INTO decisions (source, product, region, decision, "
+            "avg_demand, peak_demand, confidence, frequency) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            list(zip(
+                [source] * len(decisions),
+                map(_label, decisions["product"]),
+                map(_label, decisions["region"]),
+                decisions["decision"].astype(str),
+                decisions["avg_demand"].astype("float64"),
+                decisions["peak_demand"].astype("float64"),
+                decisions["confidence"].astype(str),
+                decisions["frequency"].astype(str),
+            ))
+        )
+
+    def load_decisions(self, product=None, region=None, source=None):
+        query, params = _series_filter(
+            "SELECT source, product, region, decision, avg_demand, peak_demand, "
+            "confidence, frequency FROM decisions", product, region, source
+        )
+        with self.pool.connection() as conn:
+            return pd.read_sql_query(
+                query + " ORDER BY source, product, region", conn, params=params
+            )
+
+    def flush(self):
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self):
+        """
+        Commit pending writes and stop the writer; later saves are
+        written synchronously.
+        """
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            atexit.unregister(self.close)
+            writer.close()
+
+    def _write(self, sql, rows):
+        if not rows:
+            return
+        if self._writer is None:
+            with self.pool.transaction() as conn:
+                conn.executemany(sql, rows)
+        else:
+            for params in rows:
+                self._writer.submit(sql, params)
+
+
+# ==================================================
+# PERSISTENT MODEL CACHE
+# ==================================================
+class PersistentForecastCache(ForecastCache):
+    """
+    ForecastCache backed by a ForecastStore: misses in memory fall
+    through to the stored models, and every new model is saved.
+
+    Passed as ForecastingAgent(cache=...), a new process reuses the
+    models of every series whose fingerprint is unchanged and only
+    fits the series that changed.
+    """
+
+    def __init__(self, store: ForecastStore = None, maxsize: int = 4096):
+        super().__init__(maxsize)
+        self.store = store or ForecastStore()
+        self.store_hits = 0
+
+    def get(self, key):
+        model = super().get(key)
+        if model is not None:
+            return model
+
+        model = self.store.load_model(key)
+        if model is not None:
+            self.store_hits += 1
+            super().put(key, model)
+        return model
+
+    def get_many(self, keys):
+        found = super().get_many(keys)
+        missing = [key for key in keys if key not in found]
+        if not missing:
+            return found
+
+        stored = self.store.load_models(missing)
+        self.store_hits += len(stored)
+        for key, model in stored.items():
+            super().put(key, model)
+        return {**found, **stored}
+
+    def put(self, key, model):
+        super().put(key, model)
+        self.store.save_model(key, model)
+
+    def stats(self):
+        return {**super().stats(), "store_hits": self.store_hits}
+
+
+_SHARED_CACHE = None
+_SHARED_LOCK = threading.Lock()
+
+
+def persistent_cache():
+    """
+    The process-wide PersistentForecastCache on the default database.
+    """
+    global _SHARED_CACHE
+    if _SHARED_CACHE is None:
+        with _SHARED_LOCK:
+            if _SHARED_CACHE is None:
+                _SHARED_CACHE = PersistentForecastCache()
+    return _SHARED_CACHE
+
+
+def _label(value):
+    # Series keys are stored as text; a missing product/region is ""
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value)
+
+
+def _drop_unsourced(conn):
+    # Forecasts and decisions are derived output; tables from before the
+    # source column cannot take the new primary key, so start them afresh
+    for table in OUTPUT_TABLES:
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        if columns and "source" not in columns:
+            conn.execute(f"DROP TABLE {table}")
+
+
+def _series_filter(query, product, region, source=None):
+    clauses, params = [], []
+    for column, value in (("source", source), ("product", product), ("region", region)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value if column == "source" else _label(value))
+
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    return query, params
@@ -1,7 +1,128 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
 from statsmodels.tsa.holtwinters import ExponentialSmoothing
 
+from agents.holt_engine import HoltFit, fit_holt_batch, future_index, holt_filter
+from agents.parallel import process_map
+
+FREQUENCIES = ["D", "W", "ME"]
+MIN_SERIES_LENGTH = 8
+ENGINES = ["statsmodels", "numpy"]
+
+# Incremental updates: refit after this many new periods, or when the
+# one-step error on new data exceeds DRIFT_THRESHOLD × the in-sample RMSE
+REFIT_EVERY = 30
+DRIFT_THRESHOLD = 3.0
+# Pending (appended) rows are merged into the partition layout once they
+# exceed this fraction of the indexed rows
+COMPACT_FRACTION = 0.1
+
+
+# ==================================================
+# PROCESS POOL WORKER
+# ==================================================
+def _forecast_partition(task):
+    key, daily, horizon = task
+    fits = []
+
+    def fit(ts, freq):
+        fitted = ForecastingAgent._fit_ets(ts, freq)
+        # Only the Holt state travels back, for the parent's model cache
+        fits.append(HoltFit.from_statsmodels(fitted, ts))
+        return fitted
+
+    result = ForecastingAgent._run_cascade(daily, horizon, fit=fit)
+    return key, result, fits[0] if fits else None
+
+
+# ==================================================
+# FITTED MODEL CACHE
+# ==================================================
+class ForecastCache:
+    """
+    Bounded LRU cache of fitted ETS models.
+
+    Keys combine a fingerprint of the aggregated series with the
+    product, region, frequency and engine it was fitted with, so any horizon
+    can be produced from a cached model without refitting.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._take(key)
+
+    def get_many(self, keys):
+        """
+        Models for several keys at once, as {key: model} for the hits.
+        """
+        with self._lock:
+            found = {key: self._take(key) for key in keys}
+        return {key: model for key, model in found.items() if model is not None}
+
+    def _take(self, key):
+        model = self._models.get(key)
+        if model is None:
+            self.misses += 1
+            return None
+
+        self._models.move_to_end(key)
+        self.hits += 1
+        return model
+
+    def put(self, key, model):
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._models[key] = model
+            self._models.move_to_end(key)
+
+            while len(self._models) > self.maxsize:
+                self._models.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._models),
+            "maxsize": self.maxsize
+        }
+
+    def __len__(self):
+        return len(self._models)
+
+
+# Shared by every agent in the process (e.g. across Streamlit reruns)
+FORECAST_CACHE = ForecastCache()
+
+
+def series_fingerprint(ts: pd.Series) -> str:
+    """
+    Content hash of an aggregated series (index and values).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(ts.index.asi8.tobytes() if len(ts) else b"")
+    digest.update(np.ascontiguousarray(ts.to_numpy(dtype="float64")).tobytes())
+    return digest.hexdigest()
+
+
 class ForecastingAgent:
     """
     Agent responsible for forecasting future demand
@@ -14,16 +135,118 @@ class ForecastingAgent:
         date_col: str,
         target_col: str,
         product_col: str = None,
-        region_col: str = None
+        region_col: str = None,
+        cache: ForecastCache = None,
+        date_format: str = None
     ):
-        self.df = df.copy()
         self.date_col = date_col
+        self.date_format = date_format
         self.target_col = target_col
         self.product_col = product_col
         self.region_col = region_col
+        self.cache = FORECAST_CACHE if cache is None else cache
 
-        self.df[self.date_col] = pd.to_datetime(self.df[self.date_col])
-        self.df = self.df.sort_values(self.date_col)
+        # Rows are laid out partition by partition (product, region, date),
+        # so every series is a contiguous row range of self.df
+        self._key_cols = [c for c in (product_col, region_col) if c]
+        self.df = self._layout(self._prepare(df))
+        self._build_partition_index()
+
+        # Incremental state: rows appended by update() that are not yet in
+        # the partition layout, daily series per queried (product, region),
+        # and the fitted model behind each of them
+        self._pending = None
+        self._daily = {}
+        self._tracked = {}
+
+    def _prepare(self, df):
+        dates = df[self.date_col]
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return df
+
+        # A format cached by SchemaIntelligenceAgent skips per-row guessing
+        return df.assign(
+            **{self.date_col: pd.to_datetime(dates, format=self.date_format)}
+        )
+
+    def _layout(self, df):
+        return df.sort_values(
+            self._key_cols + [self.date_col], kind="stable", ignore_index=True
+        )
+
+    # -----------------------------
+    # Partition index
+    # -----------------------------
+    def _build_partition_index(self):
+        self._pair_index = {}
+        self._product_index = {}
+        self._region_index = {}
+
+        if not self._key_cols:
+            return
+
+        groups = self.df.groupby(
+            self._key_cols, sort=False, dropna=False, observed=True
+        ).indices
+
+        for key, positions in groups.items():
+            key = key if isinstance(key, tuple) else (key,)
+            product = key[0] if self.product_col else None
+            region = key[-1] if self.region_col else None
+            rows = slice(int(positions[0]), int(positions[-1]) + 1)
+
+            self._pair_index[(product, region)] = rows
+            self._region_index.setdefault(region, []).append(rows)
+
+            # Products lead the sort order, so their rows are contiguous
+            start, stop = self._product_index.get(product, (rows.start, rows.stop))
+            self._product_index[product] = (min(start, rows.start), max(stop, rows.stop))
+
+        self._product_index = {
+            product: slice(*bounds)
+            for product, bounds in self._product_index.items()
+        }
+
+    def _select(self, product=None, region=None):
+        data = self._select_indexed(product, region)
+
+        if self._pending is None:
+            return data
+        return pd.concat(
+            [data, self._match(self._pending, product, region)],
+            ignore_index=True
+        )
+
+    def _match(self, data, product=None, region=None):
+        if self.product_col and product:
+            data = data[data[self.product_col] == product]
+
+        if self.region_col and region:
+            data = data[data[self.region_col] == region]
+
+        return data
+
+    def _select_indexed(self, product=None, region=None):
+        by_product = bool(self.product_col and product)
+        by_region = bool(self.region_col and region)
+
+        if by_product and by_region:
+            rows = self._pair_index.get((product, region))
+        elif by_product:
+            rows = self._product_index.get(product)
+        elif by_region:
+            ranges = self._region_index.get(region, [])
+            if len(ranges) > 1:
+                return self.df.iloc[np.concatenate(
+                    [np.arange(r.start, r.stop) for r in ranges]
+                )]
+            rows = ranges[0] if ranges else None
+        else:
+            return self.df
+
+        if rows is None:
+            return self.df.iloc[0:0]
+        return self.df.iloc[rows]
 
     # -----------------------------
     # Main forecasting entry
@@ -32,87 +255,447 @@ class ForecastingAgent:
         self,
         horizon: int = 30,
         product: str = None,
-        region: str = None
+        region: str = None,
+        engine: str = "statsmodels"
     ):
-        data = self.df.copy()
+        self._check_engine(engine)
+        daily = self._daily_for(product, region)
+        freq, ts = self._choose_level(daily)
 
-        # Apply filters
-        if self.product_col and product:
-            data = data[data[self.product_col] == product]
+        if freq == "naive":
+            forecast = self._naive_forecast(ts, horizon)
+        else:
+            fitted = self._tracked_fit(daily, ts, freq, product, region, engine)
+            forecast = fitted.forecast(horizon)
 
-        if self.region_col and region:
-            data = data[data[self.region_col] == region]
+        return self._result(ts, forecast, freq)
+
+    def _daily_for(self, product, region):
+        key = (product, region)
+        if key not in self._daily:
+            self._daily[key] = self._daily_series(self._select(product, region))
+        return self._daily[key]
+
+    def _tracked_fit(self, daily, ts, freq, product, region, engine):
+        fitted = self._cached_fit(ts, freq, product, region, engine)
+
+        state = self._tracked.get((product, region, engine))
+        if state is None or state["daily"] is not daily:
+            self._track(daily, ts, freq, product, region, engine, fitted)
+
+        return fitted
+
+    def _track(self, daily, ts, freq, product, region, engine, fitted):
+        self._tracked[(product, region, engine)] = {
+            "daily": daily, "freq": freq, "ts": ts, "fit": fitted, "steps": 0
+        }
+
+    # -----------------------------
+    # Incremental updates
+    # -----------------------------
+    def update(
+        self,
+        new_rows: pd.DataFrame,
+        refit_every: int = REFIT_EVERY,
+        drift_threshold: float = DRIFT_THRESHOLD
+    ):
+        """
+        Ingest new sales rows without re-reading the history.
+
+        New rows are added to the stored daily series of every series
+        forecast so far (by forecast() or forecast_all()), and each
+        fitted model is advanced through the
+        new periods with its existing smoothing parameters. A series is
+        refitted only when it has advanced refit_every periods since its
+        last fit, when its one-step error drifts, when its frequency level
+        changes or when the new rows revise periods before the last one.
+        """
+        new_rows = self._prepare(new_rows)
+        self._append_pending(new_rows)
+
+        # New rows are split by series once; only partial keys (one
+        # product over all regions, ...) need their own filter
+        by_pair = self._split_pairs(new_rows)
+
+        changed = set()
+        for (product, region), daily in self._daily.items():
+            if self._is_pair(product, region):
+                rows = by_pair.get((product, region), new_rows.iloc[0:0])
+            else:
+                rows = self._match(new_rows, product, region)
+            if len(rows):
+                self._daily[(product, region)] = daily.add(
+                    self._daily_series(rows), fill_value=0
+                ).asfreq("D", fill_value=0)
+                changed.add((product, region))
+
+        summary = {"rows": len(new_rows), "advanced": 0, "refitted": 0}
+        for (product, region, engine) in list(self._tracked):
+            if (product, region) not in changed:
+                continue
+
+            outcome = self._advance(
+                product, region, engine, refit_every, drift_threshold
+            )
+            summary[outcome] += 1
+
+        return summary
+
+    def _split_pairs(self, rows):
+        if not self._key_cols:
+            return {(None, None): rows}
+
+        pairs = {}
+        for key, group in rows.groupby(self._key_cols, sort=False, observed=True):
+            key = key if isinstance(key, tuple) else (key,)
+            product = key[0] if self.product_col else None
+            region = key[-1] if self.region_col else None
+            pairs[(product, region)] = group
+        return pairs
+
+    def _is_pair(self, product, region):
+        return (
+            (product is not None or not self.product_col)
+            and (region is not None or not self.region_col)
+        )
+
+    def _append_pending(self, new_rows):
+        if self._pending is None:
+            self._pending = new_rows.reset_index(drop=True)
+        else:
+            self._pending = pd.concat([self._pending, new_rows], ignore_index=True)
+
+        if len(self._pending) > COMPACT_FRACTION * max(len(self.df), 1):
+            self._compact()
+
+    def _compact(self):
+        if self._pending is None:
+            return
+
+        self.df = self._layout(pd.concat([self.df, self._pending], ignore_index=True))
+        self._pending = None
+        self._build_partition_index()
+
+    def _advance(self, product, region, engine, refit_every, drift_threshold):
+        key = (product, region, engine)
+        state = self._tracked[key]
+        old_ts = state["ts"]
+        daily = self._daily[(product, region)]
+        freq, ts = self._choose_level(daily)
+
+        # The last fitted period may have been partial; everything before
+        # it must be unchanged for the stored state to remain valid
+        closed = len(old_ts) - 1
+        revised = (
+            freq != state["freq"]
+            or len(ts) < len(old_ts)
+            or ts.index[0] != old_ts.index[0]
+            or not np.allclose(ts.values[:closed], old_ts.values[:closed])
+        )
+        if revised:
+            return self._refit(daily, ts, freq, product, region, engine)
+
+        fit = state["fit"]
+        if not isinstance(fit, HoltFit):
+            fit = HoltFit.from_statsmodels(fit, old_ts)
+
+        if "committed" not in state:
+            state["committed"] = holt_filter(
+                old_ts.values[:-1], fit.alpha, fit.beta, fit.level0, fit.trend0
+            )[:2]
+
+        # Re-apply the last fitted period and every new one
+        new_values = ts.values[closed:]
+        committed = holt_filter(new_values[:-1], fit.alpha, fit.beta, *state["committed"])
+        level, trend, sse = holt_filter(new_values, fit.alpha, fit.beta, *state["committed"])
+
+        steps = state["steps"] + len(ts) - len(old_ts)
+        rmse_new = np.sqrt(sse / len(new_values))
+        rmse_fit = np.sqrt(fit.sse / max(fit.nobs, 1))
+        if steps >= refit_every or rmse_new > drift_threshold * max(rmse_fit, 1e-9):
+            return self._refit(daily, ts, freq, product, region, engine)
+
+        advanced = HoltFit(
+            alpha=fit.alpha,
+            beta=fit.beta,
+            level=level,
+            trend=trend,
+            last_index=ts.index[-1],
+            freq=fit.freq,
+            sse=fit.sse,
+            nobs=fit.nobs,
+            level0=fit.level0,
+            trend0=fit.trend0
+        )
+        self.cache.put(self._cache_key(ts, freq, product, region, engine), advanced)
+        self._tracked[key] = {
+            "daily": daily,
+            "freq": freq,
+            "ts": ts,
+            "fit": advanced,
+            "steps": steps,
+            "committed": committed[:2]
+        }
+        return "advanced"
+
+    def _refit(self, daily, ts, freq, product, region, engine):
+        fitted = self._fit_model(ts, freq, engine)
+        self.cache.put(self._cache_key(ts, freq, product, region, engine), fitted)
+        self._track(daily, ts, freq, product, region, engine, fitted)
+        return "refitted"
+
+    # -----------------------------
+    # Batched forecasting (all series)
+    # -----------------------------
+    def forecast_all(
+        self,
+        horizon: int = 30,
+        max_workers: int = None,
+        engine: str = "statsmodels"
+    ):
+        """
+        Forecast every product × region series in one run.
+
+        The frame is grouped once into daily series. Series whose fitted
+        model is already in the cache (e.g. a persistent one) are
+        forecast from it; the rest are fitted in parallel (statsmodels)
+        or as one vectorized batch (numpy) and added to the cache.
+        Every series and its model are tracked, so update() advances
+        them. Returns a long-format DataFrame with one row per series
+        and forecast date.
+        """
+        self._check_engine(engine)
+
+        series = []
+        for key, daily in self._daily_partitions():
+            freq, ts = self._choose_level(daily)
+            cache_key = None if freq == "naive" else self._cache_key(ts, freq, *key, engine)
+            series.append((key, daily, freq, ts, cache_key))
 
-        # Try multiple aggregation levels
-        for freq in ["D", "W", "ME"]:
-            ts = self._aggregate(data, freq)
+        # One lookup for every series, so a persistent cache can read
+        # its stored models in bulk
+        cached = self.cache.get_many([s[-1] for s in series if s[-1] is not None])
 
-            if len(ts) >= 8:
-                forecast = self._ets_forecast(ts, horizon, freq)
-                return {
-                    "history": ts,
-                    "forecast": forecast,
-                    "frequency": freq,
-                    "confidence": self._confidence_label(freq)
-                }
+        # One slot per series, in partition order; cached models fill
+        # their slot straight away
+        slots, misses = [], []
+        for key, daily, freq, ts, cache_key in series:
+            fitted = cached.get(cache_key)
+            self._daily[key] = daily
+
+            if fitted is not None:
+                self._track(daily, ts, freq, *key, engine, fitted)
+
+            if freq == "naive" or fitted is not None:
+                forecast = (
+                    self._naive_forecast(ts, horizon) if fitted is None
+                    else fitted.forecast(horizon)
+                )
+                slots.append((key, self._result(ts, forecast, freq)))
+            else:
+                slots.append(None)
+                misses.append((len(slots) - 1, key, daily, freq, ts))
+
+        if engine == "numpy":
+            fitted = self._forecast_batch(misses, horizon)
+        else:
+            fitted = self._forecast_parallel(misses, horizon, max_workers)
+
+        for (slot, key, daily, freq, ts), (result, model) in zip(misses, fitted):
+            slots[slot] = (key, result)
+            self.cache.put(self._cache_key(ts, freq, *key, engine), model)
+            self._track(daily, ts, freq, *key, engine, model)
+
+        return self._to_long_format(slots)
+
+    def _forecast_parallel(self, misses, horizon, max_workers):
+        tasks = [(key, daily, horizon) for _, key, daily, _, _ in misses]
+        outputs = process_map(_forecast_partition, tasks, max_workers)
+
+        return [(result, model) for _, result, model in outputs]
+
+    def _forecast_batch(self, misses, horizon):
+        fits = fit_holt_batch([ts for *_, ts in misses]) if misses else []
+
+        return [
+            (self._result(ts, fit.forecast(horizon), freq), fit)
+            for (*_, freq, ts), fit in zip(misses, fits)
+        ]
+
+    def _daily_partitions(self):
+        self._compact()
+
+        if not self._pair_index:
+            yield (None, None), self._daily_series(self.df)
+            return
+
+        # Day ordinals and values are extracted once; each series is then
+        # a bincount over its contiguous row range (index is in sort order)
+        days, values = self._day_ordinals(self.df)
+        for key, rows in self._pair_index.items():
+            yield key, self._bincount_daily(days[rows], values[rows])
+
+    def _to_long_format(self, results):
+        if not results:
+            return pd.DataFrame(
+                columns=["product", "region", "date", "forecast",
+                         "frequency", "confidence"]
+            )
+
+        # Each column is built once: keys and labels repeated per series,
+        # dates and values concatenated
+        keys = [key for key, _ in results]
+        forecasts = [result["forecast"] for _, result in results]
+        lengths = [len(forecast) for forecast in forecasts]
+
+        def repeat(values):
+            return np.repeat(np.array(values, dtype=object), lengths)
+
+        return pd.DataFrame({
+            "product": repeat([product for product, _ in keys]),
+            "region": repeat([region for _, region in keys]),
+            "date": self._concat_dates([forecast.index for forecast in forecasts]),
+            "forecast": np.concatenate([forecast.to_numpy() for forecast in forecasts]),
+            "frequency": repeat([result["frequency"] for _, result in results]),
+            "confidence": repeat([result["confidence"] for _, result in results]),
+        })
+
+    @staticmethod
+    def _concat_dates(indexes):
+        if all(isinstance(index, pd.DatetimeIndex) for index in indexes):
+            return np.concatenate([index.to_numpy() for index in indexes])
+        # A naive forecast of an empty series has a plain range index
+        return indexes[0].append(indexes[1:])
+
+    # -----------------------------
+    # Frequency cascade
+    # -----------------------------
+    @staticmethod
+    def _choose_level(daily):
+        # Try multiple aggregation levels, rolled up from the daily series
+        for freq in FREQUENCIES:
+            ts = daily if freq == "D" else daily.resample(freq).sum()
+
+            if len(ts) >= MIN_SERIES_LENGTH:
+                return freq, ts
 
         # Final fallback: naive forecast
-        ts = self._aggregate(data, "D")
-        forecast = self._naive_forecast(ts, horizon)
+        return "naive", daily
+
+    @staticmethod
+    def _run_cascade(daily, horizon, fit=None):
+        fit = fit or ForecastingAgent._fit_ets
+        freq, ts = ForecastingAgent._choose_level(daily)
+
+        if freq == "naive":
+            forecast = ForecastingAgent._naive_forecast(ts, horizon)
+        else:
+            forecast = fit(ts, freq).forecast(horizon)
 
+        return ForecastingAgent._result(ts, forecast, freq)
+
+    @staticmethod
+    def _result(ts, forecast, freq):
         return {
             "history": ts,
             "forecast": forecast,
-            "frequency": "naive",
-            "confidence": "Low"
+            "frequency": freq,
+            "confidence": ForecastingAgent._confidence_label(freq)
         }
 
     # -----------------------------
-    # Aggregation helper
+    # Daily aggregation (single pass)
     # -----------------------------
-    def _aggregate(self, data, freq):
-        ts = (
-            data
-            .groupby(pd.Grouper(key=self.date_col, freq=freq))[self.target_col]
-            .sum()
-            .fillna(0)
+    def _daily_series(self, data):
+        return self._bincount_daily(*self._day_ordinals(data))
+
+    def _day_ordinals(self, data):
+        dates = data[self.date_col]
+        if isinstance(dates.dtype, pd.DatetimeTZDtype):
+            # Bin by local wall-clock day, not by the UTC instant
+            dates = dates.dt.tz_localize(None)
+        dates = dates.to_numpy(dtype="datetime64[ns]")
+        days = dates.astype("datetime64[D]").astype("int64")
+        values = np.nan_to_num(data[self.target_col].to_numpy(dtype="float64"))
+
+        valid = ~np.isnat(dates)
+        if not valid.all():
+            days, values = days[valid], values[valid]
+
+        return days, values
+
+    def _bincount_daily(self, days, values):
+        if len(days) == 0:
+            return pd.Series(
+                [], index=pd.DatetimeIndex([], freq="D", name=self.date_col),
+                name=self.target_col, dtype="float64"
+            )
+
+        first = days.min()
+        totals = np.bincount(days - first, weights=values)
+        index = pd.date_range(
+            start=pd.Timestamp(first, unit="D"),
+            periods=len(totals),
+            freq="D",
+            name=self.date_col
         )
-        return ts
+        return pd.Series(totals, index=index, name=self.target_col)
 
     # -----------------------------
-    # ETS forecasting
+    # ETS fitting
     # -----------------------------
-    def _ets_forecast(self, ts, horizon, freq):
+    @staticmethod
+    def _fit_ets(ts, freq):
         model = ExponentialSmoothing(
             ts,
             trend="add",
             seasonal=None
         )
-        fitted = model.fit()
-        forecast = fitted.forecast(horizon)
+        return model.fit()
+
+    @staticmethod
+    def _fit_model(ts, freq, engine):
+        if engine == "numpy":
+            return fit_holt_batch([ts])[0]
+        return ForecastingAgent._fit_ets(ts, freq)
+
+    @staticmethod
+    def _cache_key(ts, freq, product, region, engine):
+        return (series_fingerprint(ts), product, region, freq, engine)
 
-        return forecast
+    def _cached_fit(self, ts, freq, product, region, engine="statsmodels"):
+        key = self._cache_key(ts, freq, product, region, engine)
+
+        fitted = self.cache.get(key)
+        if fitted is None:
+            fitted = self._fit_model(ts, freq, engine)
+            self.cache.put(key, fitted)
+
+        return fitted
+
+    @staticmethod
+    def _check_engine(engine):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown forecasting engine: {engine}")
 
     # -----------------------------
     # Naive fallback
     # -----------------------------
-    def _naive_forecast(self, ts, horizon):
+    @staticmethod
+    def _naive_forecast(ts, horizon):
         if len(ts) == 0:
             return pd.Series([0] * horizon)
 
         mean_value = ts.mean()
-        index = pd.date_range(
-            start=ts.index.max(),
-            periods=horizon + 1,
-            freq="D"
-        )[1:]
+        index = future_index(ts.index.max(), horizon, "D")
 
         return pd.Series([mean_value] * horizon, index=index)
 
     # -----------------------------
     # Confidence heuristic
     # -----------------------------
-    def _confidence_label(self, freq):
+    @staticmethod
+    def _confidence_label(freq):
         if freq == "D":
             return "High"
         if freq == "W":
@@ -1,6 +1,18 @@
-  import folium
+import threading
+
 import networkx as nx
+import numpy as np
 from math import radians, cos, sin, asin, sqrt
+from scipy.sparse.csgraph import shortest_path
+
+from agents.route_optimizer import TIME_BUDGET, optimize_stop_order
+from agents.route_rendering import to_folium
+
+EARTH_RADIUS_KM = 6371
+FUEL_EFFICIENCY_KMPL = 15
+AVERAGE_SPEED_KMPH = 60
+# Hubs at identical coordinates still need a (non-zero) edge
+MIN_EDGE_KM = 1e-6
 
 # ==================================================
 # SINGLE SOURCE OF TRUTH (ROUTING SAFE CITIES)
@@ -14,7 +26,7 @@ CITY_COORDS = {
 }
 
 # ==================================================
-# DISTANCE FUNCTION
+# DISTANCE FUNCTIONS
 # ==================================================
 def haversine(c1, c2):
     lat1, lon1 = c1
@@ -23,59 +35,194 @@ def haversine(c1, c2):
     dlon = lon2 - lon1
     dlat = lat2 - lat1
     a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-    return 6371 * 2 * asin(sqrt(a))
+    return EARTH_RADIUS_KM * 2 * asin(sqrt(a))
+
+
+def haversine_matrix(coords, other=None):
+    """
+    Pairwise great-circle distances (km) between (lat, lon) rows.
+
+    Returns an (n × m) matrix; with one argument, the symmetric
+    (n × n) matrix of coords against itself.
+    """
+    a = np.radians(np.asarray(coords, dtype="float64").reshape(-1, 2))
+    b = a if other is None else np.radians(
+        np.asarray(other, dtype="float64").reshape(-1, 2)
+    )
+
+    lat1, lon1 = a[:, 0:1], a[:, 1:2]
+    lat2, lon2 = b[:, 0], b[:, 1]
+
+    h = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(np.clip(h, 0, 1)))
+
+
+def fuel_cost(distance_km, fuel_price):
+    """
+    Fuel cost of driving distance_km at fuel_price per litre.
+    """
+    return round((distance_km / FUEL_EFFICIENCY_KMPL) * fuel_price, 2)
+
 
 # ==================================================
 # GEO NAVIGATION AGENT
 # ==================================================
 class GeoNavigationAgent:
-    def __init__(self):
-        self.graph = nx.Graph()
+    """
+    Hub routing over a fixed set of cities.
 
-        for city, coord in CITY_COORDS.items():
-            self.graph.add_node(city, coord=coord)
+    Pairwise distances and all-pairs shortest paths (distances plus a
+    predecessor matrix) are computed once at construction, so route
+    queries are array lookups. Use shared_agent() to reuse one
+    instance across the process.
+    """
 
-        for c1 in CITY_COORDS:
-            for c2 in CITY_COORDS:
-                if c1 != c2:
-                    self.graph.add_edge(
-                        c1, c2,
-                        weight=haversine(CITY_COORDS[c1], CITY_COORDS[c2])
-                    )
+    def __init__(self, coords=None):
+        self.coords = dict(CITY_COORDS if coords is None else coords)
+        self.cities = list(self.coords)
+        self.index = {city: i for i, city in enumerate(self.cities)}
 
-    def plan_multi_stop_route(self, cities, fuel_price):
-        for city in cities:
-            if city not in CITY_COORDS:
-                raise ValueError(f"Routing not supported for: {city}")
+        self.distances = haversine_matrix([self.coords[c] for c in self.cities])
+        # A dense csgraph reads 0 as "no edge"; keep co-located cities linked
+        edges = np.maximum(self.distances, MIN_EDGE_KM)
+        np.fill_diagonal(edges, 0)
+        self.path_lengths, self.predecessors = shortest_path(
+            edges, directed=False, return_predecessors=True
+        )
+        self._graph = None
 
-        total_distance = 0
-        path = []
+    @property
+    def graph(self):
+        """
+        networkx view of the complete city graph, built on first use.
+        """
+        if self._graph is None:
+            graph = nx.Graph()
+            for city, coord in self.coords.items():
+                graph.add_node(city, coord=coord)
 
-        for i in range(len(cities) - 1):
-            segment = nx.dijkstra_path(
-                self.graph, cities[i], cities[i + 1], weight="weight"
-            )
-            distance = nx.dijkstra_path_length(
-                self.graph, cities[i], cities[i + 1], weight="weight"
+            rows, cols = np.triu_indices(len(self.cities), k=1)
+            graph.add_weighted_edges_from(
+                (self.cities[i], self.cities[j], self.distances[i, j])
+                for i, j in zip(rows, cols)
             )
-            total_distance += distance
-            path.extend(segment[:-1])
+            self._graph = graph
+        return self._graph
+
+    # -----------------------------
+    # Shortest-path lookups
+    # -----------------------------
+    def shortest_path(self, source, target):
+        """
+        City sequence of the shortest path, read from the predecessor matrix.
+        """
+        i, j = self.index[source], self.index[target]
 
-        path.append(cities[-1])
+        path = [j]
+        while path[-1] != i:
+            path.append(self.predecessors[i, path[-1]])
+        return [self.cities[k] for k in reversed(path)]
 
-        fuel_cost = round((total_distance / 15) * fuel_price, 2)
-        eta = round(total_distance / 60, 2)
+    def route_distance(self, cities):
+        """
+        Total shortest-path distance along consecutive stops.
+        """
+        stops = [self.index[city] for city in cities]
+        return float(self.path_lengths[stops[:-1], stops[1:]].sum())
 
-        m = folium.Map(location=CITY_COORDS[cities[0]], zoom_start=5)
-        for city in path:
-            folium.Marker(CITY_COORDS[city], tooltip=city).add_to(m)
+    def distance_matrix(self, cities):
+        """
+        Shortest-path distances between every pair of the given stops.
+        """
+        stops = [self.index[city] for city in cities]
+        return self.path_lengths[np.ix_(stops, stops)]
 
-        folium.PolyLine([CITY_COORDS[c] for c in path], color="blue").add_to(m)
+    def order_stops(self, cities, return_to_depot=False, time_budget=TIME_BUDGET):
+        """
+        Reorder the stops after the first (the depot) to shorten the route.
+        """
+        stops = list(dict.fromkeys(cities))
+        result = optimize_stop_order(
+            self.distance_matrix(stops), return_to_depot, time_budget
+        )
+        order = [stops[i] for i in result["order"]]
+        return order + [order[0]] if return_to_depot and len(order) > 1 else order
+
+    def plan_route(self, cities, fuel_price, optimize=False,
+                   return_to_depot=False, time_budget=TIME_BUDGET):
+        """
+        Route through the stops as plain data: hub path, per-leg
+        distances, totals, ETA and fuel cost. Nothing is rendered; pass
+        the result to agents.route_rendering for a map or GeoJSON.
+        """
+        for city in cities:
+            if city not in self.index:
+                raise ValueError(f"Routing not supported for: {city}")
+
+        given = list(cities)
+        if return_to_depot and given[-1] != given[0]:
+            given.append(given[0])
+
+        stops = given
+        if optimize:
+            ordered = self.order_stops(cities, return_to_depot, time_budget)
+            # The heuristic is not exact; never return a longer route
+            if self.route_distance(ordered) < self.route_distance(given):
+                stops = ordered
+
+        path = []
+        legs = []
+        for i in range(len(stops) - 1):
+            segment = self.shortest_path(stops[i], stops[i + 1])
+            path.extend(segment[:-1])
+            legs.append({
+                "from": stops[i],
+                "to": stops[i + 1],
+                "path": segment,
+                "distance_km": round(self.route_distance(stops[i:i + 2]), 2),
+            })
+        path.append(stops[-1])
+
+        total_distance = self.route_distance(stops)
+        saved = self.route_distance(given) - total_distance
 
         return {
             "path": path,
+            "coords": [self.coords[city] for city in path],
+            "legs": legs,
             "distance_km": round(total_distance, 2),
-            "eta_hours": eta,
-            "fuel_cost": fuel_cost,
-            "map": m
+            "eta_hours": round(total_distance / AVERAGE_SPEED_KMPH, 2),
+            "fuel_cost": fuel_cost(total_distance, fuel_price),
+            "stop_order": stops,
+            "distance_saved_km": round(saved, 2),
         }
+
+    def plan_multi_stop_route(self, cities, fuel_price, **options):
+        """
+        plan_route() plus a folium map under "map".
+        """
+        route = self.plan_route(cities, fuel_price, **options)
+        route["map"] = to_folium(route)
+        return route
+
+
+# ==================================================
+# PROCESS-WIDE INSTANCE
+# ==================================================
+_SHARED_AGENT = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_agent():
+    """
+    The process-wide GeoNavigationAgent over CITY_COORDS.
+    """
+    global _SHARED_AGENT
+    if _SHARED_AGENT is None:
+        with _SHARED_LOCK:
+            if _SHARED_AGENT is None:
+                _SHARED_AGENT = GeoNavigationAgent()
+    return _SHARED_AGENT
@@ -0,0 +1,261 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ==================================================
+# SEARCH GRID
+# ==================================================
+# Coarse (alpha, beta) grid, refined twice around the best point.
+# beta <= alpha, matching the bounds statsmodels applies to Holt.
+GRID_STEP = 0.1
+REFINE_ROUNDS = 2
+REFINE_POINTS = 5
+CHUNK_SIZE = 2048
+FUTURE_INDEX_CACHE = 1024
+
+
+# ==================================================
+# FITTED MODEL
+# ==================================================
+class HoltFit:
+    """
+    Fitted additive-trend Holt model for one series.
+
+    Mirrors the part of the statsmodels results API the
+    ForecastingAgent relies on: forecast(horizon) -> pd.Series.
+    """
+
+    def __init__(self, alpha, beta, level, trend, last_index, freq,
+                 sse=0.0, nobs=0, level0=None, trend0=None):
+        self.alpha = float(alpha)
+        self.beta = float(beta)
+        self.level = float(level)
+        self.trend = float(trend)
+        self.last_index = pd.Timestamp(last_index)
+        self.freq = freq
+        self.sse = float(sse)
+        self.nobs = int(nobs)
+        self.level0 = None if level0 is None else float(level0)
+        self.trend0 = None if trend0 is None else float(trend0)
+
+    @classmethod
+    def from_statsmodels(cls, fitted, ts):
+        """
+        Extract the Holt state from a statsmodels ExponentialSmoothing fit.
+        """
+        params = fitted.params
+        return cls(
+            alpha=params["smoothing_level"],
+            beta=params["smoothing_trend"],
+            level=fitted.level.iloc[-1],
+            trend=fitted.trend.iloc[-1],
+            last_index=ts.index[-1],
+            freq=ts.index.freq or pd.infer_freq(ts.index),
+            sse=fitted.sse,
+            nobs=len(ts),
+            level0=params["initial_level"],
+            trend0=params["initial_trend"]
+        )
+
+    def forecast(self, horizon: int):
+        steps = np.arange(1, horizon + 1)
+        index = future_index(self.last_index, horizon, self.freq)
+        return pd.Series(self.level + self.trend * steps, index=index)
+
+    @property
+    def params(self):
+        return {
+            "smoothing_level": self.alpha,
+            "smoothing_trend": self.beta,
+            "level": self.level,
+            "trend": self.trend,
+        }
+
+
+@lru_cache(maxsize=FUTURE_INDEX_CACHE)
+def future_index(last_index, horizon: int, freq):
+    """
+    The horizon periods after last_index. Series of one upload mostly
+    end on the same date, so the index is built once and shared.
+    """
+    return pd.date_range(start=last_index, periods=horizon + 1, freq=freq)[1:]
+
+
+# ==================================================
+# SINGLE-SERIES RECURSION
+# ==================================================
+def holt_filter(y, alpha, beta, level0, trend0):
+    """
+    Run the Holt recursion over y from a known initial state.
+
+    Returns (level, trend, sse) after the last observation.
+    """
+    level, trend, sse = float(level0), float(trend0), 0.0
+
+    for value in np.asarray(y, dtype="float64"):
+        error = value - (level + trend)
+        sse += error * error
+        new_level = alpha * value + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        level = new_level
+
+    return level, trend, sse
+
+
+# ==================================================
+# BATCH FITTING
+# ==================================================
+def fit_holt_batch(series, chunk_size: int = CHUNK_SIZE):
+    """
+    Fit additive-trend Holt models for many series at once.
+
+    Series are stacked into a right-padded 2-D array and the recursion
+    runs once per time step for every series and every (alpha, beta)
+    candidate. For each candidate the optimal initial level and trend
+    are solved in closed form (the errors are affine in them), so the
+    search only has to cover the two smoothing parameters.
+    """
+    fits = []
+    for start in range(0, len(series), chunk_size):
+        fits.extend(_fit_chunk(series[start:start + chunk_size]))
+    return fits
+
+
+def _fit_chunk(series):
+    lengths = np.array([len(ts) for ts in series])
+    values = np.zeros((len(series), max(lengths.max(), 1)))
+    for i, ts in enumerate(series):
+        values[i, :lengths[i]] = np.asarray(ts, dtype="float64")
+
+    alpha, beta = _coarse_grid(len(series))
+    best = _search(values, lengths, alpha, beta)
+
+    step = GRID_STEP
+    for _ in range(REFINE_ROUNDS):
+        step /= (REFINE_POINTS - 1) / 2
+        alpha, beta = _local_grid(best["alpha"], best["beta"], step)
+        best = _search(values, lengths, alpha, beta)
+
+    fits = []
+    for i, ts in enumerate(series):
+        fits.append(HoltFit(
+            alpha=best["alpha"][i],
+            beta=best["beta"][i],
+            level=best["level"][i],
+            trend=best["trend"][i],
+            last_index=ts.index[-1],
+            freq=ts.index.freq or pd.infer_freq(ts.index),
+            sse=best["sse"][i],
+            nobs=lengths[i],
+            level0=best["level0"][i],
+            trend0=best["trend0"][i]
+        ))
+    return fits
+
+
+def _coarse_grid(n_series):
+    points = np.round(np.arange(0, 1 + GRID_STEP / 2, GRID_STEP), 10)
+    alpha, beta = np.meshgrid(points, points, indexing="ij")
+    keep = beta <= alpha
+    alpha = np.broadcast_to(alpha[keep], (n_series, keep.sum()))
+    beta = np.broadcast_to(beta[keep], (n_series, keep.sum()))
+    return alpha, beta
+
+
+def _local_grid(alpha, beta, step):
+    offsets = (np.arange(REFINE_POINTS) - REFINE_POINTS // 2) * step
+    da, db = np.meshgrid(offsets, offsets, indexing="ij")
+    alpha = np.clip(alpha[:, None] + da.ravel(), 0, 1)
+    beta = np.clip(beta[:, None] + db.ravel(), 0, 1)
+    return alpha, np.minimum(beta, alpha)
+
+
+def _search(values, lengths, alpha, beta):
+    n_series, n_steps = values.shape
+
+    # State from a zero initial state (c), and its sensitivity to the
+    # initial level (u) and initial trend (v)
+    cl = np.zeros(alpha.shape)
+    cb = np.zeros(alpha.shape)
+    ul, ub = np.ones(alpha.shape), np.zeros(alpha.shape)
+    vl, vb = np.zeros(alpha.shape), np.ones(alpha.shape)
+
+    sums = {k: np.zeros(alpha.shape) for k in ("gg", "gh", "hh", "gr", "hr", "rr")}
+    final = {k: np.zeros(alpha.shape) for k in ("cl", "cb", "ul", "ub", "vl", "vb")}
+
+    for t in range(n_steps):
+        y = values[:, t:t + 1]
+        active = (t < lengths)[:, None]
+
+        # One-step error is r - g * l0 - h * b0
+        r = np.where(active, y - (cl + cb), 0.0)
+        g = np.where(active, ul + ub, 0.0)
+        h = np.where(active, vl + vb, 0.0)
+
+        sums["gg"] += g * g
+        sums["gh"] += g * h
+        sums["hh"] += h * h
+        sums["gr"] += g * r
+        sums["hr"] += h * r
+        sums["rr"] += r * r
+
+        new_cl = alpha * y + (1 - alpha) * (cl + cb)
+        cb = beta * (new_cl - cl) + (1 - beta) * cb
+        cl = new_cl
+
+        new_ul = (1 - alpha) * (ul + ub)
+        ub = beta * (new_ul - ul) + (1 - beta) * ub
+        ul = new_ul
+
+        new_vl = (1 - alpha) * (vl + vb)
+        vb = beta * (new_vl - vl) + (1 - beta) * vb
+        vl = new_vl
+
+        last = (t == lengths - 1)[:, None]
+        for name, state in (("cl", cl), ("cb", cb), ("ul", ul),
+                            ("ub", ub), ("vl", vl), ("vb", vb)):
+            final[name] = np.where(last, state, final[name])
+
+    level0, trend0 = _solve_initial_state(sums)
+    sse = (
+        sums["rr"]
+        - 2 * level0 * sums["gr"] - 2 * trend0 * sums["hr"]
+        + level0 ** 2 * sums["gg"] + 2 * level0 * trend0 * sums["gh"]
+        + trend0 ** 2 * sums["hh"]
+    )
+
+    rows = np.arange(n_series)
+    pick = np.argmin(sse, axis=1)
+
+    def at(arr):
+        return arr[rows, pick]
+
+    l0, b0 = at(level0), at(trend0)
+    return {
+        "alpha": at(alpha),
+        "beta": at(beta),
+        "level": at(final["cl"]) + at(final["ul"]) * l0 + at(final["vl"]) * b0,
+        "trend": at(final["cb"]) + at(final["ub"]) * l0 + at(final["vb"]) * b0,
+        "sse": np.maximum(at(sse), 0.0),
+        "level0": l0,
+        "trend0": b0,
+    }
+
+
+def _solve_initial_state(sums):
+    det = sums["gg"] * sums["hh"] - sums["gh"] ** 2
+    stable = det > 1e-12 * np.maximum(sums["gg"] * sums["hh"], 1e-300)
+    safe_det = np.where(stable, det, 1.0)
+
+    level0 = np.where(
+        stable,
+        (sums["gr"] * sums["hh"] - sums["hr"] * sums["gh"]) / safe_det,
+        sums["gr"] / np.where(sums["gg"] > 0, sums["gg"], 1.0)
+    )
+    trend0 = np.where(
+        stable,
+        (sums["hr"] * sums["gg"] - sums["gr"] * sums["gh"]) / safe_det,
+        0.0
+    )
+    return level0, trend0
@@ -0,0 +1,311 @@
+import copy
+import os
+import threading
+from collections import OrderedDict
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components, dijkstra
+from sklearn.neighbors import BallTree
+
+from agents.geo_navigation_agent import EARTH_RADIUS_KM, MIN_EDGE_KM, GeoNavigationAgent
+
+NEIGHBOURS = 8
+SOURCE_CACHE_SIZE = 256
+
+
+# ==================================================
+# HUB REGISTRY
+# ==================================================
+class HubRegistry:
+    """
+    Named delivery hubs with a BallTree (haversine) spatial index.
+
+    The road network is approximated by a sparse k-nearest-neighbour
+    graph: each hub is linked to its k closest hubs, and any isolated
+    clusters are bridged to the largest one. Shortest paths are
+    computed per source with Dijkstra on demand and the most recent
+    sources are memoised; stop_routes() runs one multi-source Dijkstra
+    for a whole route's stops instead.
+    """
+
+    def __init__(self, names, coords, neighbours: int = NEIGHBOURS,
+                 cache_size: int = SOURCE_CACHE_SIZE):
+        self.names = [str(name) for name in names]
+        self.latlon = np.asarray(coords, dtype="float64").reshape(-1, 2)
+
+        if len(self.names) != len(self.latlon):
+            raise ValueError("Hub names and coordinates differ in length")
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("Hub names must be unique")
+
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.coords = dict(zip(self.names, map(tuple, self.latlon)))
+        self._folded = {name.strip().casefold(): name for name in self.names}
+
+        self.tree = BallTree(np.radians(self.latlon), metric="haversine")
+        self.neighbours = neighbours
+        self.graph = self._build_graph()
+
+        self.cache_size = cache_size
+        self._sources = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_coords(cls, coords: dict, **kwargs):
+        return cls(list(coords), list(coords.values()), **kwargs)
+
+    @classmethod
+    def load(cls, path: str, name_col: str = "hub", lat_col: str = "lat",
+             lon_col: str = "lon", **kwargs):
+        """
+        Load hubs from a CSV or Parquet file with name, lat and lon columns.
+        """
+        if os.path.splitext(path)[1].lower() in (".parquet", ".pq"):
+            df = pd.read_parquet(path, columns=[name_col, lat_col, lon_col])
+        else:
+            df = pd.read_csv(path, usecols=[name_col, lat_col, lon_col])
+
+        df = df.dropna()
+        return cls(df[name_col].tolist(), df[[lat_col, lon_col]].to_numpy(), **kwargs)
+
+    def __len__(self):
+        return len(self.names)
+
+    # -----------------------------
+    # Spatial lookups
+    # -----------------------------
+    def nearest(self, coords, k: int = 1):
+        """
+        Names and distances (km) of the k hubs closest to each (lat, lon).
+        """
+        points = np.radians(np.asarray(coords, dtype="float64").reshape(-1, 2))
+        distances, indices = self.tree.query(points, k=min(k, len(self)))
+        names = np.asarray(self.names, dtype=object)[indices]
+        return names, distances * EARTH_RADIUS_KM
+
+    def resolve(self, name, region_coords: dict = None):
+        """
+        Map a region name to a hub: exact or case-insensitive match first,
+        then the hub nearest to the region's coordinates if they are known.
+        Returns None when the region cannot be placed.
+        """
+        if name in self.index:
+            return name
+
+        folded = self._folded.get(str(name).strip().casefold())
+        if folded is not None:
+            return folded
+
+        if region_coords and name in region_coords:
+            names, _ = self.nearest(region_coords[name])
+            return names[0, 0]
+        return None
+
+    # -----------------------------
+    # Sparse k-nearest graph
+    # -----------------------------
+    def _build_graph(self):
+        n = len(self)
+        if n < 2:
+            return coo_matrix((n, n)).tocsr()
+
+        k = min(self.neighbours, n - 1)
+        distances, indices = self.tree.query(np.radians(self.latlon), k=k + 1)
+
+        # Column 0 is the hub itself
+        rows = np.repeat(np.arange(n), k)
+        cols = indices[:, 1:].ravel()
+        weights = distances[:, 1:].ravel() * EARTH_RADIUS_KM
+
+        rows, cols, weights = self._bridge_components(rows, cols, weights)
+
+        weights = np.maximum(weights, MIN_EDGE_KM)
+        graph = coo_matrix((weights, (rows, cols)), shape=(n, n)).tocsr()
+        return graph.maximum(graph.T)
+
+    def _bridge_components(self, rows, cols, weights):
+        n = len(self)
+        graph = coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+        count, labels = connected_components(graph, directed=False)
+        if count == 1:
+            return rows, cols, weights
+
+        # Link every other component to its closest hub in the largest one
+        main = np.bincount(labels).argmax()
+        members = np.flatnonzero(labels == main)
+        others = np.flatnonzero(labels != main)
+
+        tree = BallTree(np.radians(self.latlon[members]), metric="haversine")
+        distances, nearest = tree.query(np.radians(self.latlon[others]), k=1)
+
+        bridges = pd.DataFrame({
+            "label": labels[others],
+            "source": others,
+            "target": members[nearest[:, 0]],
+            "km": distances[:, 0] * EARTH_RADIUS_KM,
+        })
+        bridges = bridges.loc[bridges.groupby("label")["km"].idxmin()]
+
+        return (
+            np.concatenate([rows, bridges["source"].to_numpy()]),
+            np.concatenate([cols, bridges["target"].to_numpy()]),
+            np.concatenate([weights, bridges["km"].to_numpy()]),
+        )
+
+    # -----------------------------
+    # Memoised shortest paths
+    # -----------------------------
+    def _from_source(self, source: int):
+        with self._lock:
+            if source in self._sources:
+                self._sources.move_to_end(source)
+                return self._sources[source]
+
+        result = dijkstra(
+            self.graph, directed=False, indices=source, return_predecessors=True
+        )
+
+        with self._lock:
+            self._sources[source] = result
+            while len(self._sources) > self.cache_size:
+                self._sources.popitem(last=False)
+        return result
+
+    def path_length(self, source, target):
+        distances, _ = self._from_source(self.index[source])
+        return float(distances[self.index[target]])
+
+    def shortest_path(self, source, target):
+        i, j = self.index[source], self.index[target]
+        distances, predecessors = self._from_source(i)
+        if not np.isfinite(distances[j]):
+            raise ValueError(f"No route between {source} and {target}")
+
+        path = [j]
+        while path[-1] != i:
+            path.append(predecessors[path[-1]])
+        return [self.names[k] for k in reversed(path)]
+
+    def route_distance(self, cities):
+        return float(sum(
+            self.path_length(a, b) for a, b in zip(cities[:-1], cities[1:])
+        ))
+
+    def distance_matrix(self, cities):
+        return self.stop_routes(cities).distance_matrix(cities)
+
+    def stop_routes(self, cities):
+        return StopRoutes(self, cities)
+
+
+# ==================================================
+# SHORTEST PATHS FROM A SET OF STOPS
+# ==================================================
+class StopRoutes:
+    """
+    Distances and predecessor rows from each of a route's stops, from
+    a single dijkstra(indices=stops) call. Answers the same path
+    queries as HubRegistry for any pair starting at one of the stops.
+    """
+
+    def __init__(self, registry: HubRegistry, cities):
+        self.registry = registry
+        self.stops = list(dict.fromkeys(cities))
+        self.row = {city: k for k, city in enumerate(self.stops)}
+
+        self.lengths, self.predecessors = dijkstra(
+            registry.graph, directed=False,
+            indices=[registry.index[city] for city in self.stops],
+            return_predecessors=True
+        )
+
+    def path_length(self, source, target):
+        return float(self.lengths[self.row[source], self.registry.index[target]])
+
+    def shortest_path(self, source, target):
+        k, i, j = self.row[source], self.registry.index[source], self.registry.index[target]
+        if not np.isfinite(self.lengths[k, j]):
+            raise ValueError(f"No route between {source} and {target}")
+
+        path = [j]
+        while path[-1] != i:
+            path.append(self.predecessors[k, path[-1]])
+        return [self.registry.names[h] for h in reversed(path)]
+
+    def route_distance(self, cities):
+        rows = [self.row[city] for city in cities[:-1]]
+        cols = [self.registry.index[city] for city in cities[1:]]
+        return float(self.lengths[rows, cols].sum())
+
+    def distance_matrix(self, cities):
+        rows = [self.row[city] for city in cities]
+        cols = [self.registry.index[city] for city in cities]
+        return self.lengths[np.ix_(rows, cols)]
+
+
+# ==================================================
+# REGISTRY-BACKED NAVIGATION
+# ==================================================
+class HubNavigationAgent(GeoNavigationAgent):
+    """
+    GeoNavigationAgent over a HubRegistry instead of the dense
+    all-pairs matrices, for networks too large to precompute.
+
+    Stops that are not hub names are resolved through the registry,
+    using region_coords for a nearest-hub match.
+    """
+
+    def __init__(self, registry: HubRegistry, region_coords: dict = None):
+        self.registry = registry
+        self.region_coords = region_coords or {}
+        self.coords = registry.coords
+        self.cities = registry.names
+        self.index = registry.index
+        self._graph = None
+        # Set on the per-route copy made by plan_route
+        self._routes = None
+
+    @property
+    def graph(self):
+        """
+        networkx view of the sparse hub graph, built on first use.
+        """
+        if self._graph is None:
+            self._graph = nx.relabel_nodes(
+                nx.from_scipy_sparse_array(self.registry.graph),
+                dict(enumerate(self.cities))
+            )
+        return self._graph
+
+    def shortest_path(self, source, target):
+        return self._paths().shortest_path(source, target)
+
+    def route_distance(self, cities):
+        return self._paths().route_distance(cities)
+
+    def distance_matrix(self, cities):
+        return self._paths().distance_matrix(cities)
+
+    def _paths(self):
+        return self._routes or self.registry
+
+    def resolve_stops(self, cities):
+        hubs = []
+        for city in cities:
+            hub = self.registry.resolve(city, self.region_coords)
+            if hub is None:
+                raise ValueError(f"Routing not supported for: {city}")
+            hubs.append(hub)
+        return hubs
+
+    def plan_route(self, cities, fuel_price, **options):
+        hubs = self.resolve_stops(cities)
+
+        # The stop order search, both totals, every leg and its path are
+        # read from one multi-source Dijkstra over the stops
+        scoped = copy.copy(self)
+        scoped._routes = self.registry.stop_routes(hubs)
+        return super(HubNavigationAgent, scoped).plan_route(hubs, fuel_price, **options)
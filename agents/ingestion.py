@@ -0,0 +1,165 @@
+import warnings
+
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from agents.profiler import FrameProfiler
+from agents.schema_agent import SchemaIntelligenceAgent
+
+CHUNK_ROWS = 200_000
+# Partial aggregates are merged once they hold this many rows in total
+MERGE_ROWS = 1_000_000
+# Distinct unparsed date strings used to guess a chunk's other format
+REPARSE_SAMPLE = 20
+
+
+# ==================================================
+# STREAMING CSV INGESTION
+# ==================================================
+def ingest_csv(source, chunksize: int = CHUNK_ROWS, merge_rows: int = MERGE_ROWS):
+    """
+    Read a sales CSV in chunks into a product × region × day aggregate.
+
+    The schema is inferred from the first chunk; every chunk is then
+    reduced to daily totals before the next one is read, so peak memory
+    follows the size of the aggregate rather than the raw file. The
+    aggregate keeps the original column names, so it can be passed to
+    the dashboards and ForecastingAgent in place of the raw frame.
+
+    Row, missing-value and duplicate counts cover the whole file, with
+    duplicates estimated by a fixed-size sketch; the target variance
+    describes the first chunk.
+
+    Dates that do not match the first chunk's format are re-parsed with
+    a format guessed from the failing values; rows whose date still
+    cannot be read are left out of the aggregate and reported as
+    dropped_rows / dropped_units in the result and the schema.
+    """
+    reader = pd.read_csv(source, chunksize=chunksize)
+
+    try:
+        first = next(reader)
+    except StopIteration:
+        raise ValueError("Uploaded CSV has no rows")
+
+    schema = SchemaIntelligenceAgent(first, datetime_mode="sampled").analyze()
+
+    if not schema["date_columns"] or not schema["demand_target"]:
+        raise ValueError("Could not detect a date column and a demand target")
+
+    date_col = schema["date_columns"][0]
+    columns = {
+        "date": date_col,
+        "target": schema["demand_target"],
+        "keys": [
+            cols[0]
+            for cols in (schema["product_columns"], schema["region_columns"])
+            if cols
+        ],
+        "date_format": schema["date_formats"].get(date_col),
+    }
+
+    partials = []
+    pending_rows = 0
+    profiler = FrameProfiler(approximate=True)
+    n_chunks = 0
+    dropped_rows, dropped_units = 0, 0
+
+    for chunk in _chain(first, reader):
+        n_chunks += 1
+        profiler.update(chunk)
+
+        partial, dropped = _aggregate_chunk(chunk, columns)
+        partials.append(partial)
+        dropped_rows += len(dropped)
+        dropped_units += dropped.sum()
+        pending_rows += len(partial)
+
+        if pending_rows > merge_rows:
+            partials = [_merge(partials, columns)]
+            pending_rows = len(partials[0])
+
+    aggregate = _merge(partials, columns)
+
+    profile = profiler.result()
+    for key in ("row_count", "missing_values", "duplicate_rows", "distinct_rows"):
+        schema[key] = profile[key]
+    schema["profile_mode"] = "approximate"
+    schema["dropped_rows"] = dropped_rows
+    schema["dropped_units"] = dropped_units
+
+    return {
+        "schema": schema,
+        "aggregate": aggregate,
+        "rows": profile["row_count"],
+        "chunks": n_chunks,
+        "dropped_rows": dropped_rows,
+        "dropped_units": dropped_units,
+    }
+
+
+def _chain(first, reader):
+    yield first
+    yield from reader
+
+
+def _aggregate_chunk(chunk, columns):
+    """
+    Daily totals for one chunk, plus the target values of rows whose
+    date could not be parsed.
+    """
+    dates = _parse_dates(chunk[columns["date"]], columns["date_format"]).dt.floor("D")
+
+    data = chunk[columns["keys"] + [columns["target"]]].assign(
+        **{columns["date"]: dates}
+    )
+    undated = dates.isna()
+    dropped = data.loc[undated, columns["target"]].fillna(0)
+
+    return _group(data[~undated], columns), dropped
+
+
+def _parse_dates(values, date_format):
+    dates = pd.to_datetime(values, format=date_format, errors="coerce")
+    failed = dates.isna() & values.notna()
+    if not failed.any():
+        return dates
+
+    # Later chunks may switch format (e.g. 13/01/2025 after 2025-01-12):
+    # try every format guessed from a sample of the failures and keep
+    # the one that reads most of them
+    retry = values[failed].astype(str)
+    sample = retry.drop_duplicates().head(REPARSE_SAMPLE)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        formats = {
+            guess_datetime_format(value, dayfirst=dayfirst)
+            for value in sample
+            for dayfirst in (False, True)
+        } - {None}
+
+    best = None
+    for fmt in formats:
+        parsed = pd.to_datetime(retry, format=fmt, errors="coerce")
+        if best is None or parsed.notna().sum() > best.notna().sum():
+            best = parsed
+
+    if best is None:
+        return dates
+    return dates.where(~failed, best)
+
+
+def _merge(partials, columns):
+    if len(partials) == 1:
+        return partials[0]
+    return _group(pd.concat(partials, ignore_index=True), columns)
+
+
+def _group(data, columns):
+    return (
+        data
+        .groupby(columns["keys"] + [columns["date"]], dropna=False, sort=False)
+        [columns["target"]]
+        .sum()
+        .reset_index()
+    )
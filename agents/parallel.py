@@ -0,0 +1,28 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Tasks are handed out in about this many batches per worker: fewer
+# round trips than one at a time, while uneven tasks still balance
+BATCHES_PER_WORKER = 4
+
+
+# ==================================================
+# PROCESS POOL MAP
+# ==================================================
+def process_map(func, tasks, max_workers: int = None):
+    """
+    list(map(func, tasks)), spread over a process pool.
+
+    max_workers defaults to the CPU count. With one worker or a single
+    task, tasks run in this process and no pool is started.
+    """
+    tasks = list(tasks)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    if max_workers <= 1 or len(tasks) <= 1:
+        return list(map(func, tasks))
+
+    chunksize = max(1, len(tasks) // (max_workers * BATCHES_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(func, tasks, chunksize=chunksize))
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 1_000_000
+# HyperLogLog precision: 2**14 registers, ~0.8% relative error
+HLL_PRECISION = 14
+
+
+# ==================================================
+# ONE-PASS FRAME PROFILER
+# ==================================================
+class FrameProfiler:
+    """
+    Single-pass data profile: null counts, numeric variances and
+    duplicate / distinct row counts, accumulated chunk by chunk.
+
+    Exact mode keeps one 64-bit hash per row to count duplicates.
+    Approximate mode folds the row hashes into a HyperLogLog sketch,
+    so memory stays fixed no matter how many rows are profiled.
+    """
+
+    def __init__(self, numeric_cols=None, approximate: bool = False,
+                 precision: int = HLL_PRECISION):
+        self.numeric_cols = list(numeric_cols or [])
+        self.approximate = approximate
+        self.precision = precision
+
+        self.row_count = 0
+        self.columns = None
+        self.nulls = None
+        self._count = pd.Series(0.0, index=self.numeric_cols)
+        self._mean = pd.Series(0.0, index=self.numeric_cols)
+        self._m2 = pd.Series(0.0, index=self.numeric_cols)
+        self._hashes = []
+        self._registers = np.zeros(1 << precision, dtype="uint8")
+
+    def update(self, chunk: pd.DataFrame):
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            self.nulls = pd.Series(0, index=self.columns, dtype="int64")
+
+        self.row_count += len(chunk)
+        self.nulls = self.nulls.add(chunk.isna().sum(), fill_value=0).astype("int64")
+
+        if self.numeric_cols:
+            self._update_moments(chunk[self.numeric_cols])
+
+        hashes = _row_hashes(chunk)
+        if self.approximate:
+            self._update_sketch(hashes)
+        else:
+            self._hashes.append(hashes)
+
+    def result(self):
+        distinct = self._distinct_rows()
+        nulls = self.nulls if self.nulls is not None else pd.Series(dtype="int64")
+        variances = {
+            col: float(self._m2[col] / (self._count[col] - 1))
+            for col in self.numeric_cols
+            if self._count[col] > 1
+        }
+
+        return {
+            "row_count": self.row_count,
+            "column_count": len(self.columns or []),
+            "missing_values": {
+                col: int(n) for col, n in nulls.items() if n > 0
+            },
+            "variances": variances,
+            "distinct_rows": distinct,
+            "duplicate_rows": max(self.row_count - distinct, 0),
+            "approximate": self.approximate,
+        }
+
+    # -----------------------------
+    # Variance (parallel Welford merge)
+    # -----------------------------
+    def _update_moments(self, numeric):
+        count = numeric.count().astype("float64")
+        mean = numeric.mean()
+        m2 = numeric.var(ddof=0) * count
+
+        total = self._count + count
+        safe_total = total.where(total > 0, 1.0)
+        delta = (mean - self._mean).fillna(0)
+
+        self._mean = (self._mean + delta * count / safe_total).where(total > 0, 0.0)
+        self._m2 = self._m2 + m2.fillna(0) + delta ** 2 * self._count * count / safe_total
+        self._count = total
+
+    # -----------------------------
+    # Duplicate / distinct rows
+    # -----------------------------
+    def _distinct_rows(self):
+        if self.approximate:
+            return min(int(round(self._estimate())), self.row_count)
+
+        if not self._hashes:
+            return 0
+        hashes = pd.Series(np.concatenate(self._hashes))
+        return int(len(hashes) - hashes.duplicated().sum())
+
+    def _update_sketch(self, hashes):
+        p = self.precision
+        index = (hashes & np.uint64((1 << p) - 1)).astype("int64")
+        rest = hashes >> np.uint64(p)
+
+        # Rank = position of the lowest set bit (isolated bit is an exact
+        # power of two, so log2 is exact in float64)
+        lowest = rest & (~rest + np.uint64(1))
+        rank = np.where(
+            rest == 0,
+            64 - p + 1,
+            np.log2(lowest.astype("float64")).astype("int64") + 1
+        ).astype("uint8")
+
+        np.maximum.at(self._registers, index, rank)
+
+    def _estimate(self):
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(2.0 ** -self._registers.astype("float64"))
+
+        zeros = int(np.count_nonzero(self._registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return estimate
+
+
+def _row_hashes(chunk):
+    # -0.0 and 0.0 compare equal but hash differently; normalise floats
+    floats = chunk.select_dtypes(include="floating").columns
+    if len(floats):
+        chunk = chunk.assign(**{col: chunk[col] + 0.0 for col in floats})
+    return pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+
+
+def profile_frame(df: pd.DataFrame, numeric_cols=None, approximate: bool = False,
+                  chunk_rows: int = CHUNK_ROWS):
+    """
+    Profile a frame in one pass over row chunks.
+    """
+    profiler = FrameProfiler(numeric_cols, approximate=approximate)
+    for start in range(0, max(len(df), 1), chunk_rows):
+        profiler.update(df.iloc[start:start + chunk_rows])
+    return profiler.result()
@@ -0,0 +1,170 @@
+import time
+
+import numpy as np
+
+TIME_BUDGET = 0.5
+# Or-opt moves segments of up to this many consecutive stops
+OR_OPT_SEGMENT = 3
+IMPROVEMENT_EPS = 1e-9
+
+
+# ==================================================
+# STOP-ORDER OPTIMIZER
+# ==================================================
+def optimize_stop_order(distances, return_to_depot: bool = False,
+                        time_budget: float = TIME_BUDGET):
+    """
+    Order stops to shorten the route, starting from stop 0 (the depot).
+
+    Builds a nearest-neighbour tour and improves it with 2-opt and
+    Or-opt moves until no move helps or time_budget seconds have
+    passed. Open routes end at whichever stop is best; with
+    return_to_depot the route closes back at stop 0.
+
+    Returns a dict with the stop order (indices into distances) and
+    the route distance.
+    """
+    d = np.asarray(distances, dtype="float64")
+    n = len(d)
+    deadline = time.perf_counter() + time_budget
+
+    if n <= 2:
+        order = list(range(n))
+        return {"order": order, "distance": tour_length(d, order, return_to_depot)}
+
+    tour = nearest_neighbour_tour(d)
+
+    if not return_to_depot:
+        # An open route is a closed tour through a dummy stop that is free
+        # to reach from every stop and pinned next to the depot by a large
+        # negative edge, so no improving move ever separates them
+        pin = d.sum() + 1
+        d = np.pad(d, ((0, 1), (0, 1)))
+        d[0, n] = d[n, 0] = -pin
+        tour = np.append(tour, n)
+
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = _two_opt_pass(d, tour, deadline)
+        improved = _or_opt_pass(d, tour, deadline) or improved
+
+    order = _rotate_to_depot(tour, dummy=None if return_to_depot else n)
+    return {
+        "order": order,
+        "distance": tour_length(distances, order, return_to_depot),
+    }
+
+
+def tour_length(distances, order, closed: bool = False):
+    d = np.asarray(distances, dtype="float64")
+    order = np.asarray(order, dtype="int64")
+    if len(order) < 2:
+        return 0.0
+
+    total = d[order[:-1], order[1:]].sum()
+    if closed:
+        total += d[order[-1], order[0]]
+    return float(total)
+
+
+def nearest_neighbour_tour(distances):
+    d = np.asarray(distances, dtype="float64")
+    n = len(d)
+
+    visited = np.zeros(n, dtype=bool)
+    tour = np.empty(n, dtype="int64")
+    tour[0], visited[0] = 0, True
+
+    for k in range(1, n):
+        row = np.where(visited, np.inf, d[tour[k - 1]])
+        tour[k] = np.argmin(row)
+        visited[tour[k]] = True
+    return tour
+
+
+# -----------------------------
+# Local search moves
+# -----------------------------
+def _two_opt_pass(d, tour, deadline):
+    """
+    One sweep of 2-opt over a closed tour, in place; for each edge the
+    best exchange against every later edge is evaluated at once.
+    """
+    n = len(tour)
+    improved = False
+
+    for i in range(n - 2):
+        if time.perf_counter() > deadline:
+            break
+
+        a, b = tour[i], tour[i + 1]
+        j = np.arange(i + 2, n if i > 0 else n - 1)
+        if not len(j):
+            continue
+
+        c, e = tour[j], tour[(j + 1) % n]
+        delta = d[a, c] + d[b, e] - d[a, b] - d[c, e]
+
+        best = np.argmin(delta)
+        if delta[best] < -IMPROVEMENT_EPS:
+            tour[i + 1:j[best] + 1] = tour[i + 1:j[best] + 1][::-1].copy()
+            improved = True
+
+    return improved
+
+
+def _or_opt_pass(d, tour, deadline):
+    """
+    One sweep of Or-opt over a closed tour, in place: move a run of up
+    to OR_OPT_SEGMENT stops (optionally reversed) to the cheapest edge
+    elsewhere in the tour.
+    """
+    n = len(tour)
+    improved = False
+
+    for length in range(1, min(OR_OPT_SEGMENT, n - 2) + 1):
+        i = 1
+        while i + length <= n:
+            if time.perf_counter() > deadline:
+                return improved
+
+            first, last = tour[i], tour[i + length - 1]
+            prev, after = tour[i - 1], tour[(i + length) % n]
+            removal = d[prev, first] + d[last, after] - d[prev, after]
+
+            # Candidate edges (tour[k], tour[k + 1]) outside the segment
+            k = np.arange(n)
+            k = k[(k < i - 1) | (k >= i + length)]
+            u, v = tour[k], tour[(k + 1) % n]
+
+            forward = d[u, first] + d[last, v] - d[u, v]
+            backward = d[u, last] + d[first, v] - d[u, v]
+            cost = np.minimum(forward, backward)
+
+            best = np.argmin(cost)
+            if cost[best] - removal < -IMPROVEMENT_EPS:
+                segment = tour[i:i + length].copy()
+                if backward[best] < forward[best]:
+                    segment = segment[::-1]
+
+                rest = np.concatenate([tour[:i], tour[i + length:]])
+                at = k[best] + 1 if k[best] < i else k[best] + 1 - length
+                tour[:] = np.concatenate([rest[:at], segment, rest[at:]])
+                improved = True
+            i += 1
+
+    return improved
+
+
+def _rotate_to_depot(tour, dummy=None):
+    tour = list(tour)
+    start = tour.index(0)
+    tour = tour[start:] + tour[:start]
+
+    if dummy is None:
+        return tour
+
+    # The dummy sits next to the depot; walk away from it
+    if tour[1] == dummy:
+        tour = [0] + tour[:0:-1]
+    return tour[:-1]
@@ -0,0 +1,46 @@
+# ==================================================
+# ROUTE RENDERERS
+# ==================================================
+# Renderers take the plain result of GeoNavigationAgent.plan_route();
+# folium is only imported when a map is actually drawn.
+
+def to_folium(route, zoom_start: int = 5, color: str = "blue"):
+    """
+    folium map with a marker per hub and the route as a polyline.
+    """
+    import folium
+
+    m = folium.Map(location=route["coords"][0], zoom_start=zoom_start)
+    for city, coord in zip(route["path"], route["coords"]):
+        folium.Marker(coord, tooltip=city).add_to(m)
+
+    folium.PolyLine(route["coords"], color=color).add_to(m)
+    return m
+
+
+def to_geojson(route):
+    """
+    GeoJSON FeatureCollection: one Point per hub and a LineString for
+    the route. GeoJSON positions are [lon, lat].
+    """
+    positions = [[lon, lat] for lat, lon in route["coords"]]
+
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": position},
+            "properties": {"name": city},
+        }
+        for city, position in zip(route["path"], positions)
+    ]
+    features.append({
+        "type": "Feature",
+        "geometry": {"type": "LineString", "coordinates": positions},
+        "properties": {
+            "distance_km": route["distance_km"],
+            "eta_hours": route["eta_hours"],
+            "fuel_cost": route["fuel_cost"],
+        },
+    })
+
+    return {"type": "FeatureCollection", "features": features}
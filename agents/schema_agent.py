@@ -1,24 +1,122 @@
+import warnings
+from collections import Counter
+
 import pandas as pd
 import numpy as np
+from pandas.tseries.api import guess_datetime_format
+
+from agents.profiler import profile_frame
+
+DATETIME_MODES = ["full", "sampled"]
+# Text columns with at most this share of distinct values become categories
+CATEGORY_MAX_RATIO = 0.5
+
+
+# ==================================================
+# COMPACT FRAME REPRESENTATION
+# ==================================================
+def compact_frame(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """
+    Return a memory-compact version of df for the detected schema.
+
+    Date columns become datetime64 (parsed once with the cached format),
+    product, region and other low-cardinality text columns become
+    category, and numeric columns are downcast where no value changes.
+    The result is shared by all agents and treated as read-only.
+    """
+    formats = schema.get("date_formats", {})
+    keys = set(schema.get("product_columns", []) + schema.get("region_columns", []))
+    columns = {}
+
+    def present(kind):
+        # Aggregated frames (chunked ingestion) keep only some columns
+        return [c for c in schema.get(kind, []) if c in df.columns]
+
+    for col in present("date_columns"):
+        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+            columns[col] = pd.to_datetime(
+                df[col], format=formats.get(col), errors="coerce"
+            )
+
+    for col in present("categorical_columns"):
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if col in keys or series.nunique() <= CATEGORY_MAX_RATIO * len(series):
+            columns[col] = series.astype("category")
+
+    for col in present("numeric_columns"):
+        downcast = _downcast(df[col])
+        if downcast.dtype != df[col].dtype:
+            columns[col] = downcast
+
+    return df.assign(**columns) if columns else df
+
+
+def _downcast(series):
+    if pd.api.types.is_bool_dtype(series) or not isinstance(series.dtype, np.dtype):
+        return series
+
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+
+    if pd.api.types.is_float_dtype(series):
+        smaller = series.astype("float32")
+        # Only keep float32 when every value survives the round trip
+        if np.array_equal(
+            smaller.to_numpy(dtype="float64"), series.to_numpy(), equal_nan=True
+        ):
+            return smaller
+
+    return series
+
 
 class SchemaIntelligenceAgent:
     """
     Agent responsible for understanding unknown / messy CSV files.
+
+    datetime_mode="sampled" checks date columns on a bounded random
+    sample with an inferred explicit format instead of parsing every row.
+    approximate_profile=True counts duplicate rows with a fixed-size
+    sketch instead of one hash per row.
     """
 
-    def __init__(self, df: pd.DataFrame):
-        self.df = df.copy()
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        datetime_mode: str = "full",
+        sample_size: int = 1000,
+        approximate_profile: bool = False
+    ):
+        if datetime_mode not in DATETIME_MODES:
+            raise ValueError(f"Unknown datetime detection mode: {datetime_mode}")
+
+        # Read-only: the agent never modifies the frame, so no copy is made
+        self.df = df
         self.schema = {}
+        self.datetime_mode = datetime_mode
+        self.sample_size = sample_size
+        self._sample_rows = None
+        self._date_formats = {}
+        self.approximate_profile = approximate_profile
+        self._profile = None
 
     # -----------------------------
     # Public entry
     # -----------------------------
     def analyze(self):
+        self._profile = None
         self._detect_columns()
         self._detect_target()
         self._basic_health_check()
         return self.schema
 
+    def compact_frame(self):
+        """
+        Compact version of the analysed frame (see compact_frame).
+        """
+        return compact_frame(self.df, self.schema)
+
     # -----------------------------
     # Column detection (ROBUST)
     # -----------------------------
@@ -26,6 +124,7 @@ class SchemaIntelligenceAgent:
         date_cols = []
         numeric_cols = []
         categorical_cols = []
+        date_formats = {}
 
         for col in self.df.columns:
 
@@ -37,10 +136,12 @@ class SchemaIntelligenceAgent:
             # Step 2: datetime check ONLY for non-numeric
             if self._is_datetime(col):
                 date_cols.append(col)
+                date_formats[col] = self._date_formats.get(col)
             else:
                 categorical_cols.append(col)
 
         self.schema["date_columns"] = date_cols
+        self.schema["date_formats"] = date_formats
         self.schema["numeric_columns"] = numeric_cols
         self.schema["categorical_columns"] = categorical_cols
 
@@ -65,11 +166,7 @@ class SchemaIntelligenceAgent:
             self.schema["demand_target"] = None
             return
 
-        variances = {}
-        for col in numeric_cols:
-            series = self.df[col].dropna()
-            if len(series) > 1:
-                variances[col] = series.var()
+        variances = self._profile_once()["variances"]
 
         if not variances:
             self.schema["demand_target"] = None
@@ -83,21 +180,34 @@ class SchemaIntelligenceAgent:
     # Data health checks
     # -----------------------------
     def _basic_health_check(self):
+        profile = self._profile_once()
+
         self.schema["row_count"] = len(self.df)
         self.schema["column_count"] = len(self.df.columns)
+        self.schema["missing_values"] = profile["missing_values"]
+        self.schema["duplicate_rows"] = profile["duplicate_rows"]
+        self.schema["distinct_rows"] = profile["distinct_rows"]
+        self.schema["profile_mode"] = (
+            "approximate" if profile["approximate"] else "exact"
+        )
 
-        self.schema["missing_values"] = {
-            col: int(self.df[col].isna().sum())
-            for col in self.df.columns
-            if self.df[col].isna().sum() > 0
-        }
-
-        self.schema["duplicate_rows"] = int(self.df.duplicated().sum())
+    def _profile_once(self):
+        # Nulls, variances and duplicates come from a single pass
+        if self._profile is None:
+            self._profile = profile_frame(
+                self.df,
+                numeric_cols=self.schema.get("numeric_columns", []),
+                approximate=self.approximate_profile
+            )
+        return self._profile
 
     # -----------------------------
     # Safe datetime detection
     # -----------------------------
     def _is_datetime(self, col):
+        if self.datetime_mode == "sampled":
+            return self._is_datetime_sampled(col)
+
         try:
             parsed = pd.to_datetime(self.df[col], errors="coerce")
             success_ratio = parsed.notna().mean()
@@ -106,3 +216,54 @@ class SchemaIntelligenceAgent:
             return success_ratio > 0.8
         except Exception:
             return False
+
+    # -----------------------------
+    # Sampled datetime detection
+    # -----------------------------
+    def _is_datetime_sampled(self, col):
+        sample = self.df[col].iloc[self._sample_positions()]
+        fmt = self._infer_format(sample)
+
+        try:
+            if fmt:
+                parsed = pd.to_datetime(sample, format=fmt, errors="coerce")
+            else:
+                # No common format: dateutil falls back per value and
+                # warns for every text column
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    parsed = pd.to_datetime(sample, errors="coerce")
+        except Exception:
+            return False
+
+        # Same 80% rule as full detection, on the sample
+        if parsed.notna().mean() > 0.8:
+            self._date_formats[col] = fmt
+            return True
+        return False
+
+    def _sample_positions(self):
+        if self._sample_rows is None:
+            n_rows = len(self.df)
+            if n_rows <= self.sample_size:
+                self._sample_rows = np.arange(n_rows)
+            else:
+                rng = np.random.default_rng(0)
+                self._sample_rows = np.sort(
+                    rng.choice(n_rows, size=self.sample_size, replace=False)
+                )
+        return self._sample_rows
+
+    @staticmethod
+    def _infer_format(sample, max_values: int = 50):
+        values = pd.Series(sample).dropna().astype(str).unique()[:max_values]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            guesses = Counter(
+                fmt for fmt in map(guess_datetime_format, values) if fmt
+            )
+
+        if not guesses:
+            return None
+        return guesses.most_common(1)[0][0]
@@ -0,0 +1,191 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from agents.schema_agent import SchemaIntelligenceAgent, compact_frame
+
+CACHE_DIR = ".upload_cache"
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+META_FILE = "meta.json"
+# Larger uploads are profiled with the fixed-memory duplicate sketch
+APPROXIMATE_PROFILE_ROWS = 5_000_000
+
+
+# ==================================================
+# CONTENT-HASHED UPLOAD CACHE
+# ==================================================
+class UploadCache:
+    """
+    On-disk cache of parsed uploads, keyed by a hash of the file bytes.
+
+    Each entry stores the compact, date-parsed frame as one .npy file per
+    column next to the SchemaIntelligenceAgent.analyze() result. Numeric
+    and datetime columns and category codes are memory-mapped on load
+    (zero-copy); other text columns are stored as integer codes plus
+    their distinct values.
+    The directory is kept under max_bytes by evicting the least
+    recently used entries.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+    # -----------------------------
+    # Public entry
+    # -----------------------------
+    def load_or_parse(self, data: bytes):
+        """
+        Return (df, schema) for the CSV bytes, parsing only on a miss.
+        """
+        digest = self.content_hash(data)
+
+        cached = self.load(digest)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        df, schema = self._parse(data)
+        self.store(digest, df, schema)
+        return df, schema
+
+    def load(self, digest: str):
+        entry = os.path.join(self.cache_dir, digest)
+        meta_path = os.path.join(entry, META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+
+        columns = {}
+        for i, column in enumerate(meta["columns"]):
+            values = np.load(os.path.join(entry, f"{i}.npy"), mmap_mode="r")
+
+            if column["kind"] == "category":
+                columns[column["name"]] = pd.Series(pd.Categorical.from_codes(
+                    values.view(np.ndarray), categories=column["categories"]
+                ), copy=False)
+            elif column["kind"] == "text":
+                categorical = pd.Categorical.from_codes(
+                    values, categories=column["categories"]
+                )
+                columns[column["name"]] = pd.Series(categorical).astype(column["dtype"])
+            else:
+                # Plain ndarray view over the mapped file, no copy
+                columns[column["name"]] = pd.Series(
+                    values.view(np.ndarray), copy=False
+                )
+
+        # Touch the entry so eviction treats it as recently used
+        os.utime(meta_path)
+        return pd.DataFrame(columns, copy=False), meta["schema"]
+
+    def store(self, digest: str, df: pd.DataFrame, schema: dict):
+        entry = os.path.join(self.cache_dir, digest)
+        if os.path.exists(entry):
+            return
+
+        # Write into a temporary directory first so concurrent sessions
+        # never see a partially written entry
+        tmp = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            meta = {"schema": schema, "columns": []}
+            for i, name in enumerate(df.columns):
+                column, values = self._encode(name, df[name])
+                np.save(os.path.join(tmp, f"{i}.npy"), values)
+                meta["columns"].append(column)
+
+            with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f, default=_json_default)
+
+            os.replace(tmp, entry)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.exists(entry):
+                raise
+
+        self._evict()
+
+    # -----------------------------
+    # Parsing and encoding
+    # -----------------------------
+    @staticmethod
+    def _parse(data):
+        df = pd.read_csv(io.BytesIO(data))
+        schema = SchemaIntelligenceAgent(
+            df,
+            datetime_mode="sampled",
+            approximate_profile=len(df) > APPROXIMATE_PROFILE_ROWS
+        ).analyze()
+
+        return compact_frame(df, schema), schema
+
+    @staticmethod
+    def _encode(name, series):
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            return {
+                "name": name,
+                "kind": "category",
+                "categories": dtype.categories.tolist(),
+            }, series.cat.codes.to_numpy()
+
+        if (
+            pd.api.types.is_numeric_dtype(dtype)
+            or pd.api.types.is_bool_dtype(dtype)
+            or pd.api.types.is_datetime64_dtype(dtype)
+        ) and isinstance(dtype, np.dtype):
+            return {"name": name, "kind": "array"}, series.to_numpy()
+
+        codes, uniques = pd.factorize(series)
+        return {
+            "name": name,
+            "kind": "text",
+            "dtype": str(dtype),
+            "categories": [str(value) for value in uniques],
+        }, codes
+
+    # -----------------------------
+    # Size-bounded eviction
+    # -----------------------------
+    def _evict(self):
+        entries = []
+        for digest in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, digest)
+            meta_path = os.path.join(path, META_FILE)
+            if digest.startswith(".") or not os.path.exists(meta_path):
+                continue
+
+            size = sum(
+                os.path.getsize(os.path.join(path, name))
+                for name in os.listdir(path)
+            )
+            entries.append((os.path.getmtime(meta_path), size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
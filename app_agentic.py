@@ -3,10 +3,17 @@ import pandas as pd
 import plotly.express as px
 import streamlit.components.v1 as components
 
-from agents.schema_agent import SchemaIntelligenceAgent
 from agents.forecasting_agent import ForecastingAgent
+from agents.forecast_store import persistent_cache
 from agents.decision_agent import DecisionAgent
-from agents.geo_navigation_agent import GeoNavigationAgent, CITY_COORDS
+from agents.demand_cube import demand_view
+from agents.downsampling import lttb, top_k_cells
+from agents.fleet_planner import fleet_table, plan_fleet, price_fleet
+from agents.geo_navigation_agent import CITY_COORDS, shared_agent
+from agents.route_rendering import to_folium
+from agents.schema_agent import compact_frame
+from agents.ingestion import ingest_csv
+from agents.upload_cache import UploadCache
 
 
 # ==================================================
@@ -20,6 +27,157 @@ st.title("🤖 Agentic AI: Demand Intelligence & Mission Planning")
 
 NAV_CITIES = sorted(CITY_COORDS.keys())
 
+# Uploads above this size are aggregated while reading by default
+STREAMING_THRESHOLD_BYTES = 200 * 1024 * 1024
+
+
+# ==================================================
+# CACHED PIPELINE
+# ==================================================
+# Streamlit reruns this script on every widget change. Everything that
+# depends only on the upload is built once per upload hash and held by
+# the process; widget-dependent stages are cached on their own inputs,
+# so a widget only recomputes the stages downstream of it.
+
+def upload_digest(uploaded_file):
+    """
+    Content hash of the upload, computed once per uploaded file.
+    """
+    if st.session_state.get("upload_file_id") != uploaded_file.file_id:
+        st.session_state["upload_file_id"] = uploaded_file.file_id
+        st.session_state["upload_digest"] = UploadCache.content_hash(
+            uploaded_file.getvalue()
+        )
+    return st.session_state["upload_digest"]
+
+
+@st.cache_resource(max_entries=4, show_spinner="Analysing upload…")
+def load_analysis(digest, stream, _uploaded_file):
+    """
+    Upload-level results: compact frame, schema, demand aggregates,
+    headline metrics, action plan and the forecasting agent. Shared
+    read-only across reruns and sessions.
+    """
+    _uploaded_file.seek(0)
+    if stream:
+        ingested = ingest_csv(_uploaded_file)
+        df = ingested["aggregate"]
+        schema = ingested["schema"]
+        caption = (
+            f"Aggregated {ingested['rows']:,} rows in {ingested['chunks']} chunks "
+            f"into {len(df):,} daily rows."
+        )
+        if ingested["dropped_rows"]:
+            caption += (
+                f" {ingested['dropped_rows']:,} rows ({ingested['dropped_units']:,.0f} "
+                f"units) had unreadable dates and were left out."
+            )
+    else:
+        # Repeat uploads load the parsed frame and schema from disk
+        df, schema = UploadCache().load_or_parse(_uploaded_file.getvalue())
+        caption = None
+
+    # One compact, read-only frame (categories, downcast numbers, parsed
+    # dates) shared by every agent below
+    df = compact_frame(df, schema)
+
+    date_col = schema["date_columns"][0]
+    target_col = schema["demand_target"]
+    product_col = schema["product_columns"][0]
+    region_col = schema["region_columns"][0]
+
+    # ---- Demand aggregation: one pass into a product × region × day
+    # cube (grouped totals if too large); every table and metric below
+    # is a slice of it
+    cube = demand_view(df, date_col, target_col, product_col, region_col)
+
+    product_demand = cube.product_totals().rename_axis(product_col).reset_index()
+    product_demand["Rank"] = range(1, len(product_demand) + 1)
+    product_demand["Rank"] = product_demand["Rank"].astype(int)
+
+    region_demand = cube.region_totals().rename_axis(region_col).reset_index()
+
+    heatmap_df = cube.pair_totals()
+
+    # ---- Key business metrics
+    best_product = product_demand.iloc[0][product_col]
+    best_region = region_demand.iloc[0][region_col]
+
+    total_demand = int(cube.total(best_product, best_region))
+    growth = cube.growth(best_product, best_region)
+    risk = cube.risk(best_product, best_region)
+
+    forecast_agent = ForecastingAgent(
+        df, date_col, target_col, product_col, region_col,
+        cache=persistent_cache(),
+        date_format=schema["date_formats"][date_col]
+    )
+
+    return {
+        "df": df,
+        "schema": schema,
+        "caption": caption,
+        "columns": (date_col, target_col, product_col, region_col),
+        "product_demand": product_demand,
+        "region_demand": region_demand,
+        "cube": cube,
+        "heatmap_df": heatmap_df,
+        # Largest products × regions, the rest folded into "Other"
+        "heatmap_chart": top_k_cells(heatmap_df, product_col, region_col, target_col),
+        "best_product": best_product,
+        "best_region": best_region,
+        "total_demand": total_demand,
+        "growth": growth,
+        "risk": risk,
+        "action_plan": cube.action_plan(),
+        "forecast_agent": forecast_agent,
+    }
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def forecast_for(digest, stream, horizon, product, region, _agent):
+    return _agent.forecast(horizon, product, region)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def history_points(digest, stream, product, region, _history):
+    # History is the same for every horizon; only LTTB points are plotted
+    return lttb(_history)
+
+
+@st.cache_resource
+def routing_agent():
+    return shared_agent()
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def plan_route(stops, fuel_price, return_to_depot):
+    return routing_agent().plan_route(
+        list(stops), fuel_price, optimize=True, return_to_depot=return_to_depot
+    )
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def route_map_html(path, coords):
+    # The map depends only on the path, not on the fuel price
+    return to_folium({"path": list(path), "coords": list(coords)})._repr_html_()
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def plan_fleet_cached(warehouses, hub_demand, vehicles, capacity, return_to_depot):
+    # Fuel price is left out of the key; callers reprice with price_fleet
+    return plan_fleet(
+        routing_agent(),
+        list(warehouses),
+        dict(hub_demand),
+        vehicles=vehicles,
+        capacity=capacity,
+        fuel_price=0,
+        return_to_depot=return_to_depot,
+        # Runs inside a Streamlit rerun: no worker processes per request
+        max_workers=1
+    )
+
 
 # ==================================================
 # FILE UPLOAD
@@ -29,77 +187,44 @@ if uploaded_file is None:
     st.info("Upload a CSV file to begin analysis.")
     st.stop()
 
-df = pd.read_csv(uploaded_file)
+stream_upload = st.sidebar.checkbox(
+    "Stream large file (aggregate by product × region × day)",
+    value=uploaded_file.size > STREAMING_THRESHOLD_BYTES
+)
 
 
 # ==================================================
-# SCHEMA INTELLIGENCE
+# SCHEMA INTELLIGENCE & DEMAND AGGREGATION
 # ==================================================
-schema = SchemaIntelligenceAgent(df).analyze()
-
-date_col = schema["date_columns"][0]
-target_col = schema["demand_target"]
-product_col = schema["product_columns"][0]
-region_col = schema["region_columns"][0]
+digest = upload_digest(uploaded_file)
+analysis = load_analysis(digest, stream_upload, uploaded_file)
 
+if analysis["caption"]:
+    st.sidebar.caption(analysis["caption"])
 
-# ==================================================
-# DEMAND AGGREGATION
-# ==================================================
-product_demand = (
-    df.groupby(product_col)[target_col]
-    .sum()
-    .reset_index()
-    .sort_values(by=target_col, ascending=False)
-)
-product_demand["Rank"] = range(1, len(product_demand) + 1)
-product_demand["Rank"] = product_demand["Rank"].astype(int)
-
-region_demand = (
-    df.groupby(region_col)[target_col]
-    .sum()
-    .reset_index()
-    .sort_values(by=target_col, ascending=False)
-)
+df = analysis["df"]
+schema = analysis["schema"]
+date_col, target_col, product_col, region_col = analysis["columns"]
+product_demand = analysis["product_demand"]
+region_demand = analysis["region_demand"]
+best_product = analysis["best_product"]
+best_region = analysis["best_region"]
+risk = analysis["risk"]
+forecast_agent = analysis["forecast_agent"]
 
 
 # ==================================================
 # 📈 KEY BUSINESS METRICS
 # ==================================================
-best_product = product_demand.iloc[0][product_col]
-best_region = region_demand.iloc[0][region_col]
-
-filtered_df = df[
-    (df[product_col] == best_product) &
-    (df[region_col] == best_region)
-]
-
-total_demand = int(filtered_df[target_col].sum())
-
-half = len(filtered_df) // 2
-growth = (
-    (filtered_df[target_col].iloc[half:].sum()
-     - filtered_df[target_col].iloc[:half].sum())
-    / max(filtered_df[target_col].sum(), 1)
-) * 100
-
-risk = (
-    "High"
-    if filtered_df[target_col].std() > filtered_df[target_col].mean()
-    else "Medium"
-)
-
-forecast_agent = ForecastingAgent(
-    df, date_col, target_col, product_col, region_col
+forecast_30 = forecast_for(
+    digest, stream_upload, 30, best_product, best_region, forecast_agent
 )
-
-forecast_30 = forecast_agent.forecast(30, best_product, best_region)
 confidence = forecast_30["confidence"]
 
 st.subheader("📈 Key Business Metrics")
 c1, c2, c3, c4 = st.columns(4)
-c1.metric("Total Demand", f"{total_demand} units")
-c2.metric("Demand Growth", f"{growth:.1f}%")
+c1.metric("Total Demand", f"{analysis['total_demand']} units")
+c2.metric("Demand Growth", f"{analysis['growth']:.1f}%")
 c3.metric("Risk Level", risk)
 c4.metric("AI Confidence", confidence)
 
@@ -135,15 +260,9 @@ st.plotly_chart(
     use_container_width=True
 )
 
-heatmap_df = (
-    df.groupby([product_col, region_col])[target_col]
-    .sum()
-    .reset_index()
-)
-
 st.plotly_chart(
     px.density_heatmap(
-        heatmap_df,
+        analysis["heatmap_chart"],
         x=region_col,
         y=product_col,
         z=target_col,
@@ -165,11 +284,13 @@ forecast_days = st.selectbox(
     index=3
 )
 
-forecast_result = forecast_agent.forecast(
-    forecast_days, best_product, best_region
+forecast_result = forecast_for(
+    digest, stream_upload, forecast_days, best_product, best_region, forecast_agent
 )
 
-history_df = forecast_result["history"].reset_index()
+history_df = history_points(
+    digest, stream_upload, best_product, best_region, forecast_result["history"]
+).reset_index()
 history_df.columns = ["Date", "Demand"]
 history_df["Type"] = "Historical"
 
@@ -210,57 +331,8 @@ st.success(
 # ==================================================
 st.subheader("🧠 AI Action Plan — What to Sell, Where & How Much")
 
-rows = []
-rank = 1
-
-for _, p_row in product_demand.iterrows():
-    product = p_row[product_col]
-
-    city_df = (
-        df[df[product_col] == product]
-        .groupby(region_col)[target_col]
-        .sum()
-        .reset_index()
-        .sort_values(by=target_col, ascending=False)
-    )
-
-    first_row = True
-
-    for _, c_row in city_df.iterrows():
-        demand = int(c_row[target_col])
-        if demand <= 0:
-            continue
-
-        if demand > 200:
-            conf = "High"
-            action = "Stock aggressively"
-        elif demand > 120:
-            conf = "Medium"
-            action = "Ensure availability"
-        elif demand > 60:
-            conf = "Medium"
-            action = "Targeted supply"
-        else:
-            conf = "Low"
-            action = "Limited stock"
-
-        rows.append({
-            "Rank": rank if first_row else "",
-            "Product": product if first_row else "",
-            "City / Region": c_row[region_col],
-            "Est. Demand (units)": demand,
-            "Confidence": conf,
-            "Recommended Action": action
-        })
-
-        first_row = False
-
-    rank += 1
-
-action_plan_df = pd.DataFrame(rows)
-
 st.dataframe(
-    action_plan_df,
+    analysis["action_plan"],
     use_container_width=True,
     height=500,
     hide_index=True
@@ -330,10 +402,10 @@ if decision["decision"] != "NO_MISSION":
 
     if service_hubs:
         fuel_price = st.slider("Fuel Price (₹ / litre)", 80, 120, 100)
+        return_to_depot = st.checkbox("Return to warehouse", value=False)
 
-        route = GeoNavigationAgent().plan_multi_stop_route(
-            [warehouse] + service_hubs,
-            fuel_price
+        route = plan_route(
+            tuple([warehouse] + service_hubs), fuel_price, return_to_depot
         )
 
         c1, c2, c3 = st.columns(3)
@@ -343,8 +415,65 @@ if decision["decision"] != "NO_MISSION":
 
         st.write("**Optimized Route:**")
         st.write(" → ".join(route["path"]))
+        if route["distance_saved_km"] > 0:
+            st.caption(
+                f"Stop order optimized: {route['distance_saved_km']} km "
+                "shorter than visiting hubs in demand order."
+            )
+
+        components.html(
+            route_map_html(tuple(route["path"]), tuple(route["coords"])),
+            height=500
+        )
 
-        components.html(route["map"]._repr_html_(), height=500)
+        # ==================================================
+        # 🚚 FLEET MISSION PLANNING
+        # ==================================================
+        with st.expander("🚚 Fleet Mission Planning (multiple warehouses & vehicles)"):
+            hub_demand = region_demand.set_index(region_col)[target_col]
+            hub_demand = hub_demand[hub_demand.index.isin(NAV_CITIES)]
+
+            f1, f2, f3 = st.columns(3)
+            fleet_warehouses = f1.multiselect(
+                "Warehouses", NAV_CITIES, default=[warehouse]
+            )
+            fleet_size = f2.number_input(
+                "Vehicles", min_value=1, value=3, step=1, key="fleet_size"
+            )
+            # Constant default and a fixed key, so the entered capacity
+            # survives changes to the other fleet inputs
+            capacity = f3.number_input(
+                "Capacity per vehicle (units)",
+                min_value=1,
+                value=1000,
+                step=10,
+                key="fleet_capacity"
+            )
+            st.caption(
+                f"Fleet capacity {int(fleet_size) * capacity:,} units for "
+                f"{int(hub_demand.sum()):,} units of hub demand."
+            )
+
+            if fleet_warehouses:
+                fleet = price_fleet(plan_fleet_cached(
+                    tuple(fleet_warehouses),
+                    tuple(hub_demand.drop(fleet_warehouses, errors="ignore").items()),
+                    int(fleet_size),
+                    capacity,
+                    return_to_depot
+                ), fuel_price)
+
+                g1, g2, g3 = st.columns(3)
+                g1.metric("Vehicles Dispatched", fleet["vehicles_used"])
+                g2.metric("Fleet Distance (km)", fleet["total_distance_km"])
+                g3.metric("Fleet Fuel Cost (₹)", fleet["total_fuel_cost"])
+
+                st.dataframe(fleet_table(fleet), use_container_width=True, hide_index=True)
+                if fleet["unassigned"]:
+                    st.warning(
+                        "Demand beyond fleet capacity: "
+                        + ", ".join(f"{hub} ({units:.0f})" for hub, units in fleet["unassigned"].items())
+                    )
 
     else:
         st.warning("No serviceable hubs found for routing.")
@@ -1,29 +1,10 @@
 import sqlite3
 
+from persistence import DB_PATH, get_pool, init_schema
+
 def connect_db():
-    return sqlite3.connect("project.db")
+    return sqlite3.connect(DB_PATH)
 
 def init_db():
-    conn = connect_db()
-    c = conn.cursor()
-
-    c.execute("""
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT,
-        email TEXT,
-        contact TEXT,
-        address TEXT
-    )
-    """)
-
-    c.execute("""
-    CREATE TABLE IF NOT EXISTS feedback (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        rating INTEGER,
-        comment TEXT
-    )
-    """)
-
-    conn.commit()
-    conn.close()
+    # Tables, indexes and WAL mode live in the persistence layer
+    init_schema(get_pool())
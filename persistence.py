@@ -0,0 +1,371 @@
+import argparse
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+DB_PATH = "project.db"
+POOL_SIZE = 8
+
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -64000,  # KiB, i.e. 64 MB
+    "busy_timeout": 5000,
+}
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        email TEXT,
+        contact TEXT,
+        address TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS feedback (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        rating INTEGER,
+        comment TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_users_email ON users (email)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_rating ON feedback (rating)",
+]
+
+USER_COLUMNS = ("name", "email", "contact", "address")
+FEEDBACK_COLUMNS = ("rating", "comment")
+
+
+# ==================================================
+# CONNECTION POOL
+# ==================================================
+class ConnectionPool:
+    """
+    A bounded pool of SQLite connections to one database file, opened
+    on demand with WAL journaling and the PRAGMAS above.
+
+    Connections are checked out with `with pool.connection() as conn`
+    and returned afterwards, so short-lived threads (e.g. one per
+    Streamlit rerun) reuse them instead of each opening its own. At
+    most `size` are open; further callers wait for one to be returned.
+    """
+
+    def __init__(self, path: str = DB_PATH, pragmas: dict = None,
+                 size: int = POOL_SIZE):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.path = path
+        self.pragmas = dict(PRAGMAS if pragmas is None else pragmas)
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._opened = 0
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection for the duration of the block.
+        """
+        self._slots.acquire()
+        try:
+            conn = self._checkout()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        try:
+            yield conn
+        finally:
+            # Never hand the next caller someone else's open transaction
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+            self._slots.release()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Commit on success, roll back on error.
+        """
+        with self.connection() as conn:
+            with conn:
+                yield conn
+
+    @property
+    def open_connections(self):
+        return self._opened
+
+    def close(self):
+        """
+        Close the idle connections. The pool stays usable and reopens
+        connections on demand.
+        """
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        with self._lock:
+            self._opened += 1
+        return conn
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(path: str = DB_PATH):
+    """
+    The process-wide pool for a database file.
+    """
+    with _POOLS_LOCK:
+        if path not in _POOLS:
+            _POOLS[path] = ConnectionPool(path)
+        return _POOLS[path]
+
+
+# ==================================================
+# SCHEMA AND BULK INSERTS
+# ==================================================
+def init_schema(pool: ConnectionPool = None):
+    with (pool or get_pool()).transaction() as conn:
+        for statement in SCHEMA:
+            conn.execute(statement)
+
+
+def insert_users(rows, pool: ConnectionPool = None):
+    """
+    Insert many users in one transaction. Rows are dicts or
+    (name, email, contact, address) tuples. Returns the row count.
+    """
+    return _insert_many("users", USER_COLUMNS, rows, pool)
+
+
+def insert_feedback(rows, pool: ConnectionPool = None):
+    """
+    Insert many (rating, comment) rows in one transaction.
+    """
+    return _insert_many("feedback", FEEDBACK_COLUMNS, rows, pool)
+
+
+def _insert_sql(table, columns):
+    placeholders = ", ".join("?" for _ in columns)
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+def _as_tuples(columns, rows):
+    return [
+        tuple(row.get(col) for col in columns) if isinstance(row, dict) else tuple(row)
+        for row in rows
+    ]
+
+
+def _insert_many(table, columns, rows, pool):
+    params = _as_tuples(columns, rows)
+    with (pool or get_pool()).transaction() as conn:
+        conn.executemany(_insert_sql(table, columns), params)
+    return len(params)
+
+
+# ==================================================
+# WRITE-BEHIND QUEUE
+# ==================================================
+class WriteBehindError(sqlite3.Error):
+    """
+    One or more queued writes failed; `errors` holds (sql, params,
+    exception) for each of them.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        details = "; ".join(str(exc) for _, _, exc in errors)
+        super().__init__(f"{len(errors)} queued write(s) failed: {details}")
+
+
+class WriteBehindQueue:
+    """
+    Background writer: callers enqueue statements and return at once;
+    a single thread drains the queue and commits queued writes in
+    batches of up to max_batch, grouped by statement for executemany.
+
+    If a batch fails, its writes are retried one by one so only the
+    failing statements are lost. Every failure is raised by the next
+    flush() or close() as one WriteBehindError.
+    """
+
+    _STOP = object()
+
+    def __init__(self, pool: ConnectionPool = None, max_batch: int = 1000):
+        self.pool = pool or get_pool()
+        self.max_batch = max_batch
+        self._errors = []
+        self._errors_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._drain, name="write-behind", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, sql: str, params=()):
+        self._queue.put((sql, tuple(params)))
+
+    def submit_users(self, rows):
+        sql = _insert_sql("users", USER_COLUMNS)
+        for params in _as_tuples(USER_COLUMNS, rows):
+            self._queue.put((sql, params))
+
+    def submit_feedback(self, rows):
+        sql = _insert_sql("feedback", FEEDBACK_COLUMNS)
+        for params in _as_tuples(FEEDBACK_COLUMNS, rows):
+            self._queue.put((sql, params))
+
+    def flush(self):
+        """
+        Block until everything queued so far is committed.
+        """
+        self._queue.join()
+        self._raise_errors()
+
+    def close(self):
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._raise_errors()
+
+    def _raise_errors(self):
+        with self._errors_lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise WriteBehindError(errors) from errors[0][2]
+
+    def _drain(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is self._STOP for item in batch)
+            writes = [item for item in batch if item is not self._STOP]
+            try:
+                self._write(writes)
+            except sqlite3.Error:
+                # The batch rolled back; keep every write that succeeds alone
+                self._write_each(writes)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if stop:
+                return
+
+    def _write(self, writes):
+        if not writes:
+            return
+
+        grouped = {}
+        for sql, params in writes:
+            grouped.setdefault(sql, []).append(params)
+
+        with self.pool.transaction() as conn:
+            for sql, params in grouped.items():
+                conn.executemany(sql, params)
+
+    def _write_each(self, writes):
+        failed = []
+        try:
+            with self.pool.connection() as conn:
+                for sql, params in writes:
+                    try:
+                        with conn:
+                            conn.execute(sql, params)
+                    except sqlite3.Error as exc:
+                        failed.append((sql, params, exc))
+        except sqlite3.Error as exc:
+            # Could not even open a connection: every write is lost
+            failed = [(sql, params, exc) for sql, params in writes]
+
+        with self._errors_lock:
+            self._errors.extend(failed)
+
+
+# ==================================================
+# MICRO-BENCHMARK
+# ==================================================
+def benchmark(rows: int = 20_000, baseline_rows: int = 1_000):
+    """
+    Inserts per second: one connection and commit per row (the
+    database.py pattern) against pooled executemany and the
+    write-behind queue.
+    """
+    users = [
+        (f"user{i}", f"user{i}@example.com", f"{i:010d}", f"{i} Main Road")
+        for i in range(rows)
+    ]
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "baseline.db")
+        init_schema(ConnectionPool(path, pragmas={}))
+        start = time.perf_counter()
+        for user in users[:baseline_rows]:
+            conn = sqlite3.connect(path)
+            conn.execute(_insert_sql("users", USER_COLUMNS), user)
+            conn.commit()
+            conn.close()
+        results["per_row_connect"] = baseline_rows / (time.perf_counter() - start)
+
+        pool = ConnectionPool(os.path.join(tmp, "pooled.db"))
+        init_schema(pool)
+        start = time.perf_counter()
+        insert_users(users, pool)
+        results["pooled_executemany"] = rows / (time.perf_counter() - start)
+
+        writer = WriteBehindQueue(pool)
+        start = time.perf_counter()
+        writer.submit_users(users)
+        enqueued = time.perf_counter() - start
+        writer.flush()
+        results["write_behind_enqueue"] = rows / enqueued
+        results["write_behind_committed"] = rows / (time.perf_counter() - start)
+        writer.close()
+        pool.close()
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SQLite insert micro-benchmark.")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--baseline-rows", type=int, default=1_000)
+    args = parser.parse_args(argv)
+
+    for name, rate in benchmark(args.rows, args.baseline_rows).items():
+        print(f"{name:>24}: {rate:>12,.0f} inserts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import json
+
+import numpy as np
+import pandas as pd
+from agents.forecasting_agent import ForecastingAgent
+from agents.backtesting import backtest, mase, mape, smape, summarize, write_report
+
+df = pd.read_csv("data/essentials_data.csv")
+agent = ForecastingAgent(
+    df, "transaction_date", "quantity", "item_category", "delivery_region"
+)
+
+
+def test_metrics():
+    actual, predicted = np.array([10.0, 20.0]), np.array([12.0, 18.0])
+
+    assert np.isclose(mape(actual, predicted), 15.0)
+    assert np.isclose(smape(actual, predicted), (2 / 11 + 2 / 19) / 2 * 100)
+    assert np.isclose(mase(actual, predicted, [1.0, 3.0, 5.0]), 1.0)
+    assert np.isnan(mape([0.0], [1.0]))
+
+
+def test_backtest_reports_every_level(tmp_path):
+    results = backtest(agent, horizon=5, origins=2, max_workers=2)
+    summary = summarize(results)
+
+    assert set(results["level"]) <= {"D", "W", "ME", "naive"}
+    assert (results["fit_seconds"] >= 0).all()
+    assert summary["evaluations"].sum() == len(results)
+
+    path = tmp_path / "report.json"
+    write_report(results, path, {"horizon": 5})
+    report = json.loads(path.read_text())
+
+    assert report["config"] == {"horizon": 5}
+    assert len(report["series"]) == len(results)
+    assert [row["level"] for row in report["summary"]] == list(summary["level"])
@@ -0,0 +1,127 @@
+import json
+import shutil
+
+import pandas as pd
+from agents.batch import main, open_writer, run_batch, run_file
+from agents.forecast_store import ForecastStore
+from agents.forecasting_agent import ForecastCache, ForecastingAgent
+from persistence import ConnectionPool
+
+DATA = ["data/essentials_data.csv", "data/fashion_data.csv"]
+
+
+def test_run_file_one_record_per_series():
+    records, summary = run_file(DATA[0], horizon=7, engine="numpy", warehouse="Mumbai")
+
+    assert summary["series"] == len(records) > 0
+    assert not records.duplicated(["product", "region"]).any()
+    assert (records["forecast"].map(len) == 7).all()
+    assert sum(summary["decisions"].values()) == len(records)
+    assert summary["route"] is None or summary["route"]["path"][0] == "Mumbai"
+
+
+def test_batch_streams_jsonl(tmp_path):
+    output = tmp_path / "results.jsonl"
+    seen = []
+    writer = open_writer(str(output))
+    report = run_batch(
+        DATA, writer, horizon=7, engine="numpy", max_workers=2,
+        progress=lambda done, total, summary: seen.append((done, total))
+    )
+    writer.close()
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(lines) == report["totals"]["series"]
+    assert {line["file"] for line in lines} == {"essentials_data.csv", "fashion_data.csv"}
+    assert seen == [(1, 2), (2, 2)]
+    assert report["totals"]["failed"] == 0
+
+
+def test_batch_parquet_matches_single_file(tmp_path):
+    output = tmp_path / "results.parquet"
+    writer = open_writer(str(output))
+    run_batch(DATA, writer, horizon=7, engine="numpy", max_workers=1)
+    writer.close()
+
+    stored = pd.read_parquet(output)
+    expected, _ = run_file(DATA[1], horizon=7, engine="numpy")
+    got = stored[stored["file"] == "fashion_data.csv"].reset_index(drop=True)
+
+    assert got["decision"].tolist() == expected["decision"].tolist()
+    assert got["avg_demand"].tolist() == expected["avg_demand"].tolist()
+
+
+def test_cli_reports_failed_files(tmp_path):
+    folder = tmp_path / "csvs"
+    folder.mkdir()
+    shutil.copy(DATA[0], folder)
+    (folder / "broken.csv").write_text("a,b\n1,2\n")
+    summary = tmp_path / "summary.json"
+
+    code = main([
+        str(folder), "--output", str(tmp_path / "out.jsonl"),
+        "--summary", str(summary), "--engine", "numpy", "--workers", "1",
+    ])
+
+    report = json.loads(summary.read_text())
+    assert code == 1
+    assert report["totals"]["failed"] == 1
+    assert any("error" in f and f["file"] == "broken.csv" for f in report["files"])
+
+
+def test_statsmodels_spreads_series_of_one_file(monkeypatch, tmp_path):
+    from agents.forecasting_agent import ForecastingAgent
+
+    seen = []
+    original = ForecastingAgent.forecast_all
+
+    def recording(self, horizon, max_workers=None, engine="statsmodels"):
+        seen.append(max_workers)
+        return original(self, horizon, max_workers=1, engine=engine)
+
+    monkeypatch.setattr(ForecastingAgent, "forecast_all", recording)
+    writer = open_writer(str(tmp_path / "out.jsonl"))
+    run_batch(DATA[:1], writer, horizon=7, engine="statsmodels", max_workers=3)
+    writer.close()
+
+    assert seen == [3]
+
+
+def test_parquet_schema_is_fixed(tmp_path):
+    output = tmp_path / "results.parquet"
+    records, _ = run_file(DATA[0], horizon=7)
+
+    writer = open_writer(str(output))
+    writer.write(records.iloc[:0])
+    writer.write(records.astype({"avg_demand": "int64"}))
+    writer.close()
+
+    stored = pd.read_parquet(output)
+    assert len(stored) == len(records)
+    assert stored["avg_demand"].dtype == "float64"
+
+
+def test_batch_saves_each_file_to_the_store(tmp_path):
+    # The same series under two file names must not overwrite each other
+    for name in ("north.csv", "south.csv"):
+        shutil.copy(DATA[0], tmp_path / name)
+    paths = [str(tmp_path / "north.csv"), str(tmp_path / "south.csv")]
+
+    store = ForecastStore(ConnectionPool(str(tmp_path / "out.db")), write_behind=False)
+    writer = open_writer(str(tmp_path / "results.jsonl"))
+    report = run_batch(paths, writer, horizon=7, engine="numpy", max_workers=1, store=store)
+    writer.close()
+
+    series = report["files"][0]["series"]
+    decisions = store.load_decisions()
+    assert decisions.groupby("source").size().to_dict() == {
+        "north.csv": series, "south.csv": series
+    }
+
+    expected = ForecastingAgent(
+        pd.read_csv(DATA[0]), "transaction_date", "quantity",
+        "item_category", "delivery_region", cache=ForecastCache()
+    ).forecast_all(7, engine="numpy")
+    stored = store.load_forecasts(source="north.csv")
+    assert len(stored) == len(expected) == series * 7
+    assert sorted(stored["date"]) == sorted(expected["date"])
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+from agents.schema_agent import SchemaIntelligenceAgent
+from agents.forecasting_agent import ForecastingAgent, ForecastCache
+
+df = pd.read_csv("data/essentials_data.csv")
+agent = SchemaIntelligenceAgent(df, datetime_mode="sampled")
+schema = agent.analyze()
+compact = agent.compact_frame()
+
+
+def test_compact_dtypes_and_values():
+    assert isinstance(compact["item_category"].dtype, pd.CategoricalDtype)
+    assert isinstance(compact["delivery_region"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(compact["transaction_date"])
+    assert compact["quantity"].dtype.itemsize < df["quantity"].dtype.itemsize
+    assert (compact["quantity"].astype("int64") == df["quantity"]).all()
+    assert compact.memory_usage(deep=True).sum() < df.memory_usage(deep=True).sum()
+
+
+def test_source_frame_is_shared_not_copied():
+    assert agent.df is df
+    assert df["quantity"].dtype == "int64"
+
+
+def test_forecasts_are_unchanged_on_compact_frame():
+    columns = ("transaction_date", "quantity", "item_category", "delivery_region")
+    a = ForecastingAgent(compact, *columns, cache=ForecastCache())
+    b = ForecastingAgent(df, *columns, cache=ForecastCache())
+
+    for product in df["item_category"].unique():
+        fa, fb = a.forecast(7, product), b.forecast(7, product)
+        assert fa["frequency"] == fb["frequency"]
+        assert np.allclose(fa["forecast"].values, fb["forecast"].values)
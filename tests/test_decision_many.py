@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from agents.decision_agent import DecisionAgent
+
+
+def test_decide_many_matches_decide():
+    rng = np.random.default_rng(0)
+    forecasts = rng.normal(20, 25, size=(500, 14))
+    confidences = rng.choice(["High", "Medium", "Low"], size=500)
+
+    batch = DecisionAgent.decide_many(forecasts, confidences)
+
+    for i in range(len(forecasts)):
+        single = DecisionAgent(forecasts[i], confidences[i], 14).decide()
+        assert batch["decision"].iloc[i] == single["decision"]
+        assert DecisionAgent.explain(batch.iloc[i]) == single
+
+
+def test_decide_many_scalar_confidence():
+    batch = DecisionAgent.decide_many([[0, 0], [5, 10], [30, 50]], "High")
+
+    assert batch["decision"].tolist() == ["NO_MISSION", "LIMITED_MISSION", "FULL_MISSION"]
+    assert batch["avg_demand"].tolist() == [0.0, 7.5, 40.0]
+    assert batch["peak_demand"].tolist() == [0.0, 10.0, 50.0]
+
+
+def test_decide_all_from_forecast_all_output():
+    forecasts = pd.DataFrame({
+        "product": ["A"] * 3 + ["B"] * 3,
+        "region": ["North"] * 6,
+        "date": list(pd.date_range("2024-01-01", periods=3)) * 2,
+        "forecast": [30.0, 40.0, 50.0, 1.0, 2.0, 3.0],
+        "frequency": ["D"] * 6,
+        "confidence": ["High"] * 3 + ["Low"] * 3,
+    })
+
+    decisions = DecisionAgent.decide_all(forecasts)
+
+    assert decisions[["product", "decision"]].astype(str).values.tolist() == [
+        ["A", "FULL_MISSION"],
+        ["B", "WAIT"],
+    ]
+
+
+def test_decide_all_series_of_different_lengths_in_any_order():
+    forecasts = pd.DataFrame({
+        "product": ["A", "B", "A", "B", "A"],
+        "region": ["North"] * 5,
+        "date": pd.date_range("2024-01-01", periods=5),
+        "forecast": [30.0, 1.0, 50.0, 2.0, 40.0],
+        "frequency": ["D"] * 5,
+        "confidence": ["High"] * 5,
+    })
+
+    decisions = DecisionAgent.decide_all(forecasts)
+
+    assert decisions["product"].tolist() == ["A", "B"]
+    assert decisions["avg_demand"].tolist() == [40.0, 1.5]
+    assert decisions["peak_demand"].tolist() == [50.0, 2.0]
+
+
+def test_empty_input_gives_empty_decisions():
+    columns = ["product", "region", "date", "forecast", "frequency", "confidence"]
+
+    many = DecisionAgent.decide_many(np.empty((0, 0)), [])
+    every = DecisionAgent.decide_all(pd.DataFrame(columns=columns))
+
+    assert len(many) == 0 and list(many.columns) == [
+        "decision", "avg_demand", "peak_demand", "confidence"
+    ]
+    assert len(every) == 0 and list(every.columns) == [
+        "product", "region", "frequency", "decision", "avg_demand",
+        "peak_demand", "confidence"
+    ]
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+from agents.action_plan import action_plan
+from agents.demand_cube import CubeTooLarge, DemandCube, GroupedDemand, demand_view
+from agents.schema_agent import SchemaIntelligenceAgent, compact_frame
+
+raw = pd.read_csv("data/fashion_data.csv")
+schema = SchemaIntelligenceAgent(raw).analyze()
+df = compact_frame(raw, schema)
+date_col, target_col = schema["date_columns"][0], schema["demand_target"]
+product_col, region_col = schema["product_columns"][0], schema["region_columns"][0]
+cube = DemandCube.from_frame(df, date_col, target_col, product_col, region_col)
+
+
+def test_totals_match_groupby():
+    products = df.groupby(product_col, observed=True)[target_col].sum()
+    regions = df.groupby(region_col, observed=True)[target_col].sum()
+    pairs = df.groupby([product_col, region_col], observed=True)[target_col].sum()
+
+    assert cube.product_totals().to_dict() == products.to_dict()
+    assert list(cube.product_totals()) == sorted(products, reverse=True)
+    assert cube.region_totals().to_dict() == regions.to_dict()
+
+    heatmap = cube.pair_totals().set_index([product_col, region_col])[target_col]
+    assert heatmap.to_dict() == pairs.to_dict()
+    assert heatmap.dtype == "int64"
+
+
+def test_action_plan_matches_frame_version():
+    pd.testing.assert_frame_equal(
+        cube.action_plan(), action_plan(df, product_col, region_col, target_col)
+    )
+
+
+def test_series_metrics_match_rows():
+    product, region = "T-Shirts", "Delhi"
+    rows = df[(df[product_col] == product) & (df[region_col] == region)]
+    demand = rows.sort_values(date_col)[target_col]
+    half = len(demand) // 2
+
+    assert cube.total(product, region) == demand.sum()
+    assert cube.daily(product, region).sum() == demand.sum()
+    assert len(cube.daily(product, region)) == len(cube.days)
+    assert np.isclose(
+        cube.growth(product, region),
+        (demand.iloc[half:].sum() - demand.iloc[:half].sum()) / demand.sum() * 100
+    )
+    assert cube.risk(product, region) == (
+        "High" if demand.std() > demand.mean() else "Medium"
+    )
+
+
+def test_undated_and_unkeyed_rows():
+    frame = pd.DataFrame({
+        "date": ["2025-01-01", "2025-01-01", "2025-01-03", None, "2025-01-02"],
+        "product": ["A", "A", "B", "A", None],
+        "region": ["X", "X", "Y", "X", "Y"],
+        "units": [1.5, 2.0, 4.0, 10.0, 100.0],
+    })
+    small = DemandCube.from_frame(frame, "date", "units", "product", "region")
+
+    assert small.values.shape == (2, 2, 3)
+    assert small.total("A", "X") == 13.5
+    assert small.daily("A", "X").tolist() == [3.5, 0.0, 0.0]
+    assert small.active_days("B", "Y").index.tolist() == [pd.Timestamp("2025-01-03")]
+    assert small.pair_totals().shape == (2, 3)
+
+
+def test_oversized_cube_falls_back_to_grouped():
+    with pytest.raises(CubeTooLarge):
+        DemandCube.from_frame(df, date_col, target_col, product_col, region_col, max_cells=100)
+
+    grouped = demand_view(df, date_col, target_col, product_col, region_col, max_cells=100)
+    assert isinstance(grouped, GroupedDemand)
+    assert isinstance(demand_view(df, date_col, target_col, product_col, region_col), DemandCube)
+
+    assert grouped.product_totals().to_dict() == cube.product_totals().to_dict()
+    assert list(grouped.region_totals()) == list(cube.region_totals())
+    pd.testing.assert_frame_equal(grouped.action_plan(), cube.action_plan())
+
+    for product, region in [("T-Shirts", "Delhi"), ("Jeans", "Goa")]:
+        assert grouped.total(product, region) == cube.total(product, region)
+        assert grouped.growth(product, region) == pytest.approx(cube.growth(product, region))
+        assert grouped.risk(product, region) == cube.risk(product, region)
+        assert grouped.daily(product, region).tolist() == cube.daily(product, region).tolist()
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from agents.downsampling import OTHER_LABEL, downsample_frame, lttb, lttb_indices, top_k, top_k_cells
+
+df = pd.read_csv("data/fashion_data.csv")
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    index = pd.date_range("2020-01-01", periods=10_000, freq="h")
+    series = pd.Series(np.sin(np.arange(10_000) / 200.0), index=index)
+    series.iloc[4321] = 25.0
+
+    sampled = lttb(series, 300)
+
+    assert len(sampled) == 300
+    assert sampled.index[0] == index[0] and sampled.index[-1] == index[-1]
+    assert sampled.index.is_monotonic_increasing
+    assert sampled.max() == 25.0
+
+
+def test_lttb_short_series_untouched():
+    assert lttb_indices([0, 1, 2], [3, 1, 2], 10).tolist() == [0, 1, 2]
+    with pytest.raises(ValueError):
+        lttb_indices(np.arange(10), np.arange(10), 2)
+
+
+def test_downsample_frame_per_group():
+    frame = pd.DataFrame({
+        "Date": np.tile(pd.date_range("2024-01-01", periods=1000), 2),
+        "Demand": np.random.default_rng(0).normal(size=2000),
+        "Type": np.repeat(["Historical", "Forecast"], 1000),
+    })
+    sampled = downsample_frame(frame, "Date", "Demand", 50, by="Type")
+
+    assert sampled.groupby("Type").size().tolist() == [50, 50]
+
+
+def test_top_k_cells_bounds_heatmap():
+    cells = top_k_cells(df, "style_category", "location", "items_sold", max_rows=3, max_columns=5)
+
+    assert cells["style_category"].nunique() <= 3
+    assert cells["location"].nunique() == 5
+    assert OTHER_LABEL in set(cells["location"])
+    assert cells["items_sold"].sum() == df["items_sold"].sum()
+    assert not cells.duplicated(["style_category", "location"]).any()
+
+    top_regions = df.groupby("location")["items_sold"].sum().nlargest(4).index
+    assert set(cells["location"]) == set(top_regions) | {OTHER_LABEL}
+
+
+def test_top_k_small_axis_unchanged():
+    assert top_k(df, "style_category", "items_sold", 10) is df
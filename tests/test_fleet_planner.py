@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from agents.fleet_planner import fleet_table, plan_fleet, price_fleet
+from agents.geo_navigation_agent import GeoNavigationAgent
+from agents.hub_registry import HubNavigationAgent, HubRegistry
+
+rng = np.random.default_rng(3)
+coords = np.column_stack([rng.uniform(8, 32, 200), rng.uniform(70, 88, 200)])
+names = [f"H{i}" for i in range(200)]
+agent = HubNavigationAgent(HubRegistry(names, coords))
+demand = dict(zip(names[3:], rng.integers(1, 40, 197).astype(float)))
+
+
+def test_every_hub_is_delivered_within_capacity():
+    plan = plan_fleet(agent, ["H0", "H1", "H2"], demand, vehicles=12,
+                      capacity=500, fuel_price=100, max_workers=1)
+
+    delivered = {}
+    for route in plan["routes"]:
+        assert route["load"] <= 500
+        assert route["path"][0] == route["path"][-1] == route["warehouse"]
+        assert set(route["deliveries"]) <= set(route["stop_order"])
+        for hub, units in route["deliveries"].items():
+            delivered[hub] = delivered.get(hub, 0) + units
+
+    assert plan["unassigned"] == {}
+    assert delivered == pytest.approx(demand)
+    assert plan["total_distance_km"] == pytest.approx(
+        sum(r["distance_km"] for r in plan["routes"]), abs=0.01
+    )
+    assert len(fleet_table(plan)) == plan["vehicles_used"]
+
+
+def test_parallel_matches_serial():
+    args = (agent, ["H0", "H1"], demand, {"H0": 3, "H1": 5}, 800, 100)
+
+    serial = plan_fleet(*args, max_workers=1)
+    parallel = plan_fleet(*args, max_workers=2)
+
+    assert [r["path"] for r in parallel["routes"]] == [r["path"] for r in serial["routes"]]
+    assert parallel["total_fuel_cost"] == serial["total_fuel_cost"]
+
+
+def test_overflow_split_and_unroutable_hubs():
+    plan = plan_fleet(
+        GeoNavigationAgent(), ["Mumbai"],
+        {"Delhi": 150, "Jaipur": 60, "Pune": 10},
+        vehicles=2, capacity=100, fuel_price=100, return_to_depot=False
+    )
+
+    assert plan["unroutable"] == ["Pune"]
+    assert plan["unassigned"] == {"Jaipur": 10.0}
+    assert sorted(r["deliveries"]["Delhi"] for r in plan["routes"]) == [50.0, 100.0]
+    assert all(r["path"][-1] != "Mumbai" for r in plan["routes"])
+
+    with pytest.raises(ValueError):
+        plan_fleet(GeoNavigationAgent(), ["Pune"], {"Delhi": 1}, 1, 10, 100)
+
+
+def test_repricing_matches_planning_at_that_price():
+    args = (agent, ["H0", "H1"], demand, 6, 800)
+
+    planned = plan_fleet(*args, fuel_price=120, max_workers=1)
+    repriced = price_fleet(plan_fleet(*args, fuel_price=0, max_workers=1), 120)
+
+    assert [r["path"] for r in repriced["routes"]] == [r["path"] for r in planned["routes"]]
+    assert [r["fuel_cost"] for r in repriced["routes"]] == pytest.approx(
+        [r["fuel_cost"] for r in planned["routes"]], abs=0.05
+    )
+    assert repriced["total_fuel_cost"] == pytest.approx(planned["total_fuel_cost"], abs=0.5)
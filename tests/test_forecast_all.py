@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+from agents.schema_agent import SchemaIntelligenceAgent
+from agents.forecasting_agent import ForecastingAgent
+
+df = pd.read_csv("data/fashion_data.csv")
+schema = SchemaIntelligenceAgent(df).analyze()
+
+agent = ForecastingAgent(
+    df=df,
+    date_col=schema["date_columns"][0],
+    target_col=schema["demand_target"],
+    product_col=schema["product_columns"][0],
+    region_col=schema["region_columns"][0]
+)
+
+
+def test_forecast_all_matches_single_series_forecasts():
+    result = agent.forecast_all(horizon=7, max_workers=2)
+
+    assert list(result.columns) == [
+        "product", "region", "date", "forecast", "frequency", "confidence"
+    ]
+
+    pairs = result[["product", "region"]].drop_duplicates()
+    assert len(pairs) == len(df.groupby([agent.product_col, agent.region_col]))
+
+    for product, region in pairs.itertuples(index=False):
+        single = agent.forecast(7, product, region)
+        rows = result[(result["product"] == product) & (result["region"] == region)]
+
+        assert len(rows) == 7
+        assert rows["frequency"].iloc[0] == single["frequency"]
+        assert rows["confidence"].iloc[0] == single["confidence"]
+        assert np.allclose(rows["forecast"].values, single["forecast"].values)
+
+
+def test_partition_index_matches_boolean_filters():
+    data = agent.df
+    p, r = agent.product_col, agent.region_col
+    product, region = data[p].iloc[0], data[r].iloc[-1]
+
+    cases = [
+        ((product, None), data[data[p] == product]),
+        ((None, region), data[data[r] == region]),
+        ((product, region), data[(data[p] == product) & (data[r] == region)]),
+    ]
+    for (prod, reg), expected in cases:
+        selected = agent._select(prod, reg)
+        assert sorted(selected.index) == sorted(expected.index)
+
+    assert agent._select("missing", "missing").empty
+
+
+def test_daily_series_matches_grouper_aggregation():
+    data = agent._select(product=agent.df[agent.product_col].iloc[0])
+    expected = (
+        data
+        .groupby(pd.Grouper(key=agent.date_col, freq="D"))[agent.target_col]
+        .sum()
+    )
+    daily = agent._daily_series(data)
+
+    assert (daily.index == expected.index).all()
+    assert np.allclose(daily.values, expected.values)
+    assert (daily.resample("W").sum().values == expected.resample("W").sum().values).all()
+
+
+
+def test_tz_aware_dates_bin_by_local_day():
+    local = df.assign(sale_timestamp=df["sale_timestamp"] + " 00:30:00+05:30")
+    aware = ForecastingAgent(local, "sale_timestamp", "items_sold", "style_category", "location")
+    naive = ForecastingAgent(df, "sale_timestamp", "items_sold", "style_category", "location")
+
+    data = aware._select(product="T-Shirts", region="Delhi")
+    expected = (
+        data
+        .groupby(pd.Grouper(key="sale_timestamp", freq="D"))["items_sold"]
+        .sum()
+    )
+    daily = aware._daily_series(data)
+
+    assert (daily.index == expected.index.tz_localize(None)).all()
+    assert np.allclose(daily.values, expected.values)
+
+    result = aware.forecast(7, "T-Shirts", "Delhi")
+    reference = naive.forecast(7, "T-Shirts", "Delhi")
+    assert (result["history"].index == reference["history"].index).all()
+    assert (result["forecast"].index == reference["forecast"].index).all()
+
+
+if __name__ == "__main__":
+    print(agent.forecast_all(horizon=7).head(14))
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from agents.forecasting_agent import ForecastingAgent, ForecastCache
+
+df = pd.read_csv("data/essentials_data.csv")
+
+
+def make_agent(cache):
+    return ForecastingAgent(
+        df, "transaction_date", "quantity",
+        "item_category", "delivery_region", cache=cache
+    )
+
+
+def test_horizons_are_sliced_from_one_fit():
+    cache = ForecastCache(maxsize=8)
+    agent = make_agent(cache)
+
+    f30 = agent.forecast(30)["forecast"]
+    f7 = agent.forecast(7)["forecast"]
+
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+    assert np.allclose(f30.values[:7], f7.values)
+
+
+def test_cache_is_shared_across_agent_instances():
+    cache = ForecastCache(maxsize=8)
+    make_agent(cache).forecast(15)
+    make_agent(cache).forecast(90)
+
+    assert cache.hits == 1
+    assert len(cache) == 1
+
+
+def test_lru_eviction_is_bounded():
+    cache = ForecastCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.decision_agent import DecisionAgent
+from agents.forecast_store import ForecastStore, PersistentForecastCache
+from agents.forecasting_agent import ForecastCache, ForecastingAgent
+from persistence import ConnectionPool
+
+df = pd.read_csv("data/essentials_data.csv")
+COLUMNS = ("transaction_date", "quantity", "item_category", "delivery_region")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "forecasts.db")
+
+
+def new_session(db_path):
+    # A fresh pool, store and cache, as in a newly started process
+    store = ForecastStore(ConnectionPool(db_path))
+    return store, PersistentForecastCache(store)
+
+
+def count_fits(monkeypatch):
+    fits = []
+    original = ForecastingAgent._fit_ets
+
+    def counting(ts, freq):
+        fits.append(freq)
+        return original(ts, freq)
+
+    monkeypatch.setattr(ForecastingAgent, "_fit_ets", staticmethod(counting))
+    return fits
+
+
+def test_warm_start_skips_unchanged_series(db_path, monkeypatch):
+    fits = count_fits(monkeypatch)
+
+    store, cache = new_session(db_path)
+    cold = ForecastingAgent(df, *COLUMNS, cache=cache).forecast_all(7, max_workers=1)
+    store.flush()
+    fitted_cold = len(fits)
+    assert fitted_cold > 0
+
+    store, cache = new_session(db_path)
+    warm = ForecastingAgent(df, *COLUMNS, cache=cache).forecast_all(7, max_workers=1)
+
+    assert len(fits) == fitted_cold
+    assert cache.stats()["store_hits"] == fitted_cold
+    assert np.allclose(warm["forecast"], cold["forecast"])
+    assert (warm["product"] == cold["product"]).all()
+
+    # Changing one series' history refits only that series
+    changed = df.copy()
+    changed.loc[0, "quantity"] += 50
+    store, cache = new_session(db_path)
+    ForecastingAgent(changed, *COLUMNS, cache=cache).forecast_all(7, max_workers=1)
+    assert len(fits) == fitted_cold + 1
+
+
+def test_single_forecast_loads_stored_model(db_path):
+    store, cache = new_session(db_path)
+    first = ForecastingAgent(df, *COLUMNS, cache=cache).forecast(14, "Groceries", "Bihar")
+    store.flush()
+
+    store, cache = new_session(db_path)
+    second = ForecastingAgent(df, *COLUMNS, cache=cache).forecast(14, "Groceries", "Bihar")
+
+    assert cache.stats()["store_hits"] == 1
+    assert second["frequency"] == first["frequency"]
+    assert (second["forecast"].index == first["forecast"].index).all()
+    assert np.allclose(second["forecast"].values, first["forecast"].values)
+
+
+def test_forecasts_and_decisions_round_trip(db_path):
+    store, cache = new_session(db_path)
+    forecasts = ForecastingAgent(df, *COLUMNS, cache=cache).forecast_all(
+        5, engine="numpy"
+    )
+    decisions = DecisionAgent.decide_all(forecasts)
+
+    store.save_forecasts(forecasts)
+    store.save_decisions(decisions)
+    store.flush()
+
+    stored = store.load_forecasts(product="Groceries")
+    assert len(stored) == (forecasts["product"] == "Groceries").sum()
+    assert stored["date"].dtype.kind == "M"
+
+    loaded = store.load_decisions().set_index(["product", "region"])
+    expected = decisions.astype({"product": str, "region": str, "decision": str})
+    expected = expected.set_index(["product", "region"])
+    assert (loaded.loc[expected.index, "decision"] == expected["decision"]).all()
+
+
+def test_warm_start_reads_models_in_bulk(db_path, monkeypatch):
+    store, cache = new_session(db_path)
+    ForecastingAgent(df, *COLUMNS, cache=cache).forecast_all(7, engine="numpy")
+    store.flush()
+
+    store, cache = new_session(db_path)
+    single = []
+    monkeypatch.setattr(store, "load_model", lambda key: single.append(key))
+    ForecastingAgent(df, *COLUMNS, cache=cache).forecast_all(7, engine="numpy")
+
+    assert single == []
+    assert cache.stats()["store_hits"] > 0
+
+
+def test_pending_models_are_written_at_exit(db_path):
+    import subprocess
+    import sys
+
+    script = (
+        "import pandas as pd\n"
+        "from agents.forecast_store import ForecastStore, PersistentForecastCache\n"
+        "from agents.forecasting_agent import ForecastingAgent\n"
+        "from persistence import ConnectionPool\n"
+        f"df = pd.read_csv({'data/essentials_data.csv'!r})\n"
+        f"cache = PersistentForecastCache(ForecastStore(ConnectionPool({db_path!r})))\n"
+        f"ForecastingAgent(df, *{COLUMNS!r}, cache=cache).forecast_all(7, engine='numpy')\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+    # Every fitted series' model, no more and no fewer
+    fitted = ForecastCache()
+    ForecastingAgent(df, *COLUMNS, cache=fitted).forecast_all(7, engine="numpy")
+
+    store = ForecastStore(ConnectionPool(db_path), write_behind=False)
+    with store.pool.connection() as conn:
+        stored = conn.execute("SELECT COUNT(*) FROM forecast_models").fetchone()[0]
+    assert stored == len(fitted) > 0
+
+
+def test_output_tables_without_source_are_rebuilt(db_path):
+    import sqlite3
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE decisions (product TEXT NOT NULL, region TEXT NOT NULL, "
+            "decision TEXT, PRIMARY KEY (product, region))"
+        )
+        conn.execute("INSERT INTO decisions VALUES ('A', 'North', 'WAIT')")
+
+    store = ForecastStore(ConnectionPool(db_path), write_behind=False)
+    decisions = pd.DataFrame({
+        "product": ["A"], "region": ["North"], "decision": ["FULL_MISSION"],
+        "avg_demand": [30.0], "peak_demand": [50.0],
+        "confidence": ["High"], "frequency": ["D"],
+    })
+    store.save_decisions(decisions, source="a.csv")
+    store.save_decisions(decisions.assign(decision="WAIT"), source="b.csv")
+
+    loaded = store.load_decisions()
+    assert loaded[["source", "decision"]].values.tolist() == [
+        ["a.csv", "FULL_MISSION"], ["b.csv", "WAIT"]
+    ]
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+from agents.forecasting_agent import ForecastingAgent, ForecastCache
+from agents.holt_engine import HoltFit
+
+df = pd.read_csv("data/essentials_data.csv")
+history, new_rows = df.iloc[:45], df.iloc[45:]
+
+
+def make_agent(data, cache=None):
+    return ForecastingAgent(
+        data, "transaction_date", "quantity",
+        "item_category", "delivery_region", cache=cache or ForecastCache()
+    )
+
+
+def test_update_advances_without_refit():
+    agent = make_agent(history)
+    agent.forecast(7)
+
+    summary = agent.update(new_rows)
+    misses = agent.cache.misses
+    result = agent.forecast(7)
+
+    assert summary == {"rows": len(new_rows), "advanced": 1, "refitted": 0}
+    assert agent.cache.misses == misses
+    assert result["history"].index[-1] == pd.Timestamp(df["transaction_date"].max())
+    assert len(result["forecast"]) == 7
+
+
+def test_advanced_state_follows_holt_recursion():
+    agent = make_agent(history)
+    before = agent.forecast(3)
+    fit = HoltFit.from_statsmodels(agent._tracked[(None, None, "statsmodels")]["fit"],
+                                   before["history"])
+
+    agent.update(new_rows)
+    after = agent.forecast(3)
+
+    level, trend = fit.level, fit.trend
+    for value in after["history"].values[len(before["history"]):]:
+        new_level = fit.alpha * value + (1 - fit.alpha) * (level + trend)
+        trend = fit.beta * (new_level - level) + (1 - fit.beta) * trend
+        level = new_level
+
+    assert np.allclose(after["forecast"].values, level + trend * np.arange(1, 4))
+
+
+def test_schedule_forces_refit():
+    agent = make_agent(history)
+    agent.forecast(7, engine="numpy")
+
+    summary = agent.update(new_rows, refit_every=1)
+
+    assert summary["refitted"] == 1
+
+
+def test_untracked_series_see_new_rows():
+    agent = make_agent(history)
+    agent.update(new_rows)
+    full = make_agent(df)
+
+    product = new_rows["item_category"].iloc[-1]
+    updated = agent.forecast(7, product=product)["history"]
+    expected = full.forecast(7, product=product)["history"]
+
+    assert (updated.index == expected.index).all()
+    assert np.allclose(updated.values, expected.values)
+
+
+def test_update_after_forecast_all():
+    agent = make_agent(history)
+    agent.forecast_all(7, engine="numpy")
+
+    tracked = {(product, region) for product, region, _ in agent._tracked}
+    touched = set(zip(new_rows["item_category"], new_rows["delivery_region"]))
+    summary = agent.update(new_rows)
+
+    assert tracked
+    assert summary["advanced"] + summary["refitted"] == len(tracked & touched) > 0
+
+    # Updated series forecast from the new history, with no new fit
+    product, region = sorted(tracked & touched)[0]
+    expected = make_agent(df).forecast(7, product, region, engine="numpy")
+    misses = agent.cache.misses
+    result = agent.forecast(7, product, region, engine="numpy")
+    assert agent.cache.misses == misses
+    assert result["history"].index[-1] == expected["history"].index[-1]
+    assert result["forecast"].index.equals(expected["forecast"].index)
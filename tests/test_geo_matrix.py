@@ -0,0 +1,67 @@
+import networkx as nx
+import numpy as np
+import pytest
+from scipy.sparse.csgraph import shortest_path
+
+from agents.geo_navigation_agent import (
+    CITY_COORDS,
+    GeoNavigationAgent,
+    haversine,
+    haversine_matrix,
+    shared_agent,
+)
+
+
+def test_matrix_matches_scalar_haversine():
+    cities = list(CITY_COORDS)
+    matrix = haversine_matrix([CITY_COORDS[c] for c in cities])
+
+    for i, a in enumerate(cities):
+        for j, b in enumerate(cities):
+            assert matrix[i, j] == pytest.approx(haversine(CITY_COORDS[a], CITY_COORDS[b]))
+
+
+def test_route_matches_networkx_dijkstra():
+    agent = GeoNavigationAgent()
+    stops = ["Mumbai", "Indore", "Jaipur", "Delhi", "Delhi", "Bengaluru"]
+
+    route = agent.plan_multi_stop_route(stops, fuel_price=105)
+
+    expected = sum(
+        nx.dijkstra_path_length(agent.graph, a, b, weight="weight")
+        for a, b in zip(stops[:-1], stops[1:])
+    )
+    assert route["distance_km"] == round(expected, 2)
+    assert route["path"] == ["Mumbai", "Indore", "Jaipur", "Delhi", "Bengaluru"]
+    assert route["fuel_cost"] == round(expected / 15 * 105, 2)
+
+
+def test_shortest_path_through_sparse_graph():
+    # Far-apart pairs route via the middle city once direct edges are cut
+    coords = {"A": (0.0, 0.0), "B": (0.0, 1.0), "C": (0.0, 2.0)}
+    agent = GeoNavigationAgent(coords)
+    agent.distances[0, 2] = agent.distances[2, 0] = 0
+    agent.path_lengths, agent.predecessors = shortest_path(
+        agent.distances, directed=False, return_predecessors=True
+    )
+
+    assert agent.shortest_path("A", "C") == ["A", "B", "C"]
+
+
+def test_unknown_city_and_shared_instance():
+    with pytest.raises(ValueError):
+        shared_agent().plan_multi_stop_route(["Mumbai", "Pune"], 100)
+    assert shared_agent() is shared_agent()
+    assert np.allclose(shared_agent().path_lengths, shared_agent().path_lengths.T)
+
+
+def test_co_located_cities_stay_connected():
+    agent = GeoNavigationAgent({
+        "Mumbai": CITY_COORDS["Mumbai"],
+        "Mumbai Port": CITY_COORDS["Mumbai"],
+        "Delhi": CITY_COORDS["Delhi"],
+    })
+
+    assert agent.shortest_path("Mumbai", "Mumbai Port")[-1] == "Mumbai Port"
+    assert agent.route_distance(["Mumbai", "Mumbai Port"]) == pytest.approx(0, abs=1e-3)
+    assert agent.plan_route(["Mumbai Port", "Delhi"], 100)["path"] == ["Mumbai Port", "Delhi"]
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+from agents.holt_engine import fit_holt_batch, holt_filter
+from agents.forecasting_agent import ForecastingAgent, ForecastCache
+
+rng = np.random.default_rng(7)
+
+
+def make_series(n, freq="D"):
+    y = 40 + 1.5 * np.arange(n) + rng.normal(0, 4, n)
+    return pd.Series(y, index=pd.date_range("2025-01-01", periods=n, freq=freq))
+
+
+def test_recursion_matches_statsmodels_with_fixed_parameters():
+    ts = make_series(40)
+    fitted = ExponentialSmoothing(
+        ts, trend="add",
+        initialization_method="known", initial_level=38.0, initial_trend=1.0
+    ).fit(smoothing_level=0.4, smoothing_trend=0.1, optimized=False)
+
+    level, trend, sse = holt_filter(ts.values, 0.4, 0.1, 38.0, 1.0)
+
+    assert np.isclose(level, fitted.level.iloc[-1])
+    assert np.isclose(trend, fitted.trend.iloc[-1])
+    assert np.isclose(sse, fitted.sse)
+
+
+def test_batch_fit_agrees_with_statsmodels():
+    series = [make_series(n, freq) for n, freq in [(12, "D"), (30, "W"), (90, "D")]]
+    fits = fit_holt_batch(series)
+
+    for ts, fit in zip(series, fits):
+        reference = ExponentialSmoothing(ts, trend="add").fit()
+
+        # The grid search never lands on a worse optimum than statsmodels
+        assert fit.sse <= reference.sse * 1.01
+
+        expected = reference.forecast(10)
+        actual = fit.forecast(10)
+        assert (actual.index == expected.index).all()
+        assert np.allclose(actual.values, expected.values, rtol=0.05)
+
+
+def test_engine_is_selectable_per_call():
+    df = pd.read_csv("data/essentials_data.csv")
+    agent = ForecastingAgent(
+        df, "transaction_date", "quantity",
+        "item_category", "delivery_region", cache=ForecastCache()
+    )
+
+    batch = agent.forecast_all(horizon=5, engine="numpy")
+    single = agent.forecast(5, engine="numpy")
+
+    assert set(batch["frequency"]) <= {"D", "W", "ME", "naive"}
+    assert len(single["forecast"]) == 5
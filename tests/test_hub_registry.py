@@ -0,0 +1,116 @@
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.sparse.csgraph import connected_components
+
+from agents.geo_navigation_agent import CITY_COORDS, GeoNavigationAgent, haversine_matrix
+from agents.hub_registry import HubNavigationAgent, HubRegistry
+
+
+def random_hubs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    coords = np.column_stack([rng.uniform(8, 32, n), rng.uniform(70, 88, n)])
+    return [f"H{i}" for i in range(n)], coords
+
+
+def test_small_registry_matches_dense_agent():
+    registry = HubRegistry.from_coords(CITY_COORDS)
+    dense = GeoNavigationAgent()
+
+    for a in CITY_COORDS:
+        for b in CITY_COORDS:
+            assert registry.path_length(a, b) == pytest.approx(dense.path_lengths[
+                dense.index[a], dense.index[b]
+            ], abs=1e-5)
+
+    stops = ["Mumbai", "Jaipur", "Bengaluru"]
+    assert (HubNavigationAgent(registry).plan_multi_stop_route(stops, 100)["distance_km"]
+            == dense.plan_multi_stop_route(stops, 100)["distance_km"])
+
+
+def test_nearest_matches_brute_force():
+    names, coords = random_hubs(2000)
+    registry = HubRegistry(names, coords)
+    queries = random_hubs(50, seed=1)[1]
+
+    found, km = registry.nearest(queries)
+    brute = haversine_matrix(queries, coords)
+
+    assert found[:, 0].tolist() == [names[i] for i in brute.argmin(axis=1)]
+    assert np.allclose(km[:, 0], brute.min(axis=1))
+
+
+def test_large_graph_is_sparse_and_connected():
+    names, coords = random_hubs(10_000)
+    # A remote cluster that the k-nearest graph alone leaves disconnected
+    island = np.column_stack([np.full(3, 6.0), np.linspace(93.0, 93.01, 3)])
+    coords = np.vstack([coords, island])
+    names = names + ["I0", "I1", "I2"]
+
+    registry = HubRegistry(names, coords, neighbours=2)
+
+    assert registry.graph.nnz <= 2 * 2 * len(names) + 2
+    assert connected_components(registry.graph, directed=False)[0] == 1
+
+    path = registry.shortest_path("H0", "I2")
+    assert path[0] == "H0" and path[-1] == "I2"
+
+    # One dijkstra per source, reused by later queries from it
+    cached = registry._from_source(registry.index["H0"])
+    assert registry._from_source(registry.index["H0"]) is cached
+    assert list(registry._sources) == [registry.index["H0"]]
+    assert registry.path_length("H0", "I2") >= haversine_matrix(
+        registry.latlon[[0]], registry.latlon[[-1]]
+    )[0, 0] - 1e-6
+
+
+def test_resolve_and_load(tmp_path):
+    frame = pd.DataFrame({
+        "hub": list(CITY_COORDS),
+        "lat": [c[0] for c in CITY_COORDS.values()],
+        "lon": [c[1] for c in CITY_COORDS.values()],
+    })
+    frame.to_csv(tmp_path / "hubs.csv", index=False)
+    frame.to_parquet(tmp_path / "hubs.parquet")
+
+    for path in ("hubs.csv", "hubs.parquet"):
+        registry = HubRegistry.load(str(tmp_path / path))
+        assert registry.names == list(CITY_COORDS)
+
+    assert registry.resolve(" mumbai ") == "Mumbai"
+    assert registry.resolve("Pune", {"Pune": (18.5204, 73.8567)}) == "Mumbai"
+    assert registry.resolve("Atlantis") is None
+
+    agent = HubNavigationAgent(registry, {"Pune": (18.5204, 73.8567)})
+    assert agent.plan_multi_stop_route(["Pune", "Delhi"], 100)["path"][0] == "Mumbai"
+    assert nx.is_connected(agent.graph)
+    with pytest.raises(ValueError):
+        agent.plan_multi_stop_route(["Atlantis", "Delhi"], 100)
+
+
+def test_plan_route_runs_one_dijkstra(monkeypatch):
+    import agents.hub_registry as hub_registry
+
+    names, coords = random_hubs(2000)
+    registry = HubRegistry(names, coords)
+    agent = HubNavigationAgent(registry)
+    stops = names[::50]
+
+    calls = []
+    original = hub_registry.dijkstra
+
+    def counting(*args, **kwargs):
+        calls.append(kwargs.get("indices"))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(hub_registry, "dijkstra", counting)
+    route = agent.plan_route(stops, 100, optimize=True)
+    monkeypatch.undo()
+
+    assert len(calls) == 1 and len(calls[0]) == len(stops)
+    assert route["distance_km"] == round(registry.route_distance(route["stop_order"]), 2)
+    for leg in route["legs"]:
+        assert leg["distance_km"] == round(registry.path_length(leg["from"], leg["to"]), 2)
+        assert leg["path"] == registry.shortest_path(leg["from"], leg["to"])
+    assert agent._routes is None
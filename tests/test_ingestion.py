@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from agents.ingestion import ingest_csv
+from agents.forecasting_agent import ForecastingAgent, ForecastCache
+
+PATH = "data/fashion_data.csv"
+df = pd.read_csv(PATH)
+
+
+def test_chunked_aggregate_matches_full_read():
+    result = ingest_csv(PATH, chunksize=10, merge_rows=15)
+    aggregate = result["aggregate"]
+
+    assert result["rows"] == len(df)
+    assert result["chunks"] == int(np.ceil(len(df) / 10))
+    assert result["schema"]["row_count"] == len(df)
+
+    expected = df.groupby(["style_category", "location"])["items_sold"].sum()
+    actual = aggregate.groupby(["style_category", "location"])["items_sold"].sum()
+    assert actual.sort_index().equals(expected.sort_index())
+
+
+def test_aggregate_feeds_forecasting_agent():
+    aggregate = ingest_csv(PATH, chunksize=7)["aggregate"]
+    columns = ("sale_timestamp", "items_sold", "style_category", "location")
+
+    streamed = ForecastingAgent(aggregate, *columns, cache=ForecastCache())
+    direct = ForecastingAgent(df, *columns, cache=ForecastCache())
+
+    a, b = streamed.forecast(7), direct.forecast(7)
+    assert a["frequency"] == b["frequency"]
+    assert np.allclose(a["forecast"].values, b["forecast"].values)
+
+
+def test_dates_in_a_second_format_are_reparsed(tmp_path):
+    mixed = df.copy()
+    dates = pd.to_datetime(mixed["sale_timestamp"])
+    mixed["sale_timestamp"] = dates.dt.strftime("%Y-%m-%d")
+    mixed.loc[30:, "sale_timestamp"] = dates[30:].dt.strftime("%d/%m/%Y")
+    path = tmp_path / "mixed.csv"
+    mixed.to_csv(path, index=False)
+
+    result = ingest_csv(path, chunksize=20)
+
+    assert result["dropped_rows"] == 0
+    assert result["aggregate"]["items_sold"].sum() == df["items_sold"].sum()
+    expected = dates.dt.floor("D").value_counts().sort_index()
+    daily = result["aggregate"].groupby("sale_timestamp").size()
+    assert set(daily.index) == set(expected.index)
+
+
+def test_unreadable_dates_are_counted(tmp_path):
+    broken = df.copy()
+    broken.loc[40:44, "sale_timestamp"] = "not a date"
+    path = tmp_path / "broken.csv"
+    broken.to_csv(path, index=False)
+
+    result = ingest_csv(path, chunksize=20)
+    lost = broken.loc[40:44, "items_sold"].sum()
+
+    assert result["dropped_rows"] == 5
+    assert result["dropped_units"] == lost
+    assert result["schema"]["dropped_rows"] == 5
+    assert result["aggregate"]["items_sold"].sum() == df["items_sold"].sum() - lost
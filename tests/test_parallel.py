@@ -0,0 +1,9 @@
+from agents.parallel import process_map
+
+
+def test_process_map_keeps_task_order():
+    tasks = list(range(20))
+
+    assert process_map(abs, [-t for t in tasks], max_workers=1) == tasks
+    assert process_map(abs, [-t for t in tasks], max_workers=2) == tasks
+    assert process_map(abs, [], max_workers=2) == []
@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from persistence import (
+    ConnectionPool,
+    WriteBehindError,
+    WriteBehindQueue,
+    init_schema,
+    insert_feedback,
+    insert_users,
+)
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "test.db"))
+    init_schema(pool)
+    yield pool
+    pool.close()
+
+
+def count(pool, table):
+    with pool.connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_wal_mode_and_indexes(pool):
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in conn.execute("SELECT * FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_users_email", "idx_feedback_rating"} <= indexes
+
+
+def test_short_lived_threads_reuse_connections(pool):
+    def use():
+        with pool.connection() as conn:
+            conn.execute("SELECT 1")
+
+    for _ in range(20):
+        thread = threading.Thread(target=use)
+        thread.start()
+        thread.join()
+
+    assert pool.open_connections == 1
+
+
+def test_pool_is_bounded(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "bounded.db"), size=2)
+    lock = threading.Lock()
+    active, peak = [0], []
+
+    def use():
+        with pool.connection():
+            with lock:
+                active[0] += 1
+                peak.append(active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) <= 2
+    assert pool.open_connections <= 2
+    pool.close()
+    assert pool.open_connections == 0
+
+
+def test_bulk_inserts(pool):
+    assert insert_users([
+        ("Asha", "asha@example.com", "9999", "Pune"),
+        {"name": "Ravi", "email": "ravi@example.com"},
+    ], pool) == 2
+    insert_feedback([(5, "Great"), (3, None)], pool)
+
+    assert count(pool, "users") == 2
+    assert count(pool, "feedback") == 2
+    with pool.connection() as conn:
+        assert conn.execute(
+            "SELECT contact FROM users WHERE name = 'Ravi'"
+        ).fetchone() == (None,)
+
+
+def test_write_behind_queue(pool):
+    writer = WriteBehindQueue(pool, max_batch=64)
+    writer.submit_users([(f"u{i}", f"u{i}@example.com", None, None) for i in range(500)])
+    writer.submit_feedback([(4, "ok")])
+    writer.flush()
+
+    assert count(pool, "users") == 500
+    assert count(pool, "feedback") == 1
+
+    writer.submit("INSERT INTO missing_table VALUES (?)", (1,))
+    with pytest.raises(WriteBehindError) as failure:
+        writer.flush()
+    assert isinstance(failure.value.errors[0][2], sqlite3.OperationalError)
+
+    writer.submit_feedback([(1, "after error")])
+    writer.close()
+    assert count(pool, "feedback") == 2
+
+
+def test_failed_write_does_not_lose_its_batch(pool):
+    writer = WriteBehindQueue(pool)
+    writer.submit_users([("before", None, None, None)])
+    writer.submit("INSERT INTO missing_table VALUES (?)", (1,))
+    writer.submit_feedback([(5, "kept")])
+    writer.submit("INSERT INTO feedback (id, rating) VALUES (?, ?)", (1, 2))
+
+    with pytest.raises(WriteBehindError) as failure:
+        writer.flush()
+    writer.close()
+
+    assert len(failure.value.errors) == 2
+    assert count(pool, "users") == 1
+    assert count(pool, "feedback") == 1
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+from agents.profiler import profile_frame
+
+rng = np.random.default_rng(3)
+n = 50_000
+df = pd.DataFrame({
+    "sku": rng.integers(0, 2_000, n),
+    "region": rng.choice(["North", "South", None], n),
+    "units": rng.integers(0, 5, n).astype("float64"),
+})
+df.loc[::11, "units"] = np.nan
+
+
+def test_exact_profile_matches_pandas():
+    profile = profile_frame(df, ["sku", "units"], chunk_rows=7_000)
+
+    assert profile["row_count"] == n
+    assert profile["duplicate_rows"] == int(df.duplicated().sum())
+    assert profile["missing_values"] == {
+        col: int(v) for col, v in df.isna().sum().items() if v > 0
+    }
+    for col in ["sku", "units"]:
+        assert np.isclose(profile["variances"][col], df[col].var())
+
+
+def test_approximate_profile_is_close():
+    exact = profile_frame(df, ["units"])
+    approx = profile_frame(df, ["units"], approximate=True, chunk_rows=9_000)
+
+    assert approx["approximate"]
+    assert abs(approx["distinct_rows"] - exact["distinct_rows"]) < 0.03 * exact["distinct_rows"]
+    assert approx["missing_values"] == exact["missing_values"]
@@ -0,0 +1,70 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from agents.geo_navigation_agent import GeoNavigationAgent, haversine_matrix
+from agents.hub_registry import HubNavigationAgent, HubRegistry
+from agents.route_optimizer import nearest_neighbour_tour, optimize_stop_order, tour_length
+
+
+def random_points(n, seed):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(8, 32, n), rng.uniform(70, 88, n)])
+
+
+@pytest.mark.parametrize("closed", [False, True])
+def test_small_instances_are_solved_exactly(closed):
+    for seed, n in enumerate([3, 5, 7, 8]):
+        d = haversine_matrix(random_points(n, seed))
+        result = optimize_stop_order(d, return_to_depot=closed)
+
+        best = min(
+            tour_length(d, [0] + list(p), closed)
+            for p in itertools.permutations(range(1, n))
+        )
+        assert result["order"][0] == 0
+        assert sorted(result["order"]) == list(range(n))
+        assert result["distance"] == pytest.approx(best)
+
+
+@pytest.mark.parametrize("closed", [False, True])
+def test_five_hundred_stops(closed):
+    d = haversine_matrix(random_points(500, 42))
+
+    result = optimize_stop_order(d, return_to_depot=closed, time_budget=0.8)
+
+    assert sorted(result["order"]) == list(range(500))
+    assert result["distance"] < tour_length(d, nearest_neighbour_tour(d), closed)
+    assert result["distance"] == pytest.approx(tour_length(d, result["order"], closed))
+
+
+def test_route_planning_reports_savings():
+    agent = GeoNavigationAgent()
+    given = ["Mumbai", "Delhi", "Bengaluru", "Jaipur", "Indore"]
+
+    plain = agent.plan_multi_stop_route(given, 100)
+    optimized = agent.plan_multi_stop_route(given, 100, optimize=True)
+
+    assert plain["stop_order"] == given and plain["distance_saved_km"] == 0
+    assert optimized["stop_order"][0] == "Mumbai"
+    assert optimized["distance_km"] < plain["distance_km"]
+    assert optimized["distance_saved_km"] == pytest.approx(
+        plain["distance_km"] - optimized["distance_km"], abs=0.02
+    )
+
+    tour = agent.plan_multi_stop_route(given, 100, optimize=True, return_to_depot=True)
+    assert tour["path"][0] == tour["path"][-1] == "Mumbai"
+    assert set(tour["stop_order"]) == set(given)
+
+
+def test_hub_agent_optimizes_over_registry():
+    points = random_points(300, 7)
+    registry = HubRegistry([f"H{i}" for i in range(300)], points)
+    agent = HubNavigationAgent(registry)
+    stops = [f"H{i}" for i in range(0, 300, 10)]
+
+    route = agent.plan_multi_stop_route(stops, 100, optimize=True)
+
+    assert route["stop_order"][0] == "H0"
+    assert route["distance_saved_km"] > 0
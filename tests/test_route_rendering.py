@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+import pytest
+
+from agents.geo_navigation_agent import GeoNavigationAgent
+from agents.route_rendering import to_folium, to_geojson
+
+STOPS = ["Mumbai", "Indore", "Jaipur", "Delhi"]
+
+
+def test_plan_route_is_plain_data():
+    route = GeoNavigationAgent().plan_route(STOPS, 100)
+
+    assert "map" not in route
+    assert [leg["from"] for leg in route["legs"]] == STOPS[:-1]
+    assert sum(leg["distance_km"] for leg in route["legs"]) == pytest.approx(
+        route["distance_km"], abs=0.05
+    )
+    assert len(route["coords"]) == len(route["path"])
+
+
+def test_routing_does_not_import_folium():
+    code = (
+        "import sys\n"
+        "from agents.geo_navigation_agent import shared_agent\n"
+        "shared_agent().plan_route(['Mumbai', 'Delhi'], 100, optimize=True)\n"
+        "assert 'folium' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_renderers():
+    agent = GeoNavigationAgent()
+    route = agent.plan_route(STOPS, 100)
+
+    geojson = to_geojson(route)
+    points = [f for f in geojson["features"] if f["geometry"]["type"] == "Point"]
+    line = geojson["features"][-1]
+    assert [f["properties"]["name"] for f in points] == route["path"]
+    assert line["geometry"]["coordinates"][0] == [72.8777, 19.0760]
+
+    html = to_folium(route)._repr_html_()
+    assert "Jaipur" in html
+
+    legacy = agent.plan_multi_stop_route(STOPS, 100)
+    assert legacy["distance_km"] == route["distance_km"]
+    assert hasattr(legacy["map"], "_repr_html_")
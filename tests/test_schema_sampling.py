@@ -0,0 +1,32 @@
+import pandas as pd
+from agents.schema_agent import SchemaIntelligenceAgent
+from agents.forecasting_agent import ForecastingAgent
+
+df = pd.read_csv("data/electronics_data_recent_dates.csv")
+
+
+def test_sampled_mode_matches_full_detection():
+    full = SchemaIntelligenceAgent(df).analyze()
+    sampled = SchemaIntelligenceAgent(df, datetime_mode="sampled", sample_size=10).analyze()
+
+    assert sampled["date_columns"] == full["date_columns"]
+    assert sampled["categorical_columns"] == full["categorical_columns"]
+    assert sampled["date_formats"] == {"order_date": "%Y-%m-%d"}
+
+
+def test_mostly_invalid_dates_are_rejected():
+    messy = pd.DataFrame({"when": ["2025-01-01"] * 3 + ["n/a"] * 7, "units": range(10)})
+    schema = SchemaIntelligenceAgent(messy, datetime_mode="sampled").analyze()
+
+    assert schema["date_columns"] == []
+    assert schema["categorical_columns"] == ["when"]
+
+
+def test_cached_format_is_used_by_forecasting_agent():
+    schema = SchemaIntelligenceAgent(df, datetime_mode="sampled").analyze()
+    agent = ForecastingAgent(
+        df, "order_date", schema["demand_target"],
+        date_format=schema["date_formats"]["order_date"]
+    )
+
+    assert agent.df["order_date"].min() == pd.Timestamp("2025-10-22")
@@ -0,0 +1,40 @@
+import os
+
+import numpy as np
+import pandas as pd
+from agents.upload_cache import UploadCache
+
+with open("data/fashion_data.csv", "rb") as f:
+    DATA = f.read()
+
+
+def is_memory_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def test_second_load_is_a_memory_mapped_hit(tmp_path):
+    cache = UploadCache(cache_dir=str(tmp_path))
+
+    parsed, schema = cache.load_or_parse(DATA)
+    loaded, cached_schema = cache.load_or_parse(DATA)
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cached_schema == schema
+    pd.testing.assert_frame_equal(loaded, parsed)
+
+    date_col = schema["date_columns"][0]
+    assert pd.api.types.is_datetime64_dtype(loaded[date_col])
+    assert is_memory_mapped(loaded[schema["demand_target"]].to_numpy())
+
+
+def test_cache_directory_is_bounded(tmp_path):
+    cache = UploadCache(cache_dir=str(tmp_path), max_bytes=1)
+
+    cache.load_or_parse(DATA)
+    cache.load_or_parse(DATA + b"\n")
+
+    assert len([d for d in os.listdir(tmp_path) if not d.startswith(".")]) == 0